@@ -2,9 +2,11 @@ import displayio
 import terminalio
 import math
 import time
+import struct
 from adafruit_display_text import label
 from adafruit_display_shapes.rect import Rect
-from Handlers.gamestate import BaseState, STATE_MENU, STATE_PAUSE
+from Handlers.gamestate import BaseState, STATE_MENU, STATE_PAUSE, STATE_BLOCKBREAKER
+from Handlers.widgets import number_after
 
 # --- CONSTANTS ---
 SCREEN_W = 320
@@ -25,24 +27,51 @@ LEVELS = [
     [[1,0,1,0,1,1,0,1,0,1],[0,2,0,2,7,7,2,0,2,0],[3,0,3,0,7,7,0,3,0,3],[0,4,0,4,0,0,4,0,4,0],[5,0,5,0,7,7,0,5,0,5],[0,6,0,6,7,7,6,0,6,0],[7,7,0,0,0,0,0,0,7,7]]
 ]
 
+def make_brick_art():
+    """(sheet, palette): one solid BRICK_W x BRICK_H tile per colour index."""
+    palette = displayio.Palette(8)
+    palette[0] = 0x000000
+    palette[1] = 0xFF0000
+    palette[2] = 0xFF7F00
+    palette[3] = 0xFFFF00
+    palette[4] = 0x00FF00
+    palette[5] = 0x0000FF
+    palette[6] = 0xFF00FF
+    palette[7] = 0x555555
+    palette.make_transparent(0)
+    sheet = displayio.Bitmap(BRICK_W, BRICK_H * 8, 8)
+    for i in range(8):
+        for y in range(BRICK_H):
+            for x in range(BRICK_W):
+                sheet[x, y + (i * BRICK_H)] = i
+    return sheet, palette
+
+# Quick-save payload: header, then the brick grid as one nibble per cell
+SNAP_FMT = "<BIBh"  # level index, score, lives, paddle x
+SNAP_SIZE = struct.calcsize(SNAP_FMT)
+GRID_PACKED = (GRID_COLS * GRID_ROWS + 1) // 2
+
+def pack_level(level_idx, buf, offset):
+    """Nibble-pack a level's starting bricks, same layout as BrickGrid.pack_into."""
+    data = LEVELS[level_idx % len(LEVELS)]
+    for i in range(GRID_PACKED): buf[offset + i] = 0
+    for r, row in enumerate(data):
+        for c, tile in enumerate(row):
+            i = r * GRID_COLS + c
+            buf[offset + i // 2] |= tile << (4 * (i & 1))
+
+def packed_brick_count(buf, offset):
+    """Breakable bricks in a nibble-packed grid."""
+    count = 0
+    for i in range(GRID_COLS * GRID_ROWS):
+        tile = (buf[offset + i // 2] >> (4 * (i & 1))) & 0x0F
+        if 0 < tile < 7: count += 1
+    return count
+
 class BrickGrid:
-    def __init__(self):
+    def __init__(self, art):
         self.active_bricks = 0
-        self.palette = displayio.Palette(8)
-        self.palette[0] = 0x000000
-        self.palette[1] = 0xFF0000
-        self.palette[2] = 0xFF7F00
-        self.palette[3] = 0xFFFF00
-        self.palette[4] = 0x00FF00
-        self.palette[5] = 0x0000FF
-        self.palette[6] = 0xFF00FF
-        self.palette[7] = 0x555555
-        self.palette.make_transparent(0)
-        self.sheet = displayio.Bitmap(BRICK_W, BRICK_H * 8, 8)
-        for i in range(8):
-            for y in range(BRICK_H):
-                for x in range(BRICK_W):
-                    self.sheet[x, y + (i * BRICK_H)] = i
+        self.sheet, self.palette = art
         self.grid = displayio.TileGrid(self.sheet, pixel_shader=self.palette, width=GRID_COLS, height=GRID_ROWS, tile_width=BRICK_W, tile_height=BRICK_H)
     def load_level(self, level_idx):
         for i in range(GRID_COLS * GRID_ROWS): self.grid[i % GRID_COLS, i // GRID_COLS] = 0
@@ -53,6 +82,19 @@ class BrickGrid:
                 if color_idx > 0:
                     self.grid[c, r] = color_idx
                     if color_idx < 7: self.active_bricks += 1
+    def pack_into(self, buf, offset):
+        for i in range(0, GRID_COLS * GRID_ROWS, 2):
+            lo = self.grid[i % GRID_COLS, i // GRID_COLS]
+            hi = self.grid[(i + 1) % GRID_COLS, (i + 1) // GRID_COLS] if i + 1 < GRID_COLS * GRID_ROWS else 0
+            buf[offset + i // 2] = lo | (hi << 4)
+    def unpack_from(self, buf, offset):
+        self.active_bricks = 0
+        for i in range(GRID_COLS * GRID_ROWS):
+            tile = (buf[offset + i // 2] >> (4 * (i & 1))) & 0x0F
+            if tile > 7: tile = 0
+            c = i % GRID_COLS; r = i // GRID_COLS
+            if self.grid[c, r] != tile: self.grid[c, r] = tile
+            if 0 < tile < 7: self.active_bricks += 1
     def check_collision(self, ball_rect):
         col1 = int(ball_rect.x // BRICK_W); col2 = int((ball_rect.x + ball_rect.width) // BRICK_W)
         row1 = int(ball_rect.y // BRICK_H); row2 = int((ball_rect.y + ball_rect.height) // BRICK_H)
@@ -126,21 +168,25 @@ class BlockBreakerGame(BaseState):
         super().__init__(manager)
         self.bg = Rect(0, 0, 340, 260, fill=0x000022)
         self.root_group.append(self.bg)
-        self.brick_grid = BrickGrid()
+        art = manager.assets.acquire(STATE_BLOCKBREAKER, "bricks", make_brick_art)
+        self.brick_grid = BrickGrid(art)
         self.root_group.append(self.brick_grid.grid)
         self.paddle = Paddle()
         self.root_group.append(self.paddle.rect)
         self.ball = Ball()
         self.root_group.append(self.ball.rect)
-        self.score_label = label.Label(self.manager.font_ui, text="SCORE: 0", x=5, y=230, color=0xFFFFFF)
-        self.lives_label = label.Label(self.manager.font_ui, text="LIVES: 3", x=240, y=230, color=0xFFFFFF)
+        self.score_label = label.Label(self.manager.font_ui, text="SCORE:", x=5, y=230, color=0xFFFFFF)
+        self.lives_label = label.Label(self.manager.font_ui, text="LIVES:", x=240, y=230, color=0xFFFFFF)
+        self.score_value = number_after(self.score_label, self.manager.font_ui, 6)
+        self.lives_value = number_after(self.lives_label, self.manager.font_ui, 2)
+        self.root_group.append(self.score_value.grid); self.root_group.append(self.lives_value.grid)
         self.msg_label = label.Label(self.manager.font_ui, text="READY?", scale=2, x=110, y=140, color=0x00FFFF)
         self.root_group.append(self.score_label); self.root_group.append(self.lives_label); self.root_group.append(self.msg_label)
         self.level_idx = 0; self.score = 0; self.lives = 3; self.state = "START"
 
     def reset(self):
         self.score = 0; self.lives = 3; self.level_idx = 0
-        self.lives_label.text = "LIVES: 3"; self.score_label.text = "SCORE: 0"
+        self.lives_value.set(3); self.score_value.set(0)
         self.load_level(0); self.manager.log("BlockBreaker: Reset")
 
     def load_level(self, idx):
@@ -148,7 +194,39 @@ class BlockBreakerGame(BaseState):
         self.paddle.x = (SCREEN_W - PADDLE_W)//2; self.ball.reset(self.paddle)
         self.msg_label.text = f"LEVEL {idx+1}"; self.msg_label.hidden = False
         self.state = "START"
-        self.lives = 3; self.lives_label.text = "LIVES: 3"
+        self.lives = 3; self.lives_value.set(3)
+
+    def snapshot(self):
+        """Binary quick-save of the current level, or None if not resumable."""
+        if self.state == "GAME_OVER":
+            return None
+        blob = bytearray(SNAP_SIZE + GRID_PACKED)
+        if self.state == "LEVEL_DONE" or self.brick_grid.active_bricks == 0:
+            # Cleared: save what pressing A would start, the next level from scratch
+            next_idx = (self.level_idx + 1) % len(LEVELS)
+            struct.pack_into(SNAP_FMT, blob, 0, next_idx, self.score, 3, (SCREEN_W - PADDLE_W) // 2)
+            pack_level(next_idx, blob, SNAP_SIZE)
+            return blob
+        struct.pack_into(SNAP_FMT, blob, 0, self.level_idx, self.score, self.lives, int(self.paddle.x))
+        self.brick_grid.pack_into(blob, SNAP_SIZE)
+        return blob
+
+    def restore(self, blob):
+        """Apply a snapshot() blob in place; the ball waits on the paddle."""
+        if len(blob) != SNAP_SIZE + GRID_PACKED:
+            return False
+        level_idx, score, lives, paddle_x = struct.unpack_from(SNAP_FMT, blob, 0)
+        if level_idx >= len(LEVELS) or lives == 0:
+            return False
+        if packed_brick_count(blob, SNAP_SIZE) == 0:
+            return False # Nothing left to break: the level could never finish
+        self.level_idx = level_idx; self.score = score; self.lives = lives
+        self.score_value.set(score); self.lives_value.set(lives)
+        self.brick_grid.unpack_from(blob, SNAP_SIZE)
+        self.paddle.x = paddle_x; self.paddle.rect.x = paddle_x; self.ball.reset(self.paddle)
+        self.msg_label.text = "READY?"; self.msg_label.hidden = False
+        self.state = "START"
+        return True
 
     def update(self, handler, dt):
         if self.state == "START":
@@ -159,11 +237,11 @@ class BlockBreakerGame(BaseState):
             self.paddle.update(handler, dt)
             status, points = self.ball.update(dt, self.paddle, self.brick_grid)
             if points > 0:
-                self.score += points; self.score_label.text = f"SCORE: {self.score}"
+                self.score += points; self.score_value.set(self.score)
                 if self.brick_grid.active_bricks == 0:
                     self.state = "LEVEL_DONE"; self.msg_label.text = "CLEARED!"; self.msg_label.hidden = False; self.ball.active = False
             if status == "LOST":
-                self.lives -= 1; self.lives_label.text = f"LIVES: {self.lives}"
+                self.lives -= 1; self.lives_value.set(self.lives)
                 self.manager.log(f"Ball Lost. Lives: {self.lives}")
                 if self.lives <= 0:
                     self.state = "GAME_OVER"
@@ -180,4 +258,5 @@ class BlockBreakerGame(BaseState):
         # Note: GAME_OVER state logic is largely superseded by the trigger_save_prompt,
         # but we keep this to handle returns from other states if needed.
         if handler.was_just_pressed("SEL"): self.manager.change_state(STATE_PAUSE)
-        if handler.was_just_pressed("B") and self.state != "GAME_OVER": self.manager.change_state(STATE_MENU)
+        if handler.was_just_pressed("B") and self.state != "GAME_OVER":
+            self.manager.quick_save(STATE_BLOCKBREAKER); self.manager.change_state(STATE_MENU)
@@ -0,0 +1,251 @@
+# -----------------------------------------------------------
+# COLLISION GRID
+# -----------------------------------------------------------
+# The level is compiled once into a flat bytearray of tile flags with a
+# one-tile sentinel border, so lookups are a clamp plus an index instead
+# of string indexing. Border semantics match the old Level.is_solid:
+# left/right/bottom edges are solid, the sky above the map is open.
+#
+# A grid may also be a window over a longer map: `origin` is the map
+# column held in grid column 0, callers keep using map coordinates, and
+# columns outside the window read as the solid side border. slide()
+# moves the window and reports which map columns need refilling.
+
+TILE_SOLID = 0x01
+TILE_HAZARD = 0x02
+TILE_ONE_WAY = 0x04
+
+# Hazard tiles keep a shape id in the high nibble of their flags byte.
+# Shape 0..15 indexes CollisionGrid.hazard_shapes, a list of tile-local
+# (x0, y0, x1, y1) boxes, so sub-tile hitboxes cost no extra grid memory.
+HAZARD_SHAPE_SHIFT = 4
+MAX_HAZARD_SHAPES = 16
+
+
+class CollisionGrid:
+    def __init__(self, width, height, tile_size):
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+        self.stride = width + 2
+        self.flags = bytearray(self.stride * (height + 2))
+        self.hazard_shapes = []
+        self.origin = 0
+
+        # Sentinel border
+        for ty in range(-1, height + 1):
+            self.set(-1, ty, TILE_SOLID)
+            self.set(width, ty, TILE_SOLID)
+        for tx in range(width):
+            self.set(tx, height, TILE_SOLID)
+
+    def _index(self, tx, ty):
+        # Anything past the border behaves like the border itself
+        tx -= self.origin
+        if tx < -1: tx = -1
+        elif tx > self.width: tx = self.width
+        if ty < -1: ty = -1
+        elif ty > self.height: ty = self.height
+        return (ty + 1) * self.stride + tx + 1
+
+    def set(self, tx, ty, flags):
+        self.flags[self._index(tx, ty)] = flags
+
+    def get(self, tx, ty):
+        return self.flags[self._index(tx, ty)]
+
+    def slide(self, origin):
+        """Move the window to start at map column origin.
+
+        Columns inside both windows keep their flags. Returns the
+        (tx0, tx1) map column range the caller must refill, rows -1..height.
+        """
+        d = origin - self.origin
+        w = self.width
+        self.origin = origin
+        if d == 0:
+            return origin, origin
+        if d >= w or -d >= w:
+            return origin, origin + w
+        flags = self.flags
+        stride = self.stride
+        for row in range(self.height + 2):
+            base = row * stride + 1
+            if d > 0:
+                flags[base:base + w - d] = flags[base + d:base + w]
+            else:
+                flags[base - d:base + w] = flags[base:base + w + d]
+        if d > 0:
+            return origin + w - d, origin + w
+        return origin, origin - d
+
+    # ---------------- HAZARD LAYER ----------------
+    def _hazard_shape(self, box):
+        shapes = self.hazard_shapes
+        for i in range(len(shapes)):
+            if shapes[i] == box:
+                return i
+        if len(shapes) < MAX_HAZARD_SHAPES - 1:
+            shapes.append(box)
+            return len(shapes) - 1
+        # Table full: reuse a shape that covers the box, or (last slot)
+        # the whole tile. Errs towards a slightly larger hitbox.
+        for i in range(len(shapes)):
+            old = shapes[i]
+            if old[0] <= box[0] and old[1] <= box[1] and old[2] >= box[2] and old[3] >= box[3]:
+                return i
+        ts = self.tile_size
+        full = (0, 0, ts, ts)
+        if full not in shapes:
+            shapes.append(full)
+        return shapes.index(full)
+
+    def add_hazard(self, x, y, w, h):
+        """Bake a pixel hitbox into every tile it touches."""
+        ts = self.tile_size
+        for ty in range(y // ts, (y + h - 1) // ts + 1):
+            for tx in range(x // ts, (x + w - 1) // ts + 1):
+                if tx < self.origin or tx >= self.origin + self.width or ty < 0 or ty >= self.height:
+                    continue
+                ox = tx * ts
+                oy = ty * ts
+                box = (max(x, ox) - ox, max(y, oy) - oy,
+                       min(x + w, ox + ts) - ox, min(y + h, oy + ts) - oy)
+                i = self._index(tx, ty)
+                flags = self.flags[i]
+                if flags & TILE_HAZARD:
+                    # Tile already has a hazard: keep the union of both boxes
+                    old = self.hazard_shapes[flags >> HAZARD_SHAPE_SHIFT]
+                    box = (min(old[0], box[0]), min(old[1], box[1]),
+                           max(old[2], box[2]), max(old[3], box[3]))
+                shape = self._hazard_shape(box)
+                self.flags[i] = (flags & 0x0F) | TILE_HAZARD | (shape << HAZARD_SHAPE_SHIFT)
+
+    def hits_hazard(self, x, y, w, h):
+        """True if the pixel box overlaps any baked hazard hitbox."""
+        ts = self.tile_size
+        # Far edges may pull in one extra tile; the box test rejects it
+        tx0 = int(x // ts)
+        tx1 = int((x + w) // ts)
+        ty0 = int(y // ts)
+        ty1 = int((y + h) // ts)
+        flags = self.flags
+        shapes = self.hazard_shapes
+        for ty in range(ty0, ty1 + 1):
+            oy = ty * ts
+            for tx in range(tx0, tx1 + 1):
+                f = flags[self._index(tx, ty)]
+                if not (f & TILE_HAZARD):
+                    continue
+                ox = tx * ts
+                box = shapes[f >> HAZARD_SHAPE_SHIFT]
+                if (x < ox + box[2] and x + w > ox + box[0] and
+                        y < oy + box[3] and y + h > oy + box[1]):
+                    return True
+        return False
+
+    # ---------------- QUERIES (tile coordinates) ----------------
+    def is_solid_tile(self, tx, ty):
+        return (self.flags[self._index(tx, ty)] & TILE_SOLID) != 0
+
+    def any_flag(self, mask, tx0, tx1, ty0, ty1):
+        """True if any tile in the inclusive span has a flag in mask."""
+        flags = self.flags
+        for ty in range(ty0, ty1 + 1):
+            row = self._index(tx0, ty)
+            end = self._index(tx1, ty)
+            for i in range(row, end + 1):
+                if flags[i] & mask:
+                    return True
+        return False
+
+    def any_solid(self, tx0, tx1, ty0, ty1):
+        return self.any_flag(TILE_SOLID, tx0, tx1, ty0, ty1)
+
+    # ---------------- QUERIES (pixel coordinates) ----------------
+    def is_solid_px(self, x, y):
+        ts = self.tile_size
+        return (self.flags[self._index(int(x // ts), int(y // ts))] & TILE_SOLID) != 0
+
+
+# -----------------------------------------------------------
+# KINEMATIC BODY SOLVER
+# -----------------------------------------------------------
+# Moves an AABB through the grid one axis at a time, visiting only the
+# tile columns/rows its leading edge crosses. No speed clamp is needed:
+# a body moving 40 px in one tick still checks every column in between.
+# Bodies are any object with x, y, width, height in solver units.
+
+CONTACT_GROUND = 0x01
+CONTACT_CEILING = 0x02
+CONTACT_LEFT = 0x04
+CONTACT_RIGHT = 0x08
+
+
+class KinematicSolver:
+    def __init__(self, grid, unit=1, eps=0.001):
+        # unit: solver units per pixel (1 for float pixels, 256 for 8.8 fixed)
+        # eps: smallest step in solver units, keeps far edges exclusive
+        self.grid = grid
+        self.ts = grid.tile_size * unit
+        self.eps = eps
+
+    def move_x(self, body, dx):
+        if dx == 0:
+            return 0
+        ts = self.ts
+        y = body.y
+        ty0 = int(y // ts)
+        ty1 = int((y + body.height - self.eps) // ts)
+        grid = self.grid
+
+        if dx > 0:
+            lead = body.x + body.width
+            c0 = int((lead - self.eps) // ts) + 1
+            c1 = int((lead + dx - self.eps) // ts)
+            for c in range(c0, c1 + 1):
+                if grid.any_solid(c, c, ty0, ty1):
+                    body.x = c * ts - body.width
+                    return CONTACT_RIGHT
+        else:
+            lead = body.x
+            c0 = int(lead // ts) - 1
+            c1 = int((lead + dx) // ts)
+            for c in range(c0, c1 - 1, -1):
+                if grid.any_solid(c, c, ty0, ty1):
+                    body.x = (c + 1) * ts
+                    return CONTACT_LEFT
+        body.x += dx
+        return 0
+
+    def move_y(self, body, dy):
+        if dy == 0:
+            return 0
+        ts = self.ts
+        x = body.x
+        tx0 = int(x // ts)
+        tx1 = int((x + body.width - self.eps) // ts)
+        grid = self.grid
+
+        if dy > 0:
+            lead = body.y + body.height
+            r0 = int((lead - self.eps) // ts) + 1
+            r1 = int((lead + dy - self.eps) // ts)
+            for r in range(r0, r1 + 1):
+                if grid.any_solid(tx0, tx1, r, r):
+                    body.y = r * ts - body.height
+                    return CONTACT_GROUND
+        else:
+            lead = body.y
+            r0 = int(lead // ts) - 1
+            r1 = int((lead + dy) // ts)
+            for r in range(r0, r1 - 1, -1):
+                if grid.any_solid(tx0, tx1, r, r):
+                    body.y = (r + 1) * ts
+                    return CONTACT_CEILING
+        body.y += dy
+        return 0
+
+    def move(self, body, dx, dy):
+        """Returns CONTACT_* flags for this step."""
+        return self.move_x(body, dx) | self.move_y(body, dy)
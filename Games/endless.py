@@ -0,0 +1,124 @@
+# -----------------------------------------------------------
+# ENDLESS MAP GENERATOR
+# -----------------------------------------------------------
+# Emits an endless level one column at a time from a seed, so the game
+# can spread generation over frames. The map is built from segments:
+#   flat      : ground at the current height
+#   step      : ground moves up or down, never more than the jump rise
+#   gap       : bottomless pit, never wider than the jump reach allows
+#   platform  : flat ground with a floating ledge above it
+# Every segment is reachable by construction, so no search is needed.
+# Spikes and enemies only go on flat ground away from segment edges.
+#
+# Shared shape with navigation.py: no imports, is_solid conventions
+# are the caller's. Columns are filled top to bottom, 1 = solid.
+
+SPAWN_NONE = 0
+SPAWN_ENEMY = 1
+SPAWN_SPIKE = 2
+
+SEG_FLAT = 0
+SEG_STEP = 1
+SEG_GAP = 2
+SEG_PLATFORM = 3
+
+MIN_GROUND = 2
+SAFE_COLS = 24          # Flat, empty run-up at the start
+PLATFORM_LIFT = 4       # Rows between ground top and a floating ledge
+RAMP_COLS = 400         # Columns until hazards reach full density
+
+
+class EndlessGenerator:
+    def __init__(self, seed, height, rise, reach):
+        self.height = height
+        self.max_ground = height // 2
+        self.max_step = max(1, rise - 1)
+        self.max_gap = max(1, reach - 1)
+        self._rng = (seed & 0x7FFFFFFF) or 1
+        self.col = 0
+        self.ground = MIN_GROUND + 1
+        self.seg = SEG_FLAT
+        self.seg_left = SAFE_COLS
+        self.seg_pos = 0
+        self.ledge_from = 0
+        self.ledge_to = 0
+        self.cooldown = 0
+        self.last = SEG_FLAT
+
+        # Per-column results, read after next_column()
+        self.pit = False
+        self.spawn = SPAWN_NONE
+        self.spawn_row = 0
+
+    def _rand(self, n):
+        """0 .. n-1 from a 31-bit LCG (same sequence on every port)."""
+        self._rng = (self._rng * 1103515245 + 12345) & 0x7FFFFFFF
+        return (self._rng >> 16) % n
+
+    @property
+    def ground_top(self):
+        """Row of the top ground tile in the current column."""
+        return self.height - self.ground
+
+    def _next_segment(self):
+        self.seg_pos = 0
+        ramp = min(self.col, RAMP_COLS)
+        roll = self._rand(100)
+        gap_chance = 10 + ramp * 15 // RAMP_COLS
+        # Gaps and steps need flat ground on both sides
+        if self.last == SEG_FLAT and roll < gap_chance:
+            self.seg = SEG_GAP
+            self.seg_left = 1 + self._rand(self.max_gap)
+        elif self.last == SEG_FLAT and roll < gap_chance + 20:
+            self.seg = SEG_STEP
+            delta = 1 + self._rand(self.max_step)
+            if self._rand(2) and self.ground - delta >= MIN_GROUND:
+                self.ground -= delta
+            elif self.ground + delta <= self.max_ground:
+                self.ground += delta
+            else:
+                self.ground -= delta
+            self.seg_left = 3 + self._rand(4)
+        elif roll < gap_chance + 35 and self.ground_top - PLATFORM_LIFT > 1:
+            self.seg = SEG_PLATFORM
+            self.seg_left = 7 + self._rand(5)
+            self.ledge_from = 2
+            self.ledge_to = self.seg_left - 2
+        else:
+            self.seg = SEG_FLAT
+            self.seg_left = 4 + self._rand(7)
+        self.last = SEG_GAP if self.seg == SEG_GAP else SEG_FLAT
+
+    def next_column(self, col):
+        """Fill col (height bytes) with the next column; sets pit/spawn."""
+        if self.seg_left == 0:
+            self._next_segment()
+        self.seg_left -= 1
+        pos = self.seg_pos
+        self.seg_pos += 1
+
+        height = self.height
+        self.spawn = SPAWN_NONE
+        self.pit = self.seg == SEG_GAP
+        top = height if self.pit else self.ground_top
+        for r in range(height):
+            col[r] = 1 if r >= top else 0
+        if self.seg == SEG_PLATFORM and self.ledge_from <= pos < self.ledge_to:
+            col[top - PLATFORM_LIFT] = 1
+
+        # Hazards: flat ground, not on a segment edge, not back to back
+        if self.cooldown:
+            self.cooldown -= 1
+        elif not self.pit and self.col >= SAFE_COLS and pos >= 2 and self.seg_left >= 1:
+            ramp = min(self.col, RAMP_COLS)
+            roll = self._rand(100)
+            spike_chance = 4 + ramp * 8 // RAMP_COLS
+            enemy_chance = spike_chance + 3 + ramp * 5 // RAMP_COLS
+            if roll < spike_chance:
+                self.spawn = SPAWN_SPIKE
+            elif roll < enemy_chance:
+                self.spawn = SPAWN_ENEMY
+            if self.spawn != SPAWN_NONE:
+                self.spawn_row = top - 1
+                self.cooldown = 3
+        self.col += 1
@@ -0,0 +1,39 @@
+# -----------------------------------------------------------
+# FIXED-POINT HELPERS (8.8 positions, per-tick velocities)
+# -----------------------------------------------------------
+# Positions are integers in 1/256 px. Velocities are 1/256 px per tick
+# and accelerations are 1/256 px per tick per tick, so a physics step
+# is integer adds and shifts only. On CircuitPython small ints are not
+# heap objects, which makes the step allocation-free and identical on
+# the device and on a desktop Python.
+
+FP_SHIFT = 8
+FP_ONE = 1 << FP_SHIFT
+TICK_HZ = 60
+TICK_DT = 1.0 / TICK_HZ
+
+
+def to_fp(px):
+    """Pixels -> 8.8 fixed point."""
+    return int(round(px * FP_ONE))
+
+
+def fp_vel(px_per_s):
+    """px/s -> 1/256 px per tick."""
+    return int(round(px_per_s * FP_ONE / TICK_HZ))
+
+
+def fp_accel(px_per_s2):
+    """px/s^2 -> 1/256 px per tick^2."""
+    return int(round(px_per_s2 * FP_ONE / (TICK_HZ * TICK_HZ)))
+
+
+class FixedBody:
+    """Integer physics state for one entity (all fields in 1/256 px)."""
+    def __init__(self, x, y, width, height):
+        self.x = to_fp(x)
+        self.y = to_fp(y)
+        self.width = to_fp(width)
+        self.height = to_fp(height)
+        self.vx = 0
+        self.vy = 0
@@ -0,0 +1,251 @@
+import struct
+import displayio
+from Handlers.animation import Animator
+
+# -----------------------------------------------------------
+# GHOST RUNS
+# -----------------------------------------------------------
+# The player's trajectory is recorded once per physics step as a byte
+# stream into a preallocated buffer:
+#   byte != 0        : one tick, high nibble dx + 8, low nibble dy + 8
+#   0, OP_STATE, s   : shown sprite changed (clip | frame | flip bits)
+#   0, OP_MOVE, x, y : one tick with an absolute int16 position, for
+#                      moves the nibbles cannot hold (and dx = dy = -8)
+# Steps move at most a few pixels, so a run costs about a byte a tick.
+#
+# The best run per level is kept on flash and replayed as a ghost: a
+# second TileGrid over the player's atlas, drawn with a palette faded
+# toward the sky, driven through the same Animator as the player.
+
+GHOST_MAGIC = b"GGST"
+GHOST_VERSION = 1
+GHOST_HEADER_FMT = "<4sBIIhhI"   # magic, version, score, ticks, start x, start y, data length
+GHOST_HEADER_SIZE = struct.calcsize(GHOST_HEADER_FMT)
+GHOST_MAX_BYTES = 6 * 1024       # ~100 s at 60 Hz; longer runs are not kept
+GHOST_FADE = 0x6B8CFF            # Sky colour the ghost palette is blended toward
+
+_ESC = 0
+OP_STATE = 1
+OP_MOVE = 2
+
+# State byte: frame in bits 0-3, clip in 4-6, flip in 7
+STATE_FRAME_MASK = 0x0F
+STATE_CLIP_SHIFT = 4
+STATE_CLIP_MASK = 0x07
+STATE_FLIP = 0x80
+
+
+def ghost_path(level_path):
+    """Flash path of the ghost for a level file ("/Levels/a.lvl" -> "/ghost_a.gst")."""
+    name = level_path.rsplit("/", 1)[-1] if level_path else "default"
+    return "/ghost_" + name.rsplit(".", 1)[0] + ".gst"
+
+
+def pack_state(clip, frame, flip):
+    return (frame & STATE_FRAME_MASK) | ((clip & STATE_CLIP_MASK) << STATE_CLIP_SHIFT) | \
+           (STATE_FLIP if flip else 0)
+
+
+class GhostRecorder:
+    def __init__(self, capacity=GHOST_MAX_BYTES):
+        self.buf = bytearray(capacity)
+        self.pos = 0
+        self.ticks = 0
+        self.start_x = 0
+        self.start_y = 0
+        self.active = False
+        self.overflow = False
+        self._x = 0
+        self._y = 0
+        self._state = -1
+
+    def start(self, x, y):
+        self.pos = 0
+        self.ticks = 0
+        self.start_x = self._x = x
+        self.start_y = self._y = y
+        self._state = -1
+        self.active = True
+        self.overflow = False
+
+    def stop(self):
+        self.active = False
+
+    def record(self, x, y, state):
+        """One tick; x, y are whole pixels. Writes in place, allocates nothing."""
+        if not self.active:
+            return
+        buf = self.buf
+        pos = self.pos
+        if pos + 9 > len(buf):
+            # Out of room: this run can't be replayed, so stop keeping it
+            self.active = False
+            self.overflow = True
+            return
+        if state != self._state:
+            buf[pos] = _ESC
+            buf[pos + 1] = OP_STATE
+            buf[pos + 2] = state
+            pos += 3
+            self._state = state
+        dx = x - self._x
+        dy = y - self._y
+        if -8 <= dx <= 7 and -8 <= dy <= 7 and (dx != -8 or dy != -8):
+            buf[pos] = ((dx + 8) << 4) | (dy + 8)
+            pos += 1
+        else:
+            buf[pos] = _ESC
+            buf[pos + 1] = OP_MOVE
+            struct.pack_into("<hh", buf, pos + 2, x, y)
+            pos += 6
+        self._x = x
+        self._y = y
+        self.pos = pos
+        self.ticks += 1
+
+    def encode(self, score):
+        """Header + recorded stream, ready for one file write."""
+        out = bytearray(GHOST_HEADER_SIZE + self.pos)
+        struct.pack_into(GHOST_HEADER_FMT, out, 0, GHOST_MAGIC, GHOST_VERSION, score,
+                         self.ticks, self.start_x, self.start_y, self.pos)
+        out[GHOST_HEADER_SIZE:] = memoryview(self.buf)[:self.pos]
+        return out
+
+
+def read_ghost(path):
+    """(score, ticks, start x, start y, stream) or None."""
+    try:
+        with open(path, "rb") as f:
+            blob = f.read()
+    except OSError:
+        return None
+    if len(blob) < GHOST_HEADER_SIZE:
+        return None
+    magic, version, score, ticks, sx, sy, length = struct.unpack_from(GHOST_HEADER_FMT, blob, 0)
+    if magic != GHOST_MAGIC or version != GHOST_VERSION or len(blob) != GHOST_HEADER_SIZE + length:
+        return None
+    return score, ticks, sx, sy, memoryview(blob)[GHOST_HEADER_SIZE:]
+
+
+def write_ghost(path, blob):
+    try:
+        with open(path, "wb") as f:
+            f.write(blob)
+        return True
+    except OSError:
+        return False
+
+
+def _faded_palette(palette, toward):
+    faded = displayio.Palette(len(palette))
+    tr = (toward >> 16) & 0xFF
+    tg = (toward >> 8) & 0xFF
+    tb = toward & 0xFF
+    for i in range(len(palette)):
+        c = palette[i]
+        r = (((c >> 16) & 0xFF) + tr) >> 1
+        g = (((c >> 8) & 0xFF) + tg) >> 1
+        b = ((c & 0xFF) + tb) >> 1
+        faded[i] = (r << 16) | (g << 8) | b
+        if palette.is_transparent(i):
+            faded.make_transparent(i)
+    return faded
+
+
+class Ghost:
+    """Replays a recorded stream; clips are the player's, with own grids."""
+    def __init__(self, clips, grids, clip_names, offset_x, offset_y):
+        self.group = displayio.Group()
+        self.group.hidden = True
+        faded = {}
+        for grid in grids:
+            shader = grid.pixel_shader
+            if isinstance(shader, displayio.Palette):
+                key = id(shader)
+                if key not in faded:
+                    faded[key] = _faded_palette(shader, GHOST_FADE)
+                grid.pixel_shader = faded[key]
+            self.group.append(grid)
+        self.anim = Animator(clips)
+        self.clip_names = clip_names
+        self.offset_x = offset_x
+        self.offset_y = offset_y
+        self.stream = None
+        self.score = 0
+        self.pos = 0
+        self.x = 0
+        self.y = 0
+        self.playing = False
+        self._prev_x = None
+        self._prev_y = None
+
+    def load(self, ghost):
+        """ghost: read_ghost() result, or None to clear."""
+        self.stop()
+        if ghost is None:
+            self.stream = None
+            self.score = 0
+            return
+        self.score, _, self.start_x, self.start_y, self.stream = ghost
+
+    def start(self):
+        if self.stream is None:
+            self.stop()
+            return
+        self.pos = 0
+        self.x = self.start_x
+        self.y = self.start_y
+        self.playing = True
+        self.group.hidden = False
+        # Spawn pose at the spawn point: the stream's first tick is the
+        # position after the player's first move, drawn by the first step()
+        anim = self.anim
+        anim.play(self.clip_names[0], restart=True)
+        anim.set_flip(False)
+        gx = self.x + self.offset_x
+        gy = self.y + self.offset_y
+        self.group.x = self._prev_x = gx
+        self.group.y = self._prev_y = gy
+
+    def stop(self):
+        self.playing = False
+        self.group.hidden = True
+
+    def step(self):
+        """Advance one recorded tick and draw it; hides the ghost at the end."""
+        if not self.playing:
+            return
+        stream = self.stream
+        pos = self.pos
+        n = len(stream)
+        while True:
+            if pos >= n:
+                self.stop()
+                return
+            b = stream[pos]
+            if b != _ESC:
+                self.x += (b >> 4) - 8
+                self.y += (b & 0x0F) - 8
+                pos += 1
+                break
+            op = stream[pos + 1]
+            if op == OP_MOVE:
+                self.x, self.y = struct.unpack_from("<hh", stream, pos + 2)
+                pos += 6
+                break
+            state = stream[pos + 2]
+            pos += 3
+            anim = self.anim
+            anim.play(self.clip_names[(state >> STATE_CLIP_SHIFT) & STATE_CLIP_MASK])
+            anim.seek(state & STATE_FRAME_MASK)
+            anim.set_flip((state & STATE_FLIP) != 0)
+        self.pos = pos
+
+        gx = self.x + self.offset_x
+        gy = self.y + self.offset_y
+        if self._prev_x != gx:
+            self.group.x = gx
+            self._prev_x = gx
+        if self._prev_y != gy:
+            self.group.y = gy
+            self._prev_y = gy
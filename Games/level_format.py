@@ -0,0 +1,177 @@
+import struct
+from Handlers.rle import rle_encode, rle_decode_into
+
+# -----------------------------------------------------------
+# PACKED LEVEL FORMAT (.lvl)
+# -----------------------------------------------------------
+# Shared by the device loader and the host-side tools, so this module
+# must only depend on struct and Handlers/rle.py.
+#
+#   header   : HEADER_FMT (see below)
+#   index    : n_chunks x (offset u32, packed_len u16)
+#   spawns   : n_enemies x (x u16, y u16), then n_spikes x (x u16, y u16)
+#              pixel coordinates, ready to use
+#   extra    : optional sections, in SECTION_* bit order
+#              SECTION_NAV: rise u8, reach u8 (jump limits it was built
+#              for), then n_chunks x (offset u32, packed_len u16) into
+#              the nav chunks
+#   chunks   : per chunk, RLE pairs (run u8, value u8) over the chunk's
+#              collision flag bytes in column-major order
+#              (chunk_cols x height, last chunk may be narrower)
+#   nav      : per chunk, RLE pairs over the chunk's Games/navigation.py
+#              bytes in row-major order (cols x height); the graph is
+#              mostly empty sky and long walkable rows, so rows pack best
+#
+# Chunks are encoded independently so the game can pull a single chunk
+# of tiles or nav from flash without touching the rest of the file.
+
+MAGIC = b"GLVL"
+VERSION = 3
+HEADER_FMT = "<4sBBHHBBHHHH"
+HEADER_SIZE = struct.calcsize(HEADER_FMT)
+INDEX_FMT = "<IH"
+INDEX_SIZE = struct.calcsize(INDEX_FMT)
+SPAWN_FMT = "<HH"
+SPAWN_SIZE = struct.calcsize(SPAWN_FMT)
+DEFAULT_CHUNK_COLS = 16
+
+# Optional sections (header `sections` bitmask)
+SECTION_NAV = 0x01
+
+
+class LevelFormatError(Exception):
+    pass
+
+
+# ---------------- ENCODING (host side) ----------------
+def encode_level(width, height, flags, enemies, spikes, player_spawn,
+                 tile_size=16, chunk_cols=DEFAULT_CHUNK_COLS, nav=None, nav_limits=None):
+    """Pack a level. flags and nav are row-major (flags[y * width + x]).
+
+    nav: Games/navigation.py graph built for nav_limits (rise, reach), or None.
+    """
+    n_chunks = (width + chunk_cols - 1) // chunk_cols
+    packed = []
+    packed_nav = []
+    for ci in range(n_chunks):
+        start = ci * chunk_cols
+        cols = min(chunk_cols, width - start)
+        raw = bytearray(cols * height)
+        for c in range(cols):
+            for r in range(height):
+                raw[c * height + r] = flags[r * width + start + c]
+        packed.append(rle_encode(raw))
+        if nav is not None:
+            raw = bytearray(cols * height)
+            for r in range(height):
+                for c in range(cols):
+                    raw[r * cols + c] = nav[r * width + start + c]
+            packed_nav.append(rle_encode(raw))
+
+    sections = SECTION_NAV if nav is not None else 0
+    out = bytearray(struct.pack(HEADER_FMT, MAGIC, VERSION, tile_size, width, height,
+                                chunk_cols, sections, player_spawn[0], player_spawn[1],
+                                len(enemies), len(spikes)))
+    extra_size = 2 + n_chunks * INDEX_SIZE if nav is not None else 0
+    offset = HEADER_SIZE + n_chunks * INDEX_SIZE + (len(enemies) + len(spikes)) * SPAWN_SIZE + extra_size
+    for chunk in packed:
+        out += struct.pack(INDEX_FMT, offset, len(chunk))
+        offset += len(chunk)
+    for x, y in enemies:
+        out += struct.pack(SPAWN_FMT, x, y)
+    for x, y in spikes:
+        out += struct.pack(SPAWN_FMT, x, y)
+    if nav is not None:
+        out += bytes(nav_limits)
+        for chunk in packed_nav:
+            out += struct.pack(INDEX_FMT, offset, len(chunk))
+            offset += len(chunk)
+    for chunk in packed:
+        out += chunk
+    for chunk in packed_nav:
+        out += chunk
+    return out
+
+
+# ---------------- DECODING (device side) ----------------
+class LevelFile:
+    """Open .lvl file; tiles and nav are read one chunk at a time."""
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        header = bytearray(HEADER_SIZE)
+        if self._file.readinto(header) != HEADER_SIZE:
+            self.close()
+            raise LevelFormatError("short header")
+        (magic, version, self.tile_size, self.width, self.height, self.chunk_cols,
+         self.sections, px, py, n_enemies, n_spikes) = struct.unpack(HEADER_FMT, header)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise LevelFormatError("bad magic/version")
+        self.player_spawn = (px, py)
+
+        self.n_chunks = (self.width + self.chunk_cols - 1) // self.chunk_cols
+        self._index = bytearray(self.n_chunks * INDEX_SIZE)
+        self._file.readinto(self._index)
+
+        spawns = bytearray((n_enemies + n_spikes) * SPAWN_SIZE)
+        self._file.readinto(spawns)
+        self.enemy_spawns = []
+        self.spike_spawns = []
+        for i in range(n_enemies + n_spikes):
+            pos = struct.unpack_from(SPAWN_FMT, spawns, i * SPAWN_SIZE)
+            if i < n_enemies:
+                self.enemy_spawns.append(pos)
+            else:
+                self.spike_spawns.append(pos)
+
+        # Nav section: jump limits, then its own chunk index
+        self.nav_limits = None
+        self._nav_index = None
+        if self.sections & SECTION_NAV:
+            limits = bytearray(2)
+            self._file.readinto(limits)
+            self.nav_limits = (limits[0], limits[1])
+            self._nav_index = bytearray(self.n_chunks * INDEX_SIZE)
+            self._file.readinto(self._nav_index)
+
+        # Scratch sized for the largest packed chunk of either kind
+        largest = 0
+        for index in (self._index, self._nav_index):
+            if index is None:
+                continue
+            for ci in range(self.n_chunks):
+                _, length = struct.unpack_from(INDEX_FMT, index, ci * INDEX_SIZE)
+                if length > largest:
+                    largest = length
+        self._scratch = bytearray(largest)
+
+    def has_nav(self, rise, reach):
+        """True if the file carries a nav graph built for these jump limits."""
+        return self.nav_limits == (rise, reach)
+
+    def _read_packed(self, index_buf, index, buf):
+        offset, length = struct.unpack_from(INDEX_FMT, index_buf, index * INDEX_SIZE)
+        self._file.seek(offset)
+        view = memoryview(self._scratch)[:length]
+        self._file.readinto(view)
+        cols = min(self.chunk_cols, self.width - index * self.chunk_cols)
+        rle_decode_into(self._scratch, length, memoryview(buf)[:cols * self.height])
+        return cols
+
+    def read_chunk(self, index, buf):
+        """Collision flags of chunk index into buf, column-major. Returns columns."""
+        if index < 0 or index >= self.n_chunks:
+            return 0
+        return self._read_packed(self._index, index, buf)
+
+    def read_nav_chunk(self, index, buf):
+        """Nav bytes of chunk index into buf, row-major (cols wide). Returns columns."""
+        if self._nav_index is None or index < 0 or index >= self.n_chunks:
+            return 0
+        return self._read_packed(self._nav_index, index, buf)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,96 @@
+# -----------------------------------------------------------
+# NAVIGATION GRAPH
+# -----------------------------------------------------------
+# One byte per tile, row-major. A tile is a node if an enemy can stand
+# in it (empty, solid below). Edge bits say how the enemy can leave it
+# sideways: walk onto the neighbour, jump to a ledge it can actually
+# land on, or drop down to real ground. Enemies read the byte once per
+# tile change instead of probing the grid every frame.
+#
+# Shared by the device and the level compiler, so no imports here.
+# is_solid(tx, ty) must follow CollisionGrid border rules.
+
+NAV_STAND = 0x01
+NAV_WALK_LEFT = 0x02
+NAV_WALK_RIGHT = 0x04
+NAV_JUMP_LEFT = 0x08
+NAV_JUMP_RIGHT = 0x10
+NAV_DROP_LEFT = 0x20
+NAV_DROP_RIGHT = 0x40
+
+# Per direction (index 0 = left, 1 = right)
+NAV_WALK = (NAV_WALK_LEFT, NAV_WALK_RIGHT)
+NAV_JUMP = (NAV_JUMP_LEFT, NAV_JUMP_RIGHT)
+NAV_DROP = (NAV_DROP_LEFT, NAV_DROP_RIGHT)
+
+MAX_DROP_TILES = 6
+
+
+def jump_limits(jump_force, gravity, speed, tile_size):
+    """(rise, reach) in whole tiles for a jump at `speed` px/s.
+
+    rise: apex height, v^2 / 2g. reach: horizontal travel over the
+    full air time, measured from the enemy's centre.
+    """
+    v = abs(jump_force)
+    rise = int((v * v / (2 * gravity)) // tile_size)
+    air_time = 2 * v / gravity
+    reach = int((speed * air_time + tile_size / 2) // tile_size)
+    return max(0, rise), max(1, reach)
+
+
+def _standable(is_solid, tx, ty, height):
+    # Only real tiles count as ground, never the sentinel floor
+    return ty + 1 < height and not is_solid(tx, ty) and is_solid(tx, ty + 1)
+
+
+def _can_jump(is_solid, tx, ty, d, rise, reach, height):
+    # Headroom above the start tile, then any ledge within reach
+    top = ty
+    for k in range(1, rise + 1):
+        if is_solid(tx, ty - k):
+            break
+        top = ty - k
+    for step in range(1, reach + 1):
+        c = tx + d * step
+        if is_solid(c, top):
+            return False
+        for r in range(top, ty + 1):
+            if r != ty or step > 1:
+                if _standable(is_solid, c, r, height):
+                    return True
+    return False
+
+
+def _can_drop(is_solid, tx, ty, d, height):
+    c = tx + d
+    if is_solid(c, ty) or is_solid(c, ty + 1):
+        return False
+    for r in range(ty + 1, min(ty + 1 + MAX_DROP_TILES, height)):
+        if is_solid(c, r + 1):
+            return _standable(is_solid, c, r, height)
+    return False
+
+
+def update_nav_columns(nav, width, height, is_solid, rise, reach, tx0, tx1):
+    """Recompute nodes for columns tx0 .. tx1 - 1 in place."""
+    for ty in range(height):
+        for tx in range(tx0, tx1):
+            node = 0
+            if _standable(is_solid, tx, ty, height):
+                node = NAV_STAND
+                for side in (0, 1):
+                    d = 1 if side else -1
+                    if _standable(is_solid, tx + d, ty, height):
+                        node |= NAV_WALK[side]
+                    if _can_jump(is_solid, tx, ty, d, rise, reach, height):
+                        node |= NAV_JUMP[side]
+                    if _can_drop(is_solid, tx, ty, d, height):
+                        node |= NAV_DROP[side]
+            nav[ty * width + tx] = node
+
+
+def build_nav_graph(width, height, is_solid, rise, reach):
+    nav = bytearray(width * height)
+    update_nav_columns(nav, width, height, is_solid, rise, reach, 0, width)
+    return nav
@@ -1,9 +1,28 @@
 import displayio
 import terminalio
 import time
+import os
+import gc
+import struct
+from array import array
 from adafruit_display_text import label
 from adafruit_display_shapes.rect import Rect
-from Handlers.gamestate import BaseState, STATE_GAME_OVER, STATE_MENU, STATE_PAUSE
+from Handlers.gamestate import BaseState, STATE_GAME_OVER, STATE_MENU, STATE_PAUSE, STATE_PLATFORMER
+from Handlers.assets import SpriteAtlas
+from Handlers.widgets import pattern_overlay, number_after
+from Handlers.animation import Animator, clips_from_atlas, LOOP, CLAMP
+from Games.collision import (CollisionGrid, KinematicSolver, TILE_SOLID,
+                             CONTACT_GROUND, CONTACT_CEILING, CONTACT_LEFT, CONTACT_RIGHT)
+from Games.tilemap import StreamingTileMap, GridChunkSource, CHUNK_COLS
+from Games.spatial_hash import SpatialHash
+from Games.ghost import (Ghost, GhostRecorder, ghost_path, pack_state,
+                         read_ghost, write_ghost, GHOST_HEADER_SIZE)
+from Games.level_format import LevelFile, LevelFormatError
+from Games.navigation import (build_nav_graph, update_nav_columns, jump_limits, NAV_STAND,
+                              NAV_WALK, NAV_JUMP, NAV_DROP)
+from Games.endless import EndlessGenerator, SPAWN_ENEMY, SPAWN_SPIKE
+from Games.fixed_point import (FP_SHIFT, FP_ONE, TICK_DT, FixedBody,
+                               to_fp, fp_vel, fp_accel)
 
 # --- PHYSICS CONSTANTS ---
 GRAVITY = 600.0
@@ -21,206 +40,696 @@ TILE_SIZE = 16
 ENEMY_SPEED = 25.0
 ENEMY_JUMP_FORCE = -220.0
 ENEMY_VISION = 150.0
+# Whole-tile jump rise/reach the navigation graph is built for
+NAV_LIMITS = jump_limits(ENEMY_JUMP_FORCE, GRAVITY, ENEMY_SPEED, TILE_SIZE)
+
+# --- PHYSICS MODE ---
+# True: 8.8 fixed-point integers on a fixed 60 Hz tick (no float boxing,
+# deterministic). False: original float physics scaled by frame dt.
+FIXED_POINT = True
+MAX_TICKS_PER_FRAME = 4
+
+# --- ACTIVITY REGIONS (px around the camera view) ---
+# Sprites outside view + VIEW_MARGIN are hidden; enemies outside
+# view + SIM_MARGIN are frozen and resume exactly where they stopped.
+VIEW_WIDTH = 320
+VIEW_MARGIN = 32
+SIM_MARGIN = 160
+
+# --- SPRITES ---
+# name, file in /sprites, frames (None = whole sheet), keep_on_disk
+# Sheets found in /sprites/atlas.spr (Sprites/manifest.json) load from there
+SPRITE_ASSETS = (
+    ("run", "run.bmp", None, False),
+    ("jump", "jump.bmp", 3, False),
+    ("slide", "slide.bmp", 3, False),
+    ("death", "death.bmp", None, False),
+    ("spike", "spike.bmp", 1, False),
+)
+# (sheet, ticks per frame at TICK_HZ, playback)
+PLAYER_CLIPS = (
+    ("run", 6, LOOP),
+    ("jump", 9, CLAMP),
+    ("slide", 5, CLAMP),
+    ("death", 12, CLAMP),
+)
+PLAYER_CLIP_NAMES = tuple(c[0] for c in PLAYER_CLIPS)
+PLAYER_CLIP_IDS = {name: i for i, name in enumerate(PLAYER_CLIP_NAMES)}
+
+# --- LEVEL FILES ---
+# Packed .lvl files (see Games/level_format.py); ASCII sources live next to them
+LEVEL_DIR = "/Levels"
+
+# --- ENDLESS MODE ---
+# A window of generated columns; once the camera is far enough in, the
+# window and everything in it shifts left and the score keeps the offset.
+ENDLESS_LEVEL = -1                  # select_level() index for endless mode
+ENDLESS_COLS = 6 * CHUNK_COLS       # Window width in tiles
+ENDLESS_HEIGHT = 15
+ENDLESS_SHIFT_COLS = 2 * CHUNK_COLS # Columns dropped per shift
+ENDLESS_LOOKAHEAD = 2 * CHUNK_COLS  # Columns generated past the view
+ENDLESS_BUDGET = 0.003              # Seconds of generation per frame
+ENDLESS_ENEMY_SLOTS = 12
+HUD_DIGITS = 5                      # Distance readout: px across a level file
+ENDLESS_HUD_DIGITS = 8              # Endless runs have no end; scores are stored as u32
+PLAYER_JUMP = jump_limits(JUMP_FORCE, GRAVITY, MAX_SPEED, TILE_SIZE)
+
+# Quick-save payload: header, then one record per enemy. Physics values
+# are stored in profile units ('i' fixed, 'f' float); the profile byte
+# rejects a snapshot taken under the other one.
+SNAP_HEADER_FMT = "<BB{0}{0}{0}{0}B{0}H"   # profile, level, player x/y/vx/vy, player flags, camera, enemies
+SNAP_ENEMY_FMT = "<{0}{0}{0}{0}B"        # x, y, vx, vy, flags
+SNAP_FACING_RIGHT = 0x01
+SNAP_ON_GROUND = 0x02
+
+# -----------------------------------------------------------
+# PHYSICS PROFILES
+# -----------------------------------------------------------
+# Entity code is written once against a profile. Velocity deltas,
+# speeds and timers are stored in the profile's own units, so the same
+# lines run on floats (px, px/s, seconds) or on fixed-point ints
+# (1/256 px, 1/256 px per tick, ticks).
+class FloatPhysics:
+    fixed = False
 
-# --- LEVEL DATA (Visual Editor) ---
-LEVEL_MAP = [
-    "###############################################################################",
-    "#                                                                             #",
-    "#                                                                              ",
-    "#                                                                              ",
-    "#                                                                             #",
-    "#                                                                            ##",
-    "#                     #                                                      S#",
-    "#                 ##                                                        ###",
-    "#           ###SSS                             E       S                S     #",
-    "#          #   ###                         ###### S  #####              ##    #",
-    "#                        E                ##    ####     ##                   #",
-    "#      ##               ####            ###                ###              ###",
-    "#    #####        ####           SS           S      E S     ##     SS        #",
-    "########################   ####################################################",
-    "###############################################################################",
-]
+    def __init__(self):
+        self.max_speed = MAX_SPEED
+        self.slide_speed = SLIDE_SPEED
+        self.max_fall = MAX_FALL_SPEED
+        self.jump_force = JUMP_FORCE
+        self.bounce = -150.0
+        self.enemy_speed = ENEMY_SPEED
+        self.enemy_jump = ENEMY_JUMP_FORCE
+        self.enemy_start_vx = -30.0
+        self.vision = ENEMY_VISION
+        self.v_stop = 5.0
+        self.v_move = 10.0
+        self.slide_cooldown = 2.0
+        self.update(TICK_DT)
+
+    def update(self, dt):
+        self.dt = dt      # velocity -> displacement, and timer step
+        self.gravity = GRAVITY * dt
+        self.walk_accel = WALK_ACCEL * dt
+        self.friction = FRICTION * dt
+        self.slide_friction = SLIDE_FRICTION * dt
+
+    def pos(self, px): return float(px)
+    def to_px(self, p): return p
+    def accel(self, ax, a): return ax * a
+    def jump_cut(self, v): return v * JUMP_CUT
+
+class FixedPhysics:
+    fixed = True
 
-class Level:
     def __init__(self):
-        self.width = len(LEVEL_MAP[0])
-        self.height = len(LEVEL_MAP)
+        self.dt = 1 # One tick
+        self.gravity = fp_accel(GRAVITY)
+        self.walk_accel = fp_accel(WALK_ACCEL)
+        self.friction = fp_accel(FRICTION)
+        self.slide_friction = fp_accel(SLIDE_FRICTION)
+        self.max_speed = fp_vel(MAX_SPEED)
+        self.slide_speed = fp_vel(SLIDE_SPEED)
+        self.max_fall = fp_vel(MAX_FALL_SPEED)
+        self.jump_force = fp_vel(JUMP_FORCE)
+        self.bounce = fp_vel(-150.0)
+        self.enemy_speed = fp_vel(ENEMY_SPEED)
+        self.enemy_jump = fp_vel(ENEMY_JUMP_FORCE)
+        self.enemy_start_vx = fp_vel(-30.0)
+        self.vision = to_fp(ENEMY_VISION)
+        self.v_stop = fp_vel(5.0)
+        self.v_move = fp_vel(10.0)
+        self.slide_cooldown = 120 # Ticks
+        self._jump_cut = to_fp(JUMP_CUT)
+
+    def update(self, dt):
+        pass
+
+    def pos(self, px): return to_fp(px)
+    def to_px(self, p): return p >> FP_SHIFT
+    def accel(self, ax, a): return (int(ax * FP_ONE) * a) >> FP_SHIFT
+    def jump_cut(self, v): return (v * self._jump_cut) >> FP_SHIFT
+
+def list_levels(directory=LEVEL_DIR):
+    """Sorted .lvl paths in the level folder."""
+    try:
+        names = sorted([n for n in os.listdir(directory) if n.endswith(".lvl")])
+    except OSError:
+        return []
+    return [directory + "/" + n for n in names]
+
+def make_tile_art():
+    """(bitmap, palette): sky tile 0 and ground tile 1 stacked vertically."""
+    palette = displayio.Palette(2)
+    palette[0] = 0x6B8CFF
+    palette[1] = 0x00AA00
+    bitmap = displayio.Bitmap(TILE_SIZE, TILE_SIZE * 2, 2)
+    for y in range(TILE_SIZE, TILE_SIZE * 2):
+        for x in range(TILE_SIZE):
+            bitmap[x, y] = 1
+    return bitmap, palette
+
+def make_solver(grid, physics):
+    if physics is not None and physics.fixed:
+        return KinematicSolver(grid, unit=FP_ONE, eps=1)
+    return KinematicSolver(grid)
+
+# --- LEVEL STREAMING ---
+# File levels keep only a window of chunks in RAM: collision flags, nav
+# bytes and the tilemap's source all come from it. The window covers the
+# enemy simulation region (view + SIM_MARGIN each side) with a chunk of
+# slack, so RAM per level is fixed however long the map is. What still
+# grows with length is small: the chunk indexes, the spawn lists and the
+# spatial hash's bucket per BUCKET_COLS columns.
+LEVEL_WINDOW_CHUNKS = 5
+
+class Level:
+    def __init__(self, path, physics=None):
+        self.file = None
+        if path is not None:
+            try:
+                self.file = LevelFile(path)
+            except (OSError, LevelFormatError) as e:
+                print(f"Err: level {path}: {e}")
+
+        if self.file is not None:
+            self.width = self.file.width
+            self.height = self.file.height
+        else:
+            # Flat fallback so the game still boots without level files
+            self.width = 40
+            self.height = 15
         self.pixel_width = self.width * TILE_SIZE
 
-        self.palette = displayio.Palette(2)
-        self.palette[0] = 0x6B8CFF
-        self.palette[1] = 0x00AA00
-
-        # single tile bitmap (two frames stacked vertically as before)
-        self.bitmap = displayio.Bitmap(TILE_SIZE, TILE_SIZE * 2, 2)
-        for y in range(TILE_SIZE, TILE_SIZE * 2):
-            for x in range(TILE_SIZE):
-                self.bitmap[x, y] = 1
-
-        # TileGrid that maps to the entire level (same approach you had).
-        self.tilegrid = displayio.TileGrid(
-            self.bitmap,
-            pixel_shader=self.palette,
-            width=self.width,
-            height=self.height,
-            tile_width=TILE_SIZE,
-            tile_height=TILE_SIZE,
-        )
+        self.bitmap, self.palette = make_tile_art()
+        self.hazards = [] # Pixel hitboxes, re-baked as their chunks stream in
+
+        if self.file is not None:
+            f = self.file
+            self.chunk_cols = f.chunk_cols
+            self.window_chunks = min(f.n_chunks, LEVEL_WINDOW_CHUNKS)
+            self.grid = CollisionGrid(self.window_chunks * f.chunk_cols, self.height, TILE_SIZE)
+            # No graph in the file (or built for other physics): derive it per window
+            self.file_nav = f.has_nav(*NAV_LIMITS)
+            self._buf = bytearray(f.chunk_cols * self.height)
+            self.enemy_spawns = f.enemy_spawns
+            self.spike_spawns = f.spike_spawns
+            self.player_spawn = f.player_spawn
+        else:
+            self.grid = CollisionGrid(self.width, self.height, TILE_SIZE)
+            for x in range(self.width):
+                self.grid.set(x, self.height - 2, TILE_SOLID)
+                self.grid.set(x, self.height - 1, TILE_SOLID)
+            self.enemy_spawns = []
+            self.spike_spawns = []
+            self.player_spawn = (50, 50)
+        self.solver = make_solver(self.grid, physics)
+
+        # Nav bytes cover the same columns as the grid: nav[ty * nav_width + tx - grid.origin]
+        self.nav_width = self.grid.width
+        self.tilemap = None
+        if self.file is not None:
+            self.nav = bytearray(self.nav_width * self.height)
+            self.first_chunk = None
+            self.stream_to(0)
+        else:
+            self.nav = build_nav_graph(self.width, self.height, self.grid.is_solid_tile, *NAV_LIMITS)
+
+        # Screen-sized ring of columns, drawn from the in-RAM window
+        self.tilemap = StreamingTileMap(GridChunkSource(self.grid, width=self.width),
+                                        self.bitmap, self.palette, TILE_SIZE)
+        self.tilemap.scroll_to(0)
+
+    def stream_to(self, camera_x):
+        """Slide the window over the chunks around camera_x. True if it moved.
+
+        Nav byte offsets change when it moves, so cached lookups must be dropped.
+        """
+        if self.file is None:
+            return False
+        chunk_px = self.chunk_cols * TILE_SIZE
+        first = int(camera_x - SIM_MARGIN) // chunk_px - 1
+        last = self.file.n_chunks - self.window_chunks
+        if first > last:
+            first = last
+        if first < 0:
+            first = 0
+        if first == self.first_chunk:
+            return False
+
+        grid = self.grid
+        origin = first * self.chunk_cols
+        if self.first_chunk is None:
+            # Nothing loaded yet: fill the whole window
+            grid.origin = origin
+            tx0, tx1 = origin, origin + grid.width
+        else:
+            self._slide_nav(origin - grid.origin)
+            tx0, tx1 = grid.slide(origin)
+        self.first_chunk = first
+        for ci in range(tx0 // self.chunk_cols, tx1 // self.chunk_cols):
+            self._load_chunk(ci)
+        if not self.file_nav:
+            update_nav_columns(self.nav, self.nav_width, self.height, self._window_solid,
+                               *NAV_LIMITS, 0, self.nav_width)
+
+        # Hazards touching the new columns are baked again
+        x0 = tx0 * TILE_SIZE
+        x1 = tx1 * TILE_SIZE
+        for box in self.hazards:
+            if box[0] < x1 and box[0] + box[2] > x0:
+                grid.add_hazard(*box)
+        return True
+
+    def _window_solid(self, tx, ty):
+        return self.grid.is_solid_tile(tx + self.grid.origin, ty)
+
+    def _slide_nav(self, d):
+        w = self.nav_width
+        if d == 0 or d >= w or -d >= w:
+            return
+        nav = self.nav
+        for ty in range(self.height):
+            base = ty * w
+            if d > 0:
+                nav[base:base + w - d] = nav[base + d:base + w]
+            else:
+                nav[base - d:base + w] = nav[base:base + w + d]
+
+    def _load_chunk(self, ci):
+        """Decode chunk ci's flags (and nav) from the file into the window."""
+        f = self.file
+        h = self.height
+        grid = self.grid
+        buf = self._buf
+        start = ci * self.chunk_cols
+        cols = f.read_chunk(ci, buf)
+        for c in range(self.chunk_cols):
+            tx = start + c
+            grid.set(tx, -1, 0)
+            grid.set(tx, h, TILE_SOLID)
+            if c >= cols:
+                # Past the map's right edge: same as the border
+                for r in range(h):
+                    grid.set(tx, r, TILE_SOLID)
+                continue
+            base = c * h
+            for r in range(h):
+                grid.set(tx, r, buf[base + r])
+
+        nav = self.nav
+        w = self.nav_width
+        local = start - grid.origin
+        if self.file_nav:
+            cols = f.read_nav_chunk(ci, buf)
+        else:
+            cols = 0
+        for r in range(h):
+            row = r * w + local
+            nav[row:row + cols] = buf[r * cols:(r + 1) * cols]
+            for i in range(row + cols, row + self.chunk_cols):
+                nav[i] = 0
+        if self.tilemap is not None:
+            self.tilemap.drop_chunk(ci)
+
+    def add_hazard(self, x, y, w, h):
+        """Bake a pixel hitbox into the grid, now and whenever its columns reload."""
+        self.hazards.append((x, y, w, h))
+        self.grid.add_hazard(x, y, w, h)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
 
+    def is_solid(self, x, y):
+        return self.grid.is_solid_px(x, y)
+
+class EndlessLevel:
+    """Level-shaped window over a generated map that never ends.
+
+    Columns past `ready` are not generated yet and read as solid wall.
+    generate() extends the map within a time budget; new spawns queue up
+    in new_enemies / new_spikes for the game to take. shift() drops the
+    leftmost columns so coordinates stay small however far the run goes.
+    """
+    def __init__(self, physics, seed):
+        self.file = None
+        self.seed = seed
+        self.width = ENDLESS_COLS
+        self.height = ENDLESS_HEIGHT
+        self.pixel_width = self.width * TILE_SIZE
+        self.bitmap, self.palette = make_tile_art()
+        self.grid = CollisionGrid(self.width, self.height, TILE_SIZE)
+        self.solver = make_solver(self.grid, physics)
+        self.nav = bytearray(self.width * self.height)
+        self.nav_width = self.width
+        self.generator = EndlessGenerator(seed, self.height, *PLAYER_JUMP)
         self.enemy_spawns = []
         self.spike_spawns = []
-
-        for y in range(self.height):
-            row_string = LEVEL_MAP[y]
-            for x in range(self.width):
-                char = row_string[x]
-                if char == "#":
-                    self.tilegrid[x, y] = 1
-                elif char == "E":
-                    self.tilegrid[x, y] = 0
-                    self.enemy_spawns.append((x * TILE_SIZE, y * TILE_SIZE))
-                elif char == "S":
-                    self.tilegrid[x, y] = 0
-                    self.spike_spawns.append((x * TILE_SIZE, y * TILE_SIZE))
-                else:
-                    self.tilegrid[x, y] = 0
+        self.new_enemies = []
+        self.new_spikes = []
+        self.dirty = False  # Set once a run starts consuming the window
+        self.ready = 0      # Generated columns
+        self.nav_ready = 0  # Columns with a final nav node
+        self._column = bytearray(self.height)
+        self._wall(0, self.width)
+
+        # The opening run-up is flat: spawn on it, then build the first screens
+        self.player_spawn = (2 * TILE_SIZE, (self.generator.ground_top - 2) * TILE_SIZE)
+        self.tilemap = None
+        self.generate(VIEW_WIDTH // TILE_SIZE + ENDLESS_LOOKAHEAD, None)
+        self.tilemap = StreamingTileMap(GridChunkSource(self.grid), self.bitmap, self.palette, TILE_SIZE)
+        self.tilemap.scroll_to(0)
+
+    def close(self):
+        pass
+
+    def stream_to(self, camera_x):
+        # generate() and shift() keep the window current
+        return False
+
+    def add_hazard(self, x, y, w, h):
+        self.grid.add_hazard(x, y, w, h)
 
     def is_solid(self, x, y):
-        tx = int(x // TILE_SIZE)
-        ty = int(y // TILE_SIZE)
-        if tx < 0 or tx >= self.width:
-            return True
-        if ty < 0:
-            return False
-        if ty >= self.height:
-            return True
-        return LEVEL_MAP[ty][tx] == "#"
+        return self.grid.is_solid_px(x, y)
+
+    def _wall(self, tx0, tx1):
+        grid = self.grid
+        for tx in range(tx0, tx1):
+            for ty in range(self.height + 1):
+                grid.set(tx, ty, TILE_SOLID)
+            grid.set(tx, -1, 0)
+
+    def generate(self, target, budget):
+        """Generate up to column target; stops early once budget seconds pass."""
+        if target > self.width:
+            target = self.width
+        if self.ready >= target:
+            return
+        start = time.monotonic()
+        grid = self.grid
+        gen = self.generator
+        col = self._column
+        height = self.height
+        reach = NAV_LIMITS[1]
+        while self.ready < target:
+            tx = self.ready
+            gen.next_column(col)
+            for ty in range(height):
+                grid.set(tx, ty, TILE_SOLID if col[ty] else 0)
+            # Pits have no floor sentinel, so falling in is fatal
+            grid.set(tx, height, 0 if gen.pit else TILE_SOLID)
+            if gen.spawn == SPAWN_ENEMY:
+                self.new_enemies.append((tx * TILE_SIZE, gen.spawn_row * TILE_SIZE))
+            elif gen.spawn == SPAWN_SPIKE:
+                self.new_spikes.append((tx * TILE_SIZE, gen.spawn_row * TILE_SIZE))
+            self.ready = tx + 1
+            if self.ready % CHUNK_COLS == 0 and self.tilemap is not None:
+                self.tilemap.drop_chunk(tx // CHUNK_COLS)
+
+            # A node is final once every column its jumps can reach exists
+            while self.nav_ready + reach + 1 < self.ready:
+                update_nav_columns(self.nav, self.width, height, grid.is_solid_tile,
+                                   *NAV_LIMITS, self.nav_ready, self.nav_ready + 1)
+                self.nav_ready += 1
+
+            if budget is not None and time.monotonic() - start >= budget:
+                return
+
+    def shift(self, cols):
+        """Drop the leftmost cols columns; everything else moves left."""
+        grid = self.grid
+        flags = grid.flags
+        stride = grid.stride
+        keep = self.width - cols
+        for row in range(self.height + 2):
+            base = row * stride + 1
+            flags[base:base + keep] = flags[base + cols:base + self.width]
+        nav = self.nav
+        w = self.width
+        for ty in range(self.height):
+            base = ty * w
+            nav[base:base + keep] = nav[base + cols:base + w]
+            for i in range(base + keep, base + w):
+                nav[i] = 0
+        self._wall(keep, self.width)
+        self.ready = max(0, self.ready - cols)
+        self.nav_ready = max(0, self.nav_ready - cols)
+        self.tilemap.invalidate()
 
 class Spike:
-    def __init__(self, x, y, bitmap, palette):
+    def __init__(self, x, y, sheet):
         self.x = x
         self.y = y
         self.hitbox_x = x + 3
         self.hitbox_y = y + 6
         self.hitbox_w = 10
         self.hitbox_h = 10
-        self.sprite = displayio.TileGrid(bitmap, pixel_shader=palette, x=int(x - 8), y=int(y - 9))
+        self.sprite = sheet.make_tilegrid(x=int(x - 8), y=int(y - 9))
+        self.sprite.hidden = True # Shown by the culling pass
         # cache integer position so we don't write the same position repeatedly
         self._prev_x = int(self.sprite.x)
         self._prev_y = int(self.sprite.y)
 
-class Enemy:
-    def __init__(self, x, y):
-        self.width = 16
-        self.height = 16
-        self.start_x = x
-        self.start_y = y
-        self.x = float(x)
-        self.y = float(y)
-        self.vx = -30.0
-        self.vy = 0.0
-        self.on_ground = False
-        self.alive = True
-        self.bitmap = displayio.Bitmap(16, 16, 1)
-        self.palette = displayio.Palette(1)
-        self.palette[0] = 0x880000
-        self.sprite = displayio.TileGrid(self.bitmap, pixel_shader=self.palette, x=int(x), y=int(y))
-        # prev integer positions to avoid redundant writes
-        self._prev_sprite_x = int(self.sprite.x)
-        self._prev_sprite_y = int(self.sprite.y)
+# -----------------------------------------------------------
+# ENEMIES (struct of arrays)
+# -----------------------------------------------------------
+# Enemy state lives in parallel arrays indexed by enemy id, the same id
+# the spatial hash uses. Physics state is in profile units: array('i')
+# of 8.8 ints in fixed mode, array('f') in float mode. Published pixel
+# positions are array('h'). All enemies share one bitmap and palette;
+# only the TileGrids are per enemy.
+
+ENEMY_W = 16
+ENEMY_H = 16
+ENEMY_ALIVE = 0x01
+ENEMY_ON_GROUND = 0x02
+
+class _SolverBody:
+    """Scratch body the solver moves on behalf of array-backed entities."""
+    def __init__(self, width, height):
+        self.x = 0
+        self.y = 0
+        self.width = width
+        self.height = height
+
+def make_enemy_art():
+    """Shared (bitmap, palette) every enemy sprite draws from."""
+    bmp = displayio.Bitmap(ENEMY_W, ENEMY_H, 1)
+    pal = displayio.Palette(1)
+    pal[0] = 0x880000
+    return bmp, pal
+
+class EnemySystem:
+    def __init__(self, spawns, physics, art):
+        self.k = physics
+        self.count = n = len(spawns)
+        self.width = ENEMY_W
+        self.height = ENEMY_H
+        t = 'i' if physics.fixed else 'f'
+        self.x = array(t, [0] * n)
+        self.y = array(t, [0] * n)
+        self.vx = array(t, [0] * n)
+        self.vy = array(t, [0] * n)
+        self.start_x = array('h', [p[0] for p in spawns])
+        self.start_y = array('h', [p[1] for p in spawns])
+        self.px = array('h', [0] * n)   # Pixel position, published after each move
+        self.py = array('h', [0] * n)
+        self.flags = bytearray(n)
+        self.mark = bytearray(n)        # Scratch marks for the culling pass
+        self.nav_tile = array('h', [-1] * n) # Tile the cached nav node belongs to
+        self.nav_node = bytearray(n)
+        self._drawn_x = array('h', [0] * n)
+        self._drawn_y = array('h', [0] * n)
+        self._body = _SolverBody(physics.pos(ENEMY_W), physics.pos(ENEMY_H))
+
+        self.bitmap, self.palette = art
+        self.sprites = []
+        for i in range(n):
+            self.sprites.append(displayio.TileGrid(self.bitmap, pixel_shader=self.palette,
+                                                   x=spawns[i][0], y=spawns[i][1]))
+            self._drawn_x[i] = spawns[i][0]
+            self._drawn_y[i] = spawns[i][1]
+            self.x[i] = physics.pos(spawns[i][0])
+            self.y[i] = physics.pos(spawns[i][1])
+            self.vx[i] = physics.enemy_start_vx
+            self.px[i] = spawns[i][0]
+            self.py[i] = spawns[i][1]
+            self.flags[i] = ENEMY_ALIVE
+
+    def is_alive(self, i):
+        return (self.flags[i] & ENEMY_ALIVE) != 0
 
     def reset(self):
-        self.x = float(self.start_x)
-        self.y = float(self.start_y)
-        self.vx = 0.0
-        self.vy = 0.0
-        self.on_ground = False
-        self.alive = True
-        self.sprite.hidden = False
-        # only set sprite pos if different
-        sx = int(self.x)
-        sy = int(self.y)
-        if self._prev_sprite_x != sx:
-            self.sprite.x = sx
-            self._prev_sprite_x = sx
-        if self._prev_sprite_y != sy:
-            self.sprite.y = sy
-            self._prev_sprite_y = sy
-
-    def update(self, dt, level, player):
-        if not self.alive:
-            return
-        dist_to_player = player.x - self.x
-
-        if abs(dist_to_player) < ENEMY_VISION:
-            target_vel = ENEMY_SPEED if dist_to_player > 0 else -ENEMY_SPEED
-            if self.vx < target_vel:
-                self.vx += WALK_ACCEL * dt
-            elif self.vx > target_vel:
-                self.vx -= WALK_ACCEL * dt
-        else:
-            if self.vx > 0:
-                self.vx = max(0, self.vx - FRICTION * dt)
-            elif self.vx < 0:
-                self.vx = min(0, self.vx + FRICTION * dt)
-
-        if self.on_ground:
-            look_dir = 1 if self.vx > 0 else -1
-            check_x = self.x + (self.width if look_dir == 1 else 0) + (look_dir * 10)
-            wall_blocked = level.is_solid(check_x, self.y + 8)
-            gap_ahead = not level.is_solid(check_x, self.y + self.height + 2)
-            if wall_blocked or gap_ahead:
-                if abs(self.vx) > 10:
-                    self.vy = ENEMY_JUMP_FORCE
-                    self.on_ground = False
-
-        self.vy += GRAVITY * dt
-        self.x += self.vx * dt
-
-        if self.vx > 0:
-            if level.is_solid(self.x + self.width, self.y) or level.is_solid(self.x + self.width, self.y + self.height - 1):
-                self.x = (int((self.x + self.width) // TILE_SIZE) * TILE_SIZE) - self.width - 0.01
-                self.vx = 0
-        elif self.vx < 0:
-            if level.is_solid(self.x, self.y) or level.is_solid(self.x, self.y + self.height - 1):
-                self.x = (int(self.x // TILE_SIZE) + 1) * TILE_SIZE + 0.01
-                self.vx = 0
-
-        self.y += self.vy * dt
-        self.on_ground = False
-
-        if self.vy > 0:
-            if level.is_solid(self.x + 2, self.y + self.height) or level.is_solid(self.x + self.width - 2, self.y + self.height):
-                self.y = (int((self.y + self.height) // TILE_SIZE) * TILE_SIZE) - self.height
-                self.vy = 0
-                self.on_ground = True
-        elif self.vy < 0:
-            if level.is_solid(self.x + 2, self.y) or level.is_solid(self.x + self.width - 2, self.y):
-                self.y = (int(self.y // TILE_SIZE) + 1) * TILE_SIZE
-                self.vy = 0
-
-        if self.y > 300:
-            self.alive = False
-            self.sprite.hidden = True
-
-        # only update sprite.x/y if the integer position changed
-        sx = int(self.x)
-        sy = int(self.y)
-        if self._prev_sprite_x != sx:
-            self.sprite.x = sx
-            self._prev_sprite_x = sx
-        if self._prev_sprite_y != sy:
-            self.sprite.y = sy
-            self._prev_sprite_y = sy
+        k = self.k
+        for i in range(self.count):
+            self.x[i] = k.pos(self.start_x[i])
+            self.y[i] = k.pos(self.start_y[i])
+            self.vx[i] = 0
+            self.vy[i] = 0
+            self.px[i] = self.start_x[i]
+            self.py[i] = self.start_y[i]
+            self.flags[i] = ENEMY_ALIVE
+            self.nav_tile[i] = -1
+            self.sprites[i].hidden = False
+        self.draw(range(self.count))
+
+    def kill(self, i):
+        self.flags[i] = 0
+        self.sprites[i].hidden = True
+
+    def forget_nav(self):
+        """Drop cached nav nodes (the nav window moved)."""
+        nav_tile = self.nav_tile
+        for i in range(self.count):
+            nav_tile[i] = -1
+
+    def free_slot(self):
+        """Index of a dead enemy to reuse, or -1."""
+        flags = self.flags
+        for i in range(self.count):
+            if not flags[i]:
+                return i
+        return -1
+
+    def spawn(self, i, x, y):
+        """Bring slot i back at pixel (x, y); the caller adds it to the hash."""
+        k = self.k
+        self.x[i] = k.pos(x)
+        self.y[i] = k.pos(y)
+        self.vx[i] = k.enemy_start_vx
+        self.vy[i] = 0
+        self.px[i] = x
+        self.py[i] = y
+        self.flags[i] = ENEMY_ALIVE
+        self.nav_tile[i] = -1
+        self.draw((i,))
+
+    def update(self, ids, level, player, entity_hash):
+        """One tick for every enemy in ids, re-bucketing them in the hash."""
+        k = self.k
+        xs = self.x
+        ys = self.y
+        vxs = self.vx
+        vys = self.vy
+        pxs = self.px
+        pys = self.py
+        flags = self.flags
+        body = self._body
+        solver = level.solver
+        to_px = k.to_px
+        player_x = player.body.x
+        vision = k.vision
+        speed = k.enemy_speed
+        walk_accel = k.walk_accel
+        friction = k.friction
+        gravity = k.gravity
+        dt = k.dt
+        nav = level.nav
+        nav_w = level.nav_width
+        nav_x0 = level.grid.origin
+        nav_h = level.height
+        nav_tile = self.nav_tile
+        nav_node = self.nav_node
+
+        for i in ids:
+            f = flags[i]
+            if not (f & ENEMY_ALIVE):
+                continue
+            vx = vxs[i]
+            vy = vys[i]
+            dist_to_player = player_x - xs[i]
+
+            if abs(dist_to_player) < vision:
+                target_vel = speed if dist_to_player > 0 else -speed
+                if vx < target_vel:
+                    vx += walk_accel
+                elif vx > target_vel:
+                    vx -= walk_accel
+            else:
+                if vx > 0:
+                    vx = max(0, vx - friction)
+                elif vx < 0:
+                    vx = min(0, vx + friction)
+
+            if f & ENEMY_ON_GROUND:
+                # Steering reads the nav graph only when the enemy changes tile
+                tx = (pxs[i] + 8) // TILE_SIZE - nav_x0
+                ty = (pys[i] + 8) // TILE_SIZE
+                tile = ty * nav_w + tx
+                if tile != nav_tile[i]:
+                    nav_tile[i] = tile
+                    if 0 <= tx < nav_w and 0 <= ty < nav_h:
+                        nav_node[i] = nav[tile]
+                    else:
+                        nav_node[i] = 0
+                node = nav_node[i]
+                if node & NAV_STAND and vx != 0:
+                    side = 1 if vx > 0 else 0
+                    if not node & NAV_WALK[side]:
+                        if node & NAV_JUMP[side]:
+                            if abs(vx) > k.v_move:
+                                vy = k.enemy_jump
+                        elif not node & NAV_DROP[side]:
+                            # Dead end (pit or unclimbable wall): hold the edge
+                            vx = 0
+
+            vy += gravity
+
+            body.x = xs[i]
+            body.y = ys[i]
+            contacts = solver.move(body, vx * dt, vy * dt)
+            if contacts & (CONTACT_LEFT | CONTACT_RIGHT):
+                vx = 0
+            if contacts & (CONTACT_GROUND | CONTACT_CEILING):
+                vy = 0
+            xs[i] = body.x
+            ys[i] = body.y
+            vxs[i] = vx
+            vys[i] = vy
+            f = ENEMY_ALIVE | (ENEMY_ON_GROUND if contacts & CONTACT_GROUND else 0)
+
+            sx = int(to_px(body.x))
+            sy = int(to_px(body.y))
+            pxs[i] = sx
+            pys[i] = sy
+            if sy > 300:
+                f = 0
+                self.sprites[i].hidden = True
+                entity_hash.remove(i)
+            else:
+                entity_hash.move(i, sx, ENEMY_W)
+            flags[i] = f
+
+    def draw(self, ids):
+        """Push pixel positions to the sprites of ids, only where they changed."""
+        pxs = self.px
+        pys = self.py
+        drawn_x = self._drawn_x
+        drawn_y = self._drawn_y
+        sprites = self.sprites
+        for i in ids:
+            sx = pxs[i]
+            if drawn_x[i] != sx:
+                sprites[i].x = sx
+                drawn_x[i] = sx
+            sy = pys[i]
+            if drawn_y[i] != sy:
+                sprites[i].y = sy
+                drawn_y[i] = sy
 
 class Player:
-    def __init__(self, x, y):
+    def __init__(self, x, y, physics, atlas):
+        self.k = physics
         self.width = 12
         self.height = 16
         self.x = float(x)
         self.y = float(y)
         self.vx = 0.0
         self.vy = 0.0
+        # Physics runs on body: the player itself in float mode, ints otherwise
+        self.body = FixedBody(x, y, self.width, self.height) if physics.fixed else self
         self.on_ground = False
         self.facing_right = True
         self.is_sliding = False
@@ -235,318 +744,228 @@ class Player:
         # cached prev values to avoid redundant writes
         self._prev_group_x = None
         self._prev_group_y = None
-        self._prev_frame_index = None
-        self._prev_flip_x = None
 
-        def load_sprite(name, filename, tile_w=32, tile_h=32, frame_count=None):
-            try:
-                bmp = displayio.OnDiskBitmap(f"/sprites/{filename}")
-                pal = bmp.pixel_shader
-                if isinstance(pal, displayio.ColorConverter):
-                    pal.make_transparent(0xFF00FF)
-                else:
-                    pal.make_transparent(0)
-                    for i in range(len(pal)):
-                        if pal[i] == 0xFF00FF:
-                            pal.make_transparent(i)
-
-                grid = displayio.TileGrid(bmp, pixel_shader=pal, tile_width=tile_w, tile_height=tile_h)
-                grid.hidden = True
-                self.group.append(grid)
-
-                cols = bmp.width // tile_w
-                rows = bmp.height // tile_h
-                total_frames = cols * rows
-                if frame_count is not None:
-                    total_frames = frame_count
-
-                self.sprites[name] = {"grid": grid, "frames": total_frames}
-
-            except Exception as e:
-                print(f"Failed to load {filename}: {e}")
-                fallback = displayio.Bitmap(16, 16, 1)
-                pal = displayio.Palette(1)
-                pal[0] = 0xFF0000
-                grid = displayio.TileGrid(fallback, pixel_shader=pal)
-                grid.hidden = True
-                self.group.append(grid)
-                self.sprites[name] = {"grid": grid, "frames": 1}
-
-        load_sprite("run", "run.bmp", 32, 32)
-        load_sprite("jump", "jump.bmp", 32, 32, frame_count=3)
-        load_sprite("slide", "slide.bmp", 32, 32, frame_count=3)
-        load_sprite("death", "death.bmp", 32, 32)
-
-        self.current_anim = "run"
-        self.anim_timer = 0.0
-        self.frame_index = 0
-        self.set_animation("run")
-
-    def set_animation(self, name):
-        if self.current_anim == name:
-            return
-        if self.current_anim in self.sprites:
-            self.sprites[self.current_anim]["grid"].hidden = True
-        self.current_anim = name
-        if name in self.sprites:
-            self.sprites[name]["grid"].hidden = False
-            self.frame_index = 0
-            # reset cached values so the first frame forces an update
-            self._prev_frame_index = None
-            self._prev_flip_x = None
+        # Every animation is a clip over the atlas; writes happen only on change
+        self.sprites, grids = clips_from_atlas(atlas, PLAYER_CLIPS)
+        for grid in grids:
+            self.group.append(grid)
+        self.anim = Animator(self.sprites)
+        self.anim_accum = 0.0
+        self.anim.play("run")
+
+    def ghost_state(self):
+        """Shown clip, frame and flip packed for the ghost recorder."""
+        anim = self.anim
+        return pack_state(PLAYER_CLIP_IDS[anim.name], anim.frame, anim.flip_x)
+
+    def _anim_ticks(self, dt):
+        # Whole animation ticks elapsed; exactly one per fixed physics step
+        self.anim_accum += dt
+        ticks = 0
+        while self.anim_accum >= TICK_DT:
+            self.anim_accum -= TICK_DT
+            ticks += 1
+        return ticks
+
+    def _place(self):
+        gx = int(self.x + self.sprite_offset_x)
+        gy = int(self.y + self.sprite_offset_y)
+        # only change group position if different
+        if self._prev_group_x != gx:
+            self.group.x = gx
+            self._prev_group_x = gx
+        if self._prev_group_y != gy:
+            self.group.y = gy
+            self._prev_group_y = gy
+
+    def _sync(self):
+        # Publish pixel position for rendering, camera and overlap tests
+        b = self.body
+        if b is not self:
+            self.x = b.x >> FP_SHIFT
+            self.y = b.y >> FP_SHIFT
+            self.vx = b.vx
+            self.vy = b.vy
+
+    def bounce(self):
+        self.body.vy = self.k.bounce
+        self._sync()
 
     def die(self):
         if self.is_dead:
             return
         self.is_dead = True
-        self.vx = 0
-        self.vy = 0
-        self.set_animation("death")
-        self.frame_index = 0
-        self.anim_timer = 0
+        self.body.vx = 0
+        self.body.vy = 0
+        self._sync()
+        self.anim.play("death", restart=True)
 
     def reset_state(self, start_x, start_y):
-        self.x = float(start_x)
-        self.y = float(start_y)
-        self.vx = 0.0
-        self.vy = 0.0
+        b = self.body
+        b.x = self.k.pos(start_x)
+        b.y = self.k.pos(start_y)
+        b.vx = 0
+        b.vy = 0
+        self._sync()
         self.on_ground = False
         self.facing_right = True
         self.is_sliding = False
         self.slide_cooldown = 0.0
         self.is_dead = False
-        self.set_animation("run")
-        self.frame_index = 0
+        self.anim_accum = 0.0
+        self.anim.play("run", restart=True)
 
     def update(self, handler, dt, level):
 
         if self.is_dead:
-            self.set_animation("death")
-            anim_data = self.sprites["death"]
-            self.anim_timer += dt
-            if self.anim_timer > 0.2:
-                if self.frame_index < anim_data["frames"] - 1:
-                    self.frame_index += 1
-                self.anim_timer = 0
-
-            active_grid = anim_data["grid"]
-            gx = int(self.x + self.sprite_offset_x)
-            gy = int(self.y + self.sprite_offset_y)
-            # only change group position if different
-            if self._prev_group_x != gx:
-                self.group.x = gx
-                self._prev_group_x = gx
-            if self._prev_group_y != gy:
-                self.group.y = gy
-                self._prev_group_y = gy
-            if self._prev_frame_index != self.frame_index:
-                active_grid[0] = self.frame_index
-                self._prev_frame_index = self.frame_index
+            self.anim.play("death")
+            self.anim.advance(self._anim_ticks(dt))
+            self._place()
             return
 
+        k = self.k
+        b = self.body
         ax, ay = handler.get_axis()
         if self.slide_cooldown > 0:
-            self.slide_cooldown -= dt
+            self.slide_cooldown -= k.dt
 
         if handler.was_just_pressed("Y") and self.on_ground and not self.is_sliding and self.slide_cooldown <= 0:
             self.is_sliding = True
-            self.slide_cooldown = 2.0
-            direction = 1 if self.facing_right else -1
-            self.vx = direction * SLIDE_SPEED
-            self.frame_index = 0
+            self.slide_cooldown = k.slide_cooldown
+            b.vx = k.slide_speed if self.facing_right else -k.slide_speed
 
         if self.is_sliding:
-            if self.vx > 0:
-                self.vx -= SLIDE_FRICTION * dt
-                if self.vx < 0:
-                    self.vx = 0
-            elif self.vx < 0:
-                self.vx += SLIDE_FRICTION * dt
-                if self.vx > 0:
-                    self.vx = 0
-            if abs(self.vx) < 5 or not self.on_ground:
+            if b.vx > 0:
+                b.vx -= k.slide_friction
+                if b.vx < 0:
+                    b.vx = 0
+            elif b.vx < 0:
+                b.vx += k.slide_friction
+                if b.vx > 0:
+                    b.vx = 0
+            if abs(b.vx) < k.v_stop or not self.on_ground:
                 self.is_sliding = False
         else:
             if abs(ax) > 0.1:
-                self.vx += ax * WALK_ACCEL * dt
+                b.vx += k.accel(ax, k.walk_accel)
                 self.facing_right = (ax > 0)
             else:
-                if self.vx > 0:
-                    self.vx = max(0, self.vx - FRICTION * dt)
-                elif self.vx < 0:
-                    self.vx = min(0, self.vx + FRICTION * dt)
-            self.vx = max(min(self.vx, MAX_SPEED), -MAX_SPEED)
-
-        dx = self.vx * dt
-        if dx > 14:
-            dx = 14
-        elif dx < -14:
-            dx = -14
-        self.x += dx
-
-        if self.vx > 0:
-            if level.is_solid(self.x + self.width, self.y) or level.is_solid(self.x + self.width, self.y + self.height - 0.1):
-                self.x = (int((self.x + self.width) // TILE_SIZE) * TILE_SIZE) - self.width - 0.01
-                self.vx = 0
-                self.is_sliding = False
-        elif self.vx < 0:
-            if level.is_solid(self.x, self.y) or level.is_solid(self.x, self.y + self.height - 0.1):
-                self.x = (int(self.x // TILE_SIZE) + 1) * TILE_SIZE + 0.01
-                self.vx = 0
-                self.is_sliding = False
+                if b.vx > 0:
+                    b.vx = max(0, b.vx - k.friction)
+                elif b.vx < 0:
+                    b.vx = min(0, b.vx + k.friction)
+            b.vx = max(min(b.vx, k.max_speed), -k.max_speed)
+
+        solver = level.solver
+        if solver.move_x(b, b.vx * k.dt):
+            b.vx = 0
+            self.is_sliding = False
 
         if handler.was_just_pressed("A") and self.on_ground and not self.is_sliding:
-            self.vy = JUMP_FORCE
+            b.vy = k.jump_force
             self.on_ground = False
-        if handler.was_just_released("A") and self.vy < 0:
-            self.vy *= JUMP_CUT
+        if handler.was_just_released("A") and b.vy < 0:
+            b.vy = k.jump_cut(b.vy)
 
-        self.vy += GRAVITY * dt
-        if self.vy > MAX_FALL_SPEED:
-            self.vy = MAX_FALL_SPEED
+        b.vy += k.gravity
+        if b.vy > k.max_fall:
+            b.vy = k.max_fall
 
-        dy = self.vy * dt
-        if dy > 14:
-            dy = 14
-        elif dy < -14:
-            dy = -14
-        self.y += dy
-
-        self.on_ground = False
-        if self.vy > 0:
-            if level.is_solid(self.x + 2, self.y + self.height) or level.is_solid(self.x + self.width - 2, self.y + self.height):
-                self.y = (int((self.y + self.height) // TILE_SIZE) * TILE_SIZE) - self.height
-                self.vy = 0
-                self.on_ground = True
-        elif self.vy < 0:
-            if level.is_solid(self.x + 2, self.y) or level.is_solid(self.x + self.width - 2, self.y):
-                self.y = (int(self.y // TILE_SIZE) + 1) * TILE_SIZE
-                self.vy = 0
+        contacts = solver.move_y(b, b.vy * k.dt)
+        if contacts:
+            b.vy = 0
+        self.on_ground = contacts == CONTACT_GROUND
+        self._sync()
 
         if self.y > 300 and not self.is_dead:
             self.die()
 
-        new_anim = "run"
         if self.is_sliding:
-            new_anim = "slide"
+            self.anim.play("slide")
         elif not self.on_ground:
-            new_anim = "jump"
-        elif abs(self.vx) > 10:
-            new_anim = "run"
+            self.anim.play("jump")
         else:
-            new_anim = "run"
-
-        self.set_animation(new_anim)
-        anim_data = self.sprites[self.current_anim]
-
-        # Animation frame logic unchanged, but we only write to display when something changed.
-        if self.current_anim == "run":
-            if abs(self.vx) > 10:
-                self.anim_timer += dt
-                if self.anim_timer > 0.1:
-                    self.frame_index = (self.frame_index + 1) % anim_data["frames"]
-                    self.anim_timer = 0
-            else:
-                self.frame_index = 0
-        elif self.current_anim == "jump":
-            self.anim_timer += dt
-            if self.anim_timer > 0.15:
-                next_frame = self.frame_index + 1
-                if next_frame < anim_data["frames"]:
-                    self.frame_index = next_frame
-                else:
-                    self.frame_index = anim_data["frames"] - 1
-                self.anim_timer = 0
-        elif self.current_anim == "slide":
-            self.anim_timer += dt
-            if self.anim_timer > 0.08:
-                next_frame = self.frame_index + 1
-                if next_frame < anim_data["frames"]:
-                    self.frame_index = next_frame
-                else:
-                    self.frame_index = anim_data["frames"] - 1
-                self.anim_timer = 0
-
-        active_grid = anim_data["grid"]
-        gx = int(self.x + self.sprite_offset_x)
-        gy = int(self.y + self.sprite_offset_y)
-        # write group position only if it changed
-        if self._prev_group_x != gx:
-            self.group.x = gx
-            self._prev_group_x = gx
-        if self._prev_group_y != gy:
-            self.group.y = gy
-            self._prev_group_y = gy
+            self.anim.play("run")
+
+        ticks = self._anim_ticks(dt)
+        if self.anim.name == "run" and abs(b.vx) <= k.v_move:
+            self.anim.rewind() # Standing still holds the first run frame
+        else:
+            self.anim.advance(ticks)
+        self.anim.set_flip(not self.facing_right)
+        self._place()
+
+class _HeldInput:
+    """Handler view for extra ticks in one frame: held state only, no edges."""
+    def __init__(self):
+        self.handler = None
+
+    def get_axis(self):
+        return self.handler.get_axis()
 
-        # flip_x only if changed
-        flip_val = not self.facing_right
-        if self._prev_flip_x != flip_val:
-            active_grid.flip_x = flip_val
-            self._prev_flip_x = flip_val
+    def is_pressed(self, name):
+        return self.handler.is_pressed(name)
 
-        # frame index only if changed
-        if self._prev_frame_index != self.frame_index:
-            active_grid[0] = self.frame_index
-            self._prev_frame_index = self.frame_index
+    def was_just_pressed(self, name):
+        return False
+
+    def was_just_released(self, name):
+        return False
 
 class PlatformerGame(BaseState):
     def __init__(self, manager):
         super().__init__(manager)
 
+        self.physics = FixedPhysics() if FIXED_POINT else FloatPhysics()
+        self.tick_accum = 0.0
+        self.held_input = _HeldInput()
+
         self.bg = Rect(0, 0, 340, 260, fill=0x6B8CFF)
         self.root_group.append(self.bg)
 
         self.world = displayio.Group()
         self.root_group.append(self.world)
 
-        self.level = Level()
-        self.world.append(self.level.tilegrid)
-
-        # --- LOAD SPIKE ASSET ---
-        try:
-            self.spike_bmp = displayio.OnDiskBitmap("/sprites/spike.bmp")
-            self.spike_pal = self.spike_bmp.pixel_shader
-            if isinstance(self.spike_pal, displayio.ColorConverter):
-                self.spike_pal.make_transparent(0xFF00FF)
-            else:
-                self.spike_pal.make_transparent(0)
-                for i in range(len(self.spike_pal)):
-                    if self.spike_pal[i] == 0xFF00FF:
-                        self.spike_pal.make_transparent(i)
-        except:
-            print("Err: spike.bmp missing")
-            self.spike_bmp = displayio.Bitmap(32, 32, 1)
-            self.spike_pal = displayio.Palette(1)
-            self.spike_pal[0] = 0x555555
-
-        # --- SPAWN SPIKES ---
+        # --- SPRITES (decoded once into a RAM atlas, held via the asset manager) ---
+        assets = manager.assets
+        self.atlas = assets.acquire(STATE_PLATFORMER, "sprites", lambda: SpriteAtlas(SPRITE_ASSETS))
+        self.enemy_art = assets.acquire(STATE_PLATFORMER, "enemy_art", make_enemy_art)
+        self.spike_sheet = self.atlas.get("spike")
+
+        self.player = Player(50, 50, self.physics, self.atlas)
+
+        # --- GHOST (best run per level, replayed over the player's atlas) ---
+        ghost_clips, ghost_grids = clips_from_atlas(self.atlas, PLAYER_CLIPS)
+        self.ghost = Ghost(ghost_clips, ghost_grids, PLAYER_CLIP_NAMES,
+                           self.player.sprite_offset_x, self.player.sprite_offset_y)
+        self.recorder = GhostRecorder()
+
+        # --- LEVEL ---
+        self.level_paths = list_levels()
+        self.level_index = 0
+        self.level = None
+        self.endless = False
+        self.distance_base = 0 # px dropped off the left of an endless window
         self.spikes = []
-        for pos in self.level.spike_spawns:
-            self.spikes.append(Spike(pos[0], pos[1], self.spike_bmp, self.spike_pal))
-
-        for s in self.spikes:
-            self.world.append(s.sprite)
-
-        # --- ENEMIES ---
-        self.enemies = []
-        for pos in self.level.enemy_spawns:
-            self.enemies.append(Enemy(pos[0], pos[1]))
-
-        for e in self.enemies:
-            self.world.append(e.sprite)
-
-        self.player = Player(50, 50)
-        self.world.append(self.player.group)
-
-        self.hud = label.Label(self.manager.font_game, text="MARIO DEMO", x=10, y=10, color=0xFFFFFF, background_color=0x000000)
+        self.enemies = None
+        self.entity_hash = None
+        self._nearby = [] # Reused broadphase result list
+        self._active = []  # Enemies inside the simulation region
+        self._shown = []   # Enemy ids currently visible
+        self._in_view = []
+        self._spike_lo = 0 # Visible slice of self.spikes (sorted by x)
+        self._spike_hi = 0
+        self.load_level(0)
+
+        self.hud = label.Label(self.manager.font_game, text="P:", x=10, y=10, color=0xFFFFFF, background_color=0x000000)
         self.root_group.append(self.hud)
+        self.hud_x = None
+        self._size_hud()
 
         self.camera_x = 0
         # store previous world.x to avoid redundant display writes
         self._prev_world_x = None
 
-        self.hud_timer = 0
-
         self.game_state = "PLAYING"
         self.death_timer = 0.0
 
@@ -554,19 +973,7 @@ class PlatformerGame(BaseState):
         self.overlay_group = displayio.Group()
         self.overlay_group.hidden = True
 
-        dither_bmp = displayio.Bitmap(320, 240, 2)
-        dither_pal = displayio.Palette(2)
-        dither_pal[0] = 0x000000
-        dither_pal.make_transparent(0)
-        dither_pal[1] = 0x000000
-
-        for y in range(0, 240, 2):
-            for x in range(0, 320, 2):
-                dither_bmp[x, y] = 1
-                if x+1 < 320 and y+1 < 240:
-                    dither_bmp[x+1, y+1] = 1
-
-        self.overlay_bg = displayio.TileGrid(dither_bmp, pixel_shader=dither_pal)
+        self.overlay_bg = pattern_overlay(320, 240)
         self.overlay_group.append(self.overlay_bg)
 
         self.overlay_text = label.Label(self.manager.font_ui, text="YOU DIED", scale=3, x=90, y=100, color=0xFF0000)
@@ -577,74 +984,451 @@ class PlatformerGame(BaseState):
 
         self.root_group.append(self.overlay_group)
 
+    def load_level(self, index):
+        """Swap in another level; the world group is rebuilt from its spawns."""
+        if self.level is not None:
+            self.level.close()
+        while len(self.world) > 0:
+            self.world.pop()
+        self.level = None
+        self.spikes = []
+        self.enemies = None
+        gc.collect()
+
+        path = None
+        self.endless = index == ENDLESS_LEVEL
+        self.distance_base = 0
+        if self.endless:
+            self.level = EndlessLevel(self.physics, int(time.monotonic() * 1000))
+            # Fixed pool of slots; generated spawns take dead ones
+            enemy_spawns = [(0, 0)] * ENDLESS_ENEMY_SLOTS
+        else:
+            if self.level_paths:
+                self.level_index = index % len(self.level_paths)
+                path = self.level_paths[self.level_index]
+            self.level = Level(path, self.physics)
+            enemy_spawns = self.level.enemy_spawns
+        self.world.append(self.level.tilemap.group)
+
+        # --- SPAWN SPIKES ---
+        for pos in self.level.spike_spawns:
+            self.spikes.append(Spike(pos[0], pos[1], self.spike_sheet))
+        self.spikes.sort(key=lambda s: s.x)
+        self._spike_lo = 0
+        self._spike_hi = 0
+
+        # Spikes are static: bake their hitboxes into the hazard layer once
+        for s in self.spikes:
+            self.world.append(s.sprite)
+            self.level.add_hazard(s.hitbox_x, s.hitbox_y, s.hitbox_w, s.hitbox_h)
+
+        # --- ENEMIES ---
+        self.enemies = EnemySystem(enemy_spawns, self.physics, self.enemy_art)
+        for sprite in self.enemies.sprites:
+            self.world.append(sprite)
+        if self.endless:
+            for i in range(self.enemies.count):
+                self.enemies.kill(i)
+
+        # Broadphase over enemies; ids are EnemySystem indices
+        self.entity_hash = SpatialHash(self.level.pixel_width, self.enemies.count, TILE_SIZE)
+        self._shown.clear()
+        self._in_view.clear()
+        for i in range(self.enemies.count):
+            if self.enemies.is_alive(i):
+                self.entity_hash.insert(i, self.enemies.px[i], ENEMY_W)
+                self._shown.append(i)
+
+        # Every endless map is new, so there is no ghost to race
+        self.ghost.load(None if self.endless else read_ghost(ghost_path(path)))
+        self.world.append(self.ghost.group)
+        self.world.append(self.player.group)
+        if self.endless:
+            self.manager.log(f"Endless run, seed {self.level.seed}")
+        else:
+            self.manager.log(f"Level {self.level_index + 1} loaded")
+
+    def select_level(self, index):
+        """index: level file number, or ENDLESS_LEVEL."""
+        if index == ENDLESS_LEVEL:
+            if not self.endless:
+                self.load_level(index)
+        elif self.endless or (self.level_paths and index % len(self.level_paths) != self.level_index):
+            self.load_level(index)
+
+    def level_count(self):
+        return max(1, len(self.level_paths))
+
+    def _size_hud(self):
+        """Distance readout wide enough for the current mode, right after the caption."""
+        digits = ENDLESS_HUD_DIGITS if self.endless else HUD_DIGITS
+        old = self.hud_x
+        if old is not None and old.digits == digits:
+            return
+        self.hud_x = number_after(self.hud, self.manager.font_game, digits, background=0x000000)
+        if old is not None:
+            self.root_group.remove(old.grid)
+        self.root_group.insert(self.root_group.index(self.hud) + 1, self.hud_x.grid)
+
     def reset(self):
-        self.player.reset_state(50, 50)
+        if self.endless and self.level.dirty:
+            # The old window has been played and shifted: start a fresh map
+            self.load_level(ENDLESS_LEVEL)
+        self._size_hud()
+        sx, sy = self.level.player_spawn
+        self.player.reset_state(sx, sy)
         self.camera_x = 0
         # only write when different
         desired_world_x = 0
         if self._prev_world_x != desired_world_x:
             self.world.x = desired_world_x
             self._prev_world_x = desired_world_x
-
-        for e in self.enemies:
-            e.reset()
+        self._scroll_level(0)
+
+        enemies = self.enemies
+        if not self.endless:
+            enemies.reset()
+        self.entity_hash.clear()
+        self._shown.clear()
+        for i in range(enemies.count):
+            if enemies.is_alive(i):
+                self.entity_hash.insert(i, enemies.px[i], ENEMY_W)
+                self._shown.append(i) # reset() shows every sprite
+        self._cull()
+
+        if not self.endless:
+            self.recorder.start(int(self.player.x), int(self.player.y))
+        self.ghost.start()
 
         self.game_state = "PLAYING"
+        self.tick_accum = 0.0
         self.overlay_group.hidden = True
         self.manager.log("Platformer: Reset")
 
+    def snapshot(self):
+        """Binary quick-save of the running level, or None if not resumable."""
+        if self.game_state != "PLAYING" or self.endless:
+            return None
+        t = 'i' if self.physics.fixed else 'f'
+        head_fmt = SNAP_HEADER_FMT.format(t)
+        enemy_fmt = SNAP_ENEMY_FMT.format(t)
+        enemy_size = struct.calcsize(enemy_fmt)
+        enemies = self.enemies
+        b = self.player.body
+        flags = (SNAP_FACING_RIGHT if self.player.facing_right else 0) | \
+                (SNAP_ON_GROUND if self.player.on_ground else 0)
+
+        head_size = struct.calcsize(head_fmt)
+        blob = bytearray(head_size + enemies.count * enemy_size)
+        struct.pack_into(head_fmt, blob, 0, int(self.physics.fixed), self.level_index,
+                         b.x, b.y, b.vx, b.vy, flags, self.camera_x, enemies.count)
+        pos = head_size
+        for i in range(enemies.count):
+            struct.pack_into(enemy_fmt, blob, pos, enemies.x[i], enemies.y[i],
+                             enemies.vx[i], enemies.vy[i], enemies.flags[i])
+            pos += enemy_size
+        return blob
+
+    def restore(self, blob):
+        """Apply a snapshot() blob in place; False leaves the game untouched."""
+        t = 'i' if self.physics.fixed else 'f'
+        head_fmt = SNAP_HEADER_FMT.format(t)
+        enemy_fmt = SNAP_ENEMY_FMT.format(t)
+        head_size = struct.calcsize(head_fmt)
+        enemy_size = struct.calcsize(enemy_fmt)
+        if len(blob) < head_size:
+            return False
+        (fixed, level_index, x, y, vx, vy, flags,
+         camera_x, count) = struct.unpack_from(head_fmt, blob, 0)
+        if fixed != int(self.physics.fixed) or len(blob) != head_size + count * enemy_size:
+            return False
+
+        # Only a different level needs its world rebuilt
+        self.select_level(level_index)
+        if self.level_index != level_index or self.enemies.count != count:
+            return False
+        self.reset()
+
+        player = self.player
+        b = player.body
+        b.x, b.y, b.vx, b.vy = x, y, vx, vy
+        player._sync()
+        player.facing_right = (flags & SNAP_FACING_RIGHT) != 0
+        player.on_ground = (flags & SNAP_ON_GROUND) != 0
+
+        k = self.physics
+        enemies = self.enemies
+        entity_hash = self.entity_hash
+        entity_hash.clear()
+        self._shown.clear()
+        pos = head_size
+        for i in range(count):
+            ex, ey, evx, evy, eflags = struct.unpack_from(enemy_fmt, blob, pos)
+            pos += enemy_size
+            enemies.x[i] = ex
+            enemies.y[i] = ey
+            enemies.vx[i] = evx
+            enemies.vy[i] = evy
+            enemies.px[i] = int(k.to_px(ex))
+            enemies.py[i] = int(k.to_px(ey))
+            if eflags & ENEMY_ALIVE:
+                enemies.flags[i] = eflags
+                entity_hash.insert(i, enemies.px[i], ENEMY_W)
+                self._shown.append(i)
+            else:
+                enemies.kill(i)
+
+        self.camera_x = camera_x
+        self.world.x = self._prev_world_x = -int(camera_x)
+        self._scroll_level(camera_x)
+        self._cull()
+        player._place()
+        # A resumed run is not a clean run: don't record or race it
+        self.recorder.stop()
+        self.ghost.stop()
+        return True
+
     def enter(self):
         self.manager.log("Platformer: Resume")
 
-    def update(self, handler, dt):
-        if self.game_state == "PLAYING":
-            self.player.update(handler, dt, self.level)
+    def unload(self):
+        # Evicted by the manager: close the level file, drop the world
+        if self.level is not None:
+            self.level.close()
+            self.level = None
+        while len(self.world) > 0:
+            self.world.pop()
+
+    def _tick_count(self, handler, dt):
+        if not self.physics.fixed:
+            self.physics.update(dt)
+            return 1
+        self.tick_accum += dt
+        ticks = 0
+        while self.tick_accum >= TICK_DT and ticks < MAX_TICKS_PER_FRAME:
+            self.tick_accum -= TICK_DT
+            ticks += 1
+        if ticks >= MAX_TICKS_PER_FRAME:
+            self.tick_accum = 0.0
+        if ticks == 0 and (handler.was_just_pressed("A") or handler.was_just_pressed("Y") or handler.was_just_released("A")):
+            # Run a tick early rather than drop a button edge
+            self.tick_accum -= TICK_DT
+            ticks = 1
+        return ticks
+
+    def step(self, handler, dt):
+        """One simulation tick: player, hazards, enemies."""
+        self.player.update(handler, dt, self.level)
+        player = self.player
+        self.recorder.record(int(player.x), int(player.y), player.ghost_state())
+        self.ghost.step()
+
+        if self.player.is_dead:
+            self.game_state = "DYING"
+            self.death_timer = 2.0
+            return
 
-            if self.player.is_dead:
-                self.game_state = "DYING"
-                self.death_timer = 2.0
-                return
+        px, py = self.player.x, self.player.y
+        pw, ph = self.player.width, self.player.height
+
+        # Spikes: only the tiles under the player are checked
+        if self.level.grid.hits_hazard(px, py, pw, ph):
+            self.player.die()
+            self.game_state = "DYING"
+            self.death_timer = 2.0
+            self.manager.log("Spiked!")
+
+        if not self.player.is_dead:
+            entity_hash = self.entity_hash
+            # Enemies outside the simulation region stay frozen
+            sim_x = self.camera_x - SIM_MARGIN
+            active = entity_hash.query(sim_x, VIEW_WIDTH + 2 * SIM_MARGIN, self._active)
+            enemies = self.enemies
+            enemies.update(active, self.level, self.player, entity_hash)
+
+            # Only enemies in the player's buckets get the exact test
+            ew, eh = ENEMY_W, ENEMY_H
+            for i in entity_hash.query(px, pw, self._nearby):
+                ex, ey = enemies.px[i], enemies.py[i]
+
+                if (px < ex + ew and px + pw > ex and py < ey + eh and py + ph > ey):
+                    if self.player.is_sliding:
+                        self._kill_enemy(i)
+                        self.manager.log("Enemy Defeated (Slide)")
+                    elif self.player.vy > 0 and (py + ph) < (ey + eh // 2):
+                        self._kill_enemy(i)
+                        self.player.bounce()
+                        self.manager.log("Enemy Defeated (Stomp)")
+                    else:
+                        self.player.die()
+                        self.game_state = "DYING"
+                        self.death_timer = 2.0
+                        self.manager.log("Player Killed")
+                        break
+
+    def _cull(self):
+        """Hide sprites outside the view region; cost scales with what is near it."""
+        x0 = self.camera_x - VIEW_MARGIN
+        x1 = self.camera_x + VIEW_WIDTH + VIEW_MARGIN
+
+        # Enemies: swap the shown list with this frame's view query
+        mark = self.enemies.mark
+        sprites = self.enemies.sprites
+        view = self.entity_hash.query(x0, x1 - x0, self._in_view)
+        for i in view:
+            mark[i] = 1
+        for i in self._shown:
+            if not mark[i] and not sprites[i].hidden:
+                sprites[i].hidden = True
+        for i in view:
+            mark[i] = 0
+            if sprites[i].hidden:
+                sprites[i].hidden = False
+        self._in_view = self._shown
+        self._shown = view
+        # Only visible enemies get their sprite positions pushed
+        self.enemies.draw(view)
+
+        # Spikes never move: slide a window over the x-sorted list
+        spikes = self.spikes
+        lo = self._spike_lo
+        hi = self._spike_hi
+        new_lo = lo
+        while new_lo > 0 and spikes[new_lo - 1].x >= x0:
+            new_lo -= 1
+        while new_lo < len(spikes) and spikes[new_lo].x < x0:
+            new_lo += 1
+        new_hi = max(hi, new_lo)
+        while new_hi > new_lo and spikes[new_hi - 1].x >= x1:
+            new_hi -= 1
+        while new_hi < len(spikes) and spikes[new_hi].x < x1:
+            new_hi += 1
+        if new_lo != lo or new_hi != hi:
+            for i in range(lo, hi):
+                if i < new_lo or i >= new_hi:
+                    spikes[i].sprite.hidden = True
+            for i in range(new_lo, new_hi):
+                if i < lo or i >= hi:
+                    spikes[i].sprite.hidden = False
+            self._spike_lo = new_lo
+            self._spike_hi = new_hi
+
+    def _finish_run(self, distance):
+        """Keep the run as this level's ghost if it went further than the last one."""
+        rec = self.recorder
+        rec.stop()
+        self.ghost.stop()
+        if self.endless:
+            return
+        if rec.overflow or rec.ticks == 0 or distance <= self.ghost.score:
+            return
+        blob = rec.encode(distance)
+        self.ghost.load((distance, rec.ticks, rec.start_x, rec.start_y,
+                         memoryview(blob)[GHOST_HEADER_SIZE:]))
+        path = ghost_path(self.level_paths[self.level_index] if self.level_paths else None)
+        self.manager.persistence.enqueue("ghost", lambda: write_ghost(path, blob))
+        self.manager.log(f"New best run: {distance}")
+
+    def _scroll_level(self, camera_x):
+        """Slide the level's chunk window, then the tile ring, to camera_x."""
+        if self.level.stream_to(camera_x):
+            self.enemies.forget_nav()
+        self.level.tilemap.scroll_to(camera_x)
+
+    def _stream_endless(self):
+        """Generate ahead of the camera, place new spawns, shift the window."""
+        level = self.level
+        level.dirty = True
+        first_col = int(self.camera_x) // TILE_SIZE
+        level.generate(first_col + VIEW_WIDTH // TILE_SIZE + 1 + ENDLESS_LOOKAHEAD, ENDLESS_BUDGET)
+
+        if level.new_spikes:
+            for x, y in level.new_spikes:
+                s = Spike(x, y, self.spike_sheet)
+                # Generated left to right, so the list stays sorted by x
+                self.spikes.append(s)
+                self.world.insert(1, s.sprite)
+                level.add_hazard(s.hitbox_x, s.hitbox_y, s.hitbox_w, s.hitbox_h)
+            level.new_spikes.clear()
+
+        if level.new_enemies:
+            enemies = self.enemies
+            for x, y in level.new_enemies:
+                i = enemies.free_slot()
+                if i < 0:
+                    break # Every slot is alive: the rest go unspawned
+                enemies.spawn(i, x, y)
+                self.entity_hash.insert(i, x, ENEMY_W)
+            level.new_enemies.clear()
+
+        if first_col >= ENDLESS_SHIFT_COLS + CHUNK_COLS:
+            self._shift_endless(ENDLESS_SHIFT_COLS)
+
+    def _shift_endless(self, cols):
+        """Move the whole world left by cols tiles so coordinates stay small."""
+        dx = cols * TILE_SIZE
+        k = self.physics
+        self.level.shift(cols)
+        self.distance_base += dx
+        self.camera_x -= dx
+        self._prev_world_x = None # Forces the world.x write and tilemap refill
+
+        player = self.player
+        player.body.x -= k.pos(dx)
+        player._sync()
+        player._place()
+
+        # Enemies left behind are gone; the rest move with the map
+        enemies = self.enemies
+        fp_dx = k.pos(dx)
+        entity_hash = self.entity_hash
+        entity_hash.clear()
+        self._shown.clear()
+        for i in range(enemies.count):
+            if not enemies.is_alive(i):
+                continue
+            x = enemies.px[i] - dx
+            if x < 0:
+                enemies.kill(i)
+                continue
+            enemies.x[i] -= fp_dx
+            enemies.px[i] = x
+            enemies.nav_tile[i] = -1
+            entity_hash.insert(i, x, ENEMY_W)
+            self._shown.append(i)
+
+        # Spikes: drop the ones that scrolled off, restart the visible window
+        spikes = self.spikes
+        for i in range(self._spike_lo, self._spike_hi):
+            spikes[i].sprite.hidden = True
+        kept = []
+        for s in spikes:
+            if s.x < dx:
+                self.world.remove(s.sprite)
+                continue
+            s.x -= dx
+            s.hitbox_x -= dx
+            s._prev_x = int(s.x - 8)
+            s.sprite.x = s._prev_x
+            kept.append(s)
+        self.spikes = kept
+        self._spike_lo = 0
+        self._spike_hi = 0
+
+    def _kill_enemy(self, i):
+        self.enemies.kill(i)
+        self.entity_hash.remove(i)
 
-            px, py = self.player.x, self.player.y
-            pw, ph = self.player.width, self.player.height
-
-            # Spikes
-            for spike in self.spikes:
-                if (px < spike.hitbox_x + spike.hitbox_w and
-                    px + pw > spike.hitbox_x and
-                    py < spike.hitbox_y + spike.hitbox_h and
-                    py + ph > spike.hitbox_y):
-
-                    self.player.die()
-                    self.game_state = "DYING"
-                    self.death_timer = 2.0
-                    self.manager.log("Spiked!")
-                    break
-
-            if not self.player.is_dead:
-                for enemy in self.enemies:
-                    enemy.update(dt, self.level, self.player)
-
-                    if enemy.alive:
-                        ex, ey = enemy.x, enemy.y
-                        ew, eh = enemy.width, enemy.height
-
-                        if (px < ex + ew and px + pw > ex and py < ey + eh and py + ph > ey):
-                            if self.player.is_sliding:
-                                enemy.alive = False
-                                enemy.sprite.hidden = True
-                                self.manager.log("Enemy Defeated (Slide)")
-                            elif self.player.vy > 0 and (py + ph) < (ey + eh/2):
-                                enemy.alive = False
-                                enemy.sprite.hidden = True
-                                self.player.vy = -150
-                                self.manager.log("Enemy Defeated (Stomp)")
-                            else:
-                                self.player.die()
-                                self.game_state = "DYING"
-                                self.death_timer = 2.0
-                                self.manager.log("Player Killed")
-                                break
+    def update(self, handler, dt):
+        if self.game_state == "PLAYING":
+            step_dt = TICK_DT if self.physics.fixed else dt
+            tick_input = handler
+            self.held_input.handler = handler
+            for _ in range(self._tick_count(handler, dt)):
+                self.step(tick_input, step_dt)
+                if self.game_state != "PLAYING":
+                    return
+                tick_input = self.held_input
 
             CAMERA_LEFT = 100
             CAMERA_RIGHT = 220
@@ -658,12 +1442,16 @@ class PlatformerGame(BaseState):
                 self.camera_x = 0
             if self.camera_x > max_scroll:
                 self.camera_x = max_scroll
+            if self.endless:
+                self._stream_endless()
 
             # Only update world.x if integer value changed (avoid forcing recompose every frame)
             new_world_x = -int(self.camera_x)
             if self._prev_world_x != new_world_x:
                 self.world.x = new_world_x
                 self._prev_world_x = new_world_x
+                self._scroll_level(self.camera_x)
+            self._cull()
 
             if handler.was_just_pressed("SEL"):
                 self.manager.change_state(STATE_PAUSE)
@@ -673,17 +1461,14 @@ class PlatformerGame(BaseState):
                 self.game_state = "DYING"
                 self.death_timer = 2.0
 
-            self.hud_timer += dt
-            if self.hud_timer > 0.5:
-                # update only when changed (optional)
-                new_text = f"P: {int(self.player.x)}"
-                if self.hud.text != new_text:
-                    self.hud.text = new_text
-                self.hud_timer = 0
+            # Digit tiles only; cheap enough to run every frame
+            self.hud_x.set(self.distance_base + int(self.player.x))
 
         elif self.game_state == "DYING":
             self.player.update(handler, dt, self.level)
             self.death_timer -= dt
             if self.death_timer <= 0:
                 # Trigger Save Prompt
-                self.manager.trigger_save_prompt("Mario", int(self.player.x), "Distance")
+                distance = self.distance_base + int(self.player.x)
+                self._finish_run(distance)
+                self.manager.trigger_save_prompt("Mario", distance, "Distance")
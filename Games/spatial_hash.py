@@ -0,0 +1,95 @@
+from array import array
+
+# -----------------------------------------------------------
+# SPATIAL HASH (broadphase)
+# -----------------------------------------------------------
+# The level is a long horizontal strip, so entities are bucketed by
+# tile column only: bucket b covers pixels [b * bucket_px, (b+1) * bucket_px).
+# Entities are small int ids (an index into the owner's list), which
+# keeps the per-entity state in two arrays and lets query() reuse a
+# caller-owned list instead of allocating. An entity spanning several
+# buckets sits in each of them; query() reports it once.
+#
+# The hash only answers "who might be near this span"; callers still do
+# the exact AABB test on the ids it returns.
+
+BUCKET_COLS = 4
+
+
+class SpatialHash:
+    def __init__(self, world_width, capacity, tile_size=16, bucket_cols=BUCKET_COLS):
+        self.bucket_px = tile_size * bucket_cols
+        self.n_buckets = world_width // self.bucket_px + 1
+        self.buckets = [[] for _ in range(self.n_buckets)]
+        self.capacity = capacity
+        # Bucket span per id, -1 when the id is not in the hash
+        self._lo = array('h', [-1] * capacity)
+        self._hi = array('h', [-1] * capacity)
+
+    def _bucket(self, x):
+        b = int(x) // self.bucket_px
+        if b < 0:
+            return 0
+        if b >= self.n_buckets:
+            return self.n_buckets - 1
+        return b
+
+    def insert(self, eid, x, width):
+        if self._lo[eid] != -1:
+            self.remove(eid)
+        lo = self._bucket(x)
+        hi = self._bucket(x + width - 1)
+        for b in range(lo, hi + 1):
+            self.buckets[b].append(eid)
+        self._lo[eid] = lo
+        self._hi[eid] = hi
+
+    def remove(self, eid):
+        lo = self._lo[eid]
+        if lo == -1:
+            return
+        for b in range(lo, self._hi[eid] + 1):
+            self.buckets[b].remove(eid)
+        self._lo[eid] = -1
+        self._hi[eid] = -1
+
+    def move(self, eid, x, width):
+        """Re-bucket eid; a no-op unless its bucket span changed."""
+        lo = self._bucket(x)
+        hi = self._bucket(x + width - 1)
+        old_lo = self._lo[eid]
+        if old_lo == lo and self._hi[eid] == hi:
+            return
+        if old_lo == -1:
+            return
+        self.remove(eid)
+        for b in range(lo, hi + 1):
+            self.buckets[b].append(eid)
+        self._lo[eid] = lo
+        self._hi[eid] = hi
+
+    def contains(self, eid):
+        return self._lo[eid] != -1
+
+    def clear(self):
+        for bucket in self.buckets:
+            bucket.clear()
+        for i in range(self.capacity):
+            self._lo[i] = -1
+            self._hi[i] = -1
+
+    def query(self, x, width, out):
+        """Fill out with ids whose buckets overlap [x, x + width). Returns out."""
+        out.clear()
+        q_lo = self._bucket(x)
+        q_hi = self._bucket(x + width - 1)
+        lo_arr = self._lo
+        for b in range(q_lo, q_hi + 1):
+            for eid in self.buckets[b]:
+                # Report each id only in the first bucket both spans share
+                first = lo_arr[eid]
+                if first < q_lo:
+                    first = q_lo
+                if first == b:
+                    out.append(eid)
+        return out
@@ -0,0 +1,144 @@
+import displayio
+from Games.collision import TILE_SOLID
+
+# -----------------------------------------------------------
+# STREAMING TILEMAP
+# -----------------------------------------------------------
+# Instead of one TileGrid covering the whole level, the map is drawn
+# by a ring of single-column TileGrids just wider than the screen.
+# When the camera crosses a tile boundary the column that scrolled
+# off one side is moved to the other side and refilled, so only
+# `height` tile writes happen per column scrolled and memory does not
+# depend on level length.
+#
+# Tile data comes from a chunk source: any object with width, height,
+# chunk_cols and read_chunk(index, buf) that fills buf column-major
+# (buf[col * height + row]) with collision flag bytes for chunk `index`
+# and returns the number of valid columns. A 256-entry lookup table
+# maps flag bytes to tile indices in the tile bitmap.
+
+CHUNK_COLS = 16
+
+
+class GridChunkSource:
+    """Chunk source backed by an in-RAM CollisionGrid.
+
+    width: map width in columns, for grids that are a window over it.
+    """
+    def __init__(self, grid, chunk_cols=CHUNK_COLS, width=None):
+        self.grid = grid
+        self.width = grid.width if width is None else width
+        self.height = grid.height
+        self.chunk_cols = chunk_cols
+
+    def read_chunk(self, index, buf):
+        grid = self.grid
+        h = self.height
+        start = index * self.chunk_cols
+        count = min(self.chunk_cols, self.width - start)
+        for c in range(count):
+            base = c * h
+            for r in range(h):
+                buf[base + r] = grid.get(start + c, r)
+        return count
+
+
+def solid_tile_lut():
+    """Flags -> tile index: 1 for anything solid, 0 (sky) otherwise."""
+    lut = bytearray(256)
+    for flags in range(256):
+        if flags & TILE_SOLID:
+            lut[flags] = 1
+    return lut
+
+
+class StreamingTileMap:
+    def __init__(self, source, bitmap, palette, tile_size, view_width=320, margin=1, tile_lut=None):
+        self.source = source
+        self.tile_lut = tile_lut if tile_lut is not None else solid_tile_lut()
+        self.tile_size = tile_size
+        self.height = source.height
+        self.cols = view_width // tile_size + 1 + margin
+        self.group = displayio.Group()
+
+        self.columns = []
+        for _ in range(self.cols):
+            tg = displayio.TileGrid(bitmap, pixel_shader=palette, width=1, height=self.height,
+                                    tile_width=tile_size, tile_height=tile_size)
+            tg.hidden = True
+            self.columns.append(tg)
+            self.group.append(tg)
+
+        # Two-chunk cache: the chunk under the camera and the next one
+        size = source.chunk_cols * self.height
+        self._chunk_ids = [-1, -1]
+        self._chunk_bufs = [bytearray(size), bytearray(size)]
+        self._chunk_lens = [0, 0]
+        self.first_col = None
+
+    def _load_chunk(self, index):
+        """Bring chunk `index` into cache slot 0 (most recently used)."""
+        ids = self._chunk_ids
+        if ids[0] == index:
+            return
+        if ids[1] != index:
+            # Slot 1 is always the least recently used
+            ids[1] = index
+            self._chunk_lens[1] = self.source.read_chunk(index, self._chunk_bufs[1])
+        ids[0], ids[1] = ids[1], ids[0]
+        bufs = self._chunk_bufs
+        bufs[0], bufs[1] = bufs[1], bufs[0]
+        lens = self._chunk_lens
+        lens[0], lens[1] = lens[1], lens[0]
+
+    def _fill(self, col):
+        slot = col % self.cols
+        tg = self.columns[slot]
+        if col < 0 or col >= self.source.width:
+            tg.hidden = True
+            return
+        chunk_cols = self.source.chunk_cols
+        self._load_chunk(col // chunk_cols)
+        local = col % chunk_cols
+        if local >= self._chunk_lens[0]:
+            tg.hidden = True
+            return
+        buf = self._chunk_bufs[0]
+        lut = self.tile_lut
+        base = local * self.height
+        for r in range(self.height):
+            tg[0, r] = lut[buf[base + r]]
+        tg.x = col * self.tile_size
+        tg.hidden = False
+
+    def scroll_to(self, camera_x):
+        """Make sure every column visible from camera_x is filled."""
+        first = int(camera_x) // self.tile_size
+        if first == self.first_col:
+            return
+        prev = self.first_col
+        self.first_col = first
+        if prev is None or abs(first - prev) >= self.cols:
+            for col in range(first, first + self.cols):
+                self._fill(col)
+            return
+        if first > prev:
+            new_cols = range(prev + self.cols, first + self.cols)
+        else:
+            new_cols = range(first, prev)
+        for col in new_cols:
+            self._fill(col)
+
+    def drop_chunk(self, index):
+        """Forget a cached chunk whose source data changed."""
+        ids = self._chunk_ids
+        if ids[0] == index:
+            ids[0] = -1
+        if ids[1] == index:
+            ids[1] = -1
+
+    def invalidate(self):
+        """Force a full refill on the next scroll_to (level data changed)."""
+        self.first_col = None
+        self._chunk_ids[0] = -1
+        self._chunk_ids[1] = -1
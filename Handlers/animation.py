@@ -0,0 +1,136 @@
+# -----------------------------------------------------------
+# ANIMATION
+# -----------------------------------------------------------
+# Clips are data: a run of atlas tiles, how many ticks each frame is
+# held, and whether playback loops or clamps on the last frame. The
+# tick -> frame schedule is precomputed once per clip as a bytearray,
+# so advancing is an add, a bounds check and an index.
+#
+# Animator drives one entity. It only writes the TileGrid when the
+# shown tile or flip actually changes, and swaps grid visibility when
+# two clips live on different bitmaps.
+
+LOOP = True
+CLAMP = False
+
+
+class Clip:
+    """Frames first .. first + frames - 1 of grid.
+
+    durations: ticks per frame, one int for all frames or a sequence
+    with one entry per frame.
+    """
+    def __init__(self, grid, first, frames, durations, loop=LOOP):
+        frames = max(1, frames)
+        self.grid = grid
+        self.first = first
+        self.frames = frames
+        self.loop = loop
+        if isinstance(durations, int):
+            durations = (durations,) * frames
+        schedule = bytearray()
+        for frame in range(frames):
+            schedule.extend(bytes((frame,)) * max(1, durations[frame]))
+        self.schedule = schedule
+        self.length = len(schedule)
+
+
+def clips_from_atlas(atlas, specs):
+    """{name: Clip} for specs of (name, durations, loop).
+
+    Sheets that share an atlas bitmap share one TileGrid, so the
+    returned grids list holds each TileGrid once, hidden.
+    """
+    clips = {}
+    grids = []
+    for name, durations, loop in specs:
+        sheet = atlas.get(name)
+        grid = None
+        for bmp, g in grids:
+            if bmp is sheet.bitmap:
+                grid = g
+        if grid is None:
+            grid = sheet.make_tilegrid()
+            grid.hidden = True
+            grids.append((sheet.bitmap, grid))
+        clips[name] = Clip(grid, sheet.first, sheet.frames, durations, loop)
+    return clips, [g for _, g in grids]
+
+
+class Animator:
+    def __init__(self, clips):
+        self.clips = clips
+        self.clip = None
+        self.name = None
+        self.tick = 0
+        self.flip_x = False
+        self._grid = None   # Grid currently shown
+        self._shown = -1    # Tile last written to _grid[0]
+        self._flipped = None
+
+    def play(self, name, restart=False):
+        """Switch clip; a no-op if it is already playing unless restart."""
+        if name == self.name and not restart:
+            return
+        clip = self.clips.get(name)
+        if clip is None:
+            return
+        self.name = name
+        self.clip = clip
+        self.tick = 0
+        if clip.grid is not self._grid:
+            if self._grid is not None:
+                self._grid.hidden = True
+            clip.grid.hidden = False
+            self._grid = clip.grid
+            self._shown = -1
+            self._flipped = None
+        self._draw()
+
+    def advance(self, ticks=1):
+        clip = self.clip
+        if clip is None or ticks <= 0:
+            return
+        tick = self.tick + ticks
+        if tick >= clip.length:
+            tick = tick % clip.length if clip.loop else clip.length - 1
+        self.tick = tick
+        self._draw()
+
+    def seek(self, frame):
+        """Jump to the start of frame (replays that only know the frame)."""
+        clip = self.clip
+        if clip is None:
+            return
+        tick = 0
+        while tick < clip.length - 1 and clip.schedule[tick] != frame:
+            tick += 1
+        if tick != self.tick:
+            self.tick = tick
+            self._draw()
+
+    def rewind(self):
+        """Hold the first frame (e.g. a run cycle while standing still)."""
+        if self.tick:
+            self.tick = 0
+            self._draw()
+
+    def set_flip(self, flip_x):
+        self.flip_x = flip_x
+        if self._flipped != flip_x and self._grid is not None:
+            self._grid.flip_x = flip_x
+            self._flipped = flip_x
+
+    @property
+    def frame(self):
+        return self.clip.schedule[self.tick] if self.clip is not None else 0
+
+    def _draw(self):
+        clip = self.clip
+        tile = clip.first + clip.schedule[self.tick]
+        if tile != self._shown:
+            self._grid[0] = tile
+            self._shown = tile
+        if self._flipped != self.flip_x:
+            self._grid.flip_x = self.flip_x
+            self._flipped = self.flip_x
@@ -0,0 +1,334 @@
+import gc
+import displayio
+from Handlers.sprite_format import BmpInfo, PackedAtlas, SpriteFormatError, TRANSPARENT_KEY
+
+try:
+    import bitmaptools
+except ImportError:
+    bitmaptools = None
+
+# -----------------------------------------------------------
+# SPRITE ATLAS
+# -----------------------------------------------------------
+# BMP sheets are decoded once into a single in-RAM Bitmap with one
+# shared Palette, so the compositor never goes back to flash for them.
+# Every frame is one atlas tile; a Sheet is a run of consecutive tile
+# indices, so one TileGrid can show any frame of any sheet.
+#
+# The magenta colour key is resolved here: every sheet's key colour
+# maps to palette index 0, which is transparent.
+#
+# If a packed atlas (.spr, built by Tools/sprite_packer.py) is present,
+# its sheets are loaded from it in one read with no palette scanning;
+# only assets missing from it are decoded from their BMPs.
+#
+# Assets flagged keep_on_disk (large, rarely drawn) stay OnDiskBitmaps
+# with their own shader. Only uncompressed 1/4/8-bit BMPs go into the
+# atlas; anything else is kept on disk as well.
+
+SPRITE_ROOT = "/sprites"
+PACKED_ATLAS = "atlas.spr"
+ATLAS_COLUMNS = 4
+
+
+class Sheet:
+    """Frames first .. first + frames - 1 of a bitmap."""
+    def __init__(self, bitmap, palette, first, frames, tile_w, tile_h):
+        self.bitmap = bitmap
+        self.palette = palette
+        self.first = first
+        self.frames = frames
+        self.tile_w = tile_w
+        self.tile_h = tile_h
+
+    def make_tilegrid(self, **kwargs):
+        grid = displayio.TileGrid(self.bitmap, pixel_shader=self.palette,
+                                  tile_width=self.tile_w, tile_height=self.tile_h,
+                                  default_tile=self.first, **kwargs)
+        return grid
+
+
+def _fallback_sheet():
+    bmp = displayio.Bitmap(16, 16, 1)
+    pal = displayio.Palette(1)
+    pal[0] = 0xFF0000
+    return Sheet(bmp, pal, 0, 1, 16, 16)
+
+
+def load_disk_sheet(path, tile_w, tile_h, frames=None):
+    """OnDiskBitmap sheet with the colour key made transparent."""
+    bmp = displayio.OnDiskBitmap(path)
+    pal = bmp.pixel_shader
+    if isinstance(pal, displayio.ColorConverter):
+        pal.make_transparent(TRANSPARENT_KEY)
+    else:
+        pal.make_transparent(0)
+        for i in range(len(pal)):
+            if pal[i] == TRANSPARENT_KEY:
+                pal.make_transparent(i)
+    if frames is None:
+        frames = (bmp.width // tile_w) * (bmp.height // tile_h)
+    return Sheet(bmp, pal, 0, frames, tile_w, tile_h)
+
+
+class SpriteAtlas:
+    """assets: iterable of (name, filename, frames or None, keep_on_disk)."""
+    def __init__(self, assets, tile_w=32, tile_h=32, root=SPRITE_ROOT, columns=ATLAS_COLUMNS,
+                 packed_file=PACKED_ATLAS):
+        self.tile_w = tile_w
+        self.tile_h = tile_h
+        self.sheets = {}
+        self.bitmap = None
+        self.palette = None
+
+        if packed_file is not None:
+            try:
+                self._load_packed(f"{root}/{packed_file}")
+            except OSError:
+                pass # No packed atlas: decode the BMPs below
+            except (SpriteFormatError, ValueError) as e:
+                print(f"Failed to load {packed_file}: {e}")
+
+        packed = []
+        for name, filename, frames, keep_on_disk in assets:
+            if name in self.sheets:
+                continue
+            path = f"{root}/{filename}"
+            if keep_on_disk:
+                self._load_disk(name, path, frames)
+                continue
+            try:
+                with open(path, "rb") as f:
+                    info = BmpInfo(f)
+            except OSError as e:
+                print(f"Failed to load {filename}: {e}")
+                self.sheets[name] = _fallback_sheet()
+                continue
+            except ValueError:
+                # Not something the atlas can decode
+                self._load_disk(name, path, frames)
+                continue
+            sheet_cols = info.width // tile_w
+            total = sheet_cols * (info.height // tile_h)
+            if frames is None or frames > total:
+                frames = total
+            packed.append((name, path, info, sheet_cols, frames))
+
+        if packed:
+            self._build(packed, columns)
+
+    def _load_disk(self, name, path, frames):
+        try:
+            self.sheets[name] = load_disk_sheet(path, self.tile_w, self.tile_h, frames)
+        except Exception as e:
+            print(f"Failed to load {path}: {e}")
+            self.sheets[name] = _fallback_sheet()
+
+    def _load_packed(self, path):
+        atlas = PackedAtlas(path)
+        tw = atlas.tile_w
+        th = atlas.tile_h
+        if tw != self.tile_w or th != self.tile_h:
+            raise SpriteFormatError("tile size mismatch")
+        colors = atlas.colors
+        palette = displayio.Palette(len(colors))
+        for i in range(len(colors)):
+            palette[i] = colors[i]
+        palette.make_transparent(atlas.transparent)
+
+        columns = atlas.columns
+        rows = (atlas.n_frames + columns - 1) // columns
+        bitmap = displayio.Bitmap(columns * tw, rows * th, max(2, len(colors)))
+        frame = bytearray(tw * th)
+        for i in range(atlas.n_frames):
+            atlas.frame_into(i, frame)
+            self._blit(bitmap, frame, (i % columns) * tw, (i // columns) * th, tw, th)
+        for name, first, count in atlas.sheets:
+            self.sheets[name] = Sheet(bitmap, palette, first, count, tw, th)
+
+    def _frame_origin(self, sheet_cols, frame):
+        return (frame % sheet_cols) * self.tile_w, (frame // sheet_cols) * self.tile_h
+
+    def _build(self, packed, columns):
+        tw = self.tile_w
+        th = self.tile_h
+        line = bytearray(tw)
+
+        # Pass 1: which colours are actually used by the packed frames
+        colors = [TRANSPARENT_KEY]
+        luts = []
+        for name, path, info, sheet_cols, frames in packed:
+            used = bytearray(len(info.colors))
+            row = bytearray(info.row_size)
+            with open(path, "rb") as f:
+                for frame in range(frames):
+                    fx, fy = self._frame_origin(sheet_cols, frame)
+                    for y in range(fy, fy + th):
+                        info.read_row(f, y, row, line, fx, tw)
+                        for i in range(tw):
+                            used[line[i]] = 1
+            lut = bytearray(len(info.colors))
+            for i in range(len(info.colors)):
+                if not used[i] or info.colors[i] == TRANSPARENT_KEY:
+                    continue
+                c = info.colors[i]
+                if c not in colors:
+                    colors.append(c)
+                lut[i] = colors.index(c)
+            luts.append(lut)
+        if len(colors) > 256:
+            raise ValueError("atlas needs more than 256 colours")
+
+        self.palette = displayio.Palette(len(colors))
+        for i in range(len(colors)):
+            self.palette[i] = colors[i]
+        self.palette.make_transparent(0)
+
+        # Pass 2: remap and copy every frame into its atlas tile
+        total = 0
+        for entry in packed:
+            total += entry[4]
+        rows = (total + columns - 1) // columns
+        self.bitmap = displayio.Bitmap(columns * tw, rows * th, max(2, len(colors)))
+        tile = 0
+        for (name, path, info, sheet_cols, frames), lut in zip(packed, luts):
+            self.sheets[name] = Sheet(self.bitmap, self.palette, tile, frames, tw, th)
+            row = bytearray(info.row_size)
+            with open(path, "rb") as f:
+                for frame in range(frames):
+                    fx, fy = self._frame_origin(sheet_cols, frame)
+                    ax = (tile % columns) * tw
+                    ay = (tile // columns) * th
+                    for y in range(th):
+                        info.read_row(f, fy + y, row, line, fx, tw)
+                        for i in range(tw):
+                            line[i] = lut[line[i]]
+                        self._blit(self.bitmap, line, ax, ay + y, tw, 1)
+                    tile += 1
+
+    def _blit(self, bmp, data, x, y, w, h):
+        """Copy a row-major w x h index buffer into bmp at (x, y)."""
+        if bitmaptools is not None:
+            bitmaptools.arrayblit(bmp, data, x, y, x + w, y + h)
+            return
+        i = 0
+        for dy in range(h):
+            for dx in range(w):
+                bmp[x + dx, y + dy] = data[i]
+                i += 1
+
+    def get(self, name):
+        return self.sheets.get(name) or _fallback_sheet()
+
+
+# -----------------------------------------------------------
+# ASSET MANAGER
+# -----------------------------------------------------------
+# Shared assets keyed by id. Each owner (a state id) holds at most one
+# reference per asset; release(owner) drops all of them at once when
+# the state is evicted. Unreferenced assets stay cached until the RAM
+# budget is needed, then go least recently used first.
+
+ASSET_BUDGET = 96 * 1024
+
+_ASSET = 0
+_SIZE = 1
+_REFS = 2
+_LAST_USE = 3
+
+
+def asset_size(asset):
+    """Rough RAM cost in bytes (one byte per bitmap pixel, 4 per colour)."""
+    if isinstance(asset, displayio.Bitmap):
+        return asset.width * asset.height
+    if isinstance(asset, displayio.Palette):
+        return len(asset) * 4
+    if isinstance(asset, (tuple, list)):
+        total = 0
+        for part in asset:
+            total += asset_size(part)
+        return total
+    if isinstance(asset, SpriteAtlas):
+        # Sheets share bitmaps; count each in-RAM bitmap once
+        seen = []
+        total = 0
+        for sheet in asset.sheets.values():
+            if isinstance(sheet.bitmap, displayio.Bitmap) and sheet.bitmap not in seen:
+                seen.append(sheet.bitmap)
+                total += asset_size(sheet.bitmap) + asset_size(sheet.palette)
+        return total
+    return 0
+
+
+class AssetManager:
+    def __init__(self, budget=ASSET_BUDGET):
+        self.budget = budget
+        self.used = 0
+        self._entries = {} # id -> [asset, size, refs, last_use]
+        self._owners = {}  # owner -> [ids]
+        self._clock = 0
+
+    def acquire(self, owner, asset_id, loader, size=None):
+        """Shared asset for asset_id, loading it with loader() on a miss.
+
+        size: known RAM cost, lets room be made before loading.
+        """
+        entry = self._entries.get(asset_id)
+        if entry is None:
+            if size is not None:
+                self._make_room(size)
+            asset = loader()
+            if size is None:
+                size = asset_size(asset)
+                self._make_room(size)
+            entry = [asset, size, 0, 0]
+            self._entries[asset_id] = entry
+            self.used += size
+
+        owned = self._owners.get(owner)
+        if owned is None:
+            owned = self._owners[owner] = []
+        if asset_id not in owned:
+            owned.append(asset_id)
+            entry[_REFS] += 1
+        self._clock += 1
+        entry[_LAST_USE] = self._clock
+        return entry[_ASSET]
+
+    def release(self, owner):
+        """Drop every reference owner holds; returns how many it had."""
+        owned = self._owners.pop(owner, None)
+        if not owned:
+            return 0
+        for asset_id in owned:
+            entry = self._entries.get(asset_id)
+            if entry is not None:
+                entry[_REFS] -= 1
+        self._make_room(0)
+        return len(owned)
+
+    def is_loaded(self, asset_id):
+        return asset_id in self._entries
+
+    def _make_room(self, needed):
+        # Evict unreferenced assets, oldest first, until needed fits
+        while self.used + needed > self.budget:
+            victim = None
+            oldest = None
+            for asset_id, entry in self._entries.items():
+                if entry[_REFS] == 0 and (oldest is None or entry[_LAST_USE] < oldest):
+                    victim = asset_id
+                    oldest = entry[_LAST_USE]
+            if victim is None:
+                # Everything left is in use; go over budget rather than fail
+                return
+            self.evict(victim)
+
+    def evict(self, asset_id):
+        entry = self._entries.get(asset_id)
+        if entry is None or entry[_REFS] > 0:
+            return False
+        del self._entries[asset_id]
+        self.used -= entry[_SIZE]
+        gc.collect()
+        return True
@@ -0,0 +1,117 @@
+import struct
+from Handlers.score_store import crc8
+
+# -----------------------------------------------------------
+# SEESAW EEPROM STORE (JoyFeatherWing)
+# -----------------------------------------------------------
+# The seesaw keeps a tiny EEPROM that stays writable while CIRCUITPY is
+# mounted over USB. Layout is fixed so every key has a known address:
+#   0x00        : layout version
+#   per record  : payload + crc8(payload)
+# The byte holding the seesaw's own I2C address is never touched.
+
+EEPROM_VERSION = 1
+PAGE_SIZE = 16
+_EEPROM_BASE = 0x0D
+
+# Key -> (address, struct format); address counts from byte 1
+_LAYOUT = {}
+_addr = 1
+for _key, _fmt in (
+    ("sensitivity", "<B"),      # sensitivity * 10
+    ("axis", "<B"),             # bit0 swap_xy, bit1 invert_x, bit2 invert_y
+    ("center", "<hhH"),         # calibration center x/y, range max
+    ("scores_mario", "<III"),   # top 3
+    ("scores_blockbreaker", "<III"),
+):
+    _LAYOUT[_key] = (_addr, _fmt)
+    _addr += struct.calcsize(_fmt) + 1
+LAYOUT_SIZE = _addr
+
+# Game name -> EEPROM score key
+SCORE_KEYS = {"Mario": "scores_mario", "Block Breaker": "scores_blockbreaker"}
+
+
+class EepromStore:
+    def __init__(self, seesaw, size=None):
+        self.seesaw = seesaw
+        if size is None:
+            try:
+                size = seesaw._get_eeprom_i2c_addr() or 0
+            except Exception:
+                size = 0
+        self.size = size
+        self.available = size >= LAYOUT_SIZE
+        self._shadow = bytearray(LAYOUT_SIZE)
+        self._dirty = set() # Page indices waiting for flush()
+        if self.available:
+            self._load()
+
+    @classmethod
+    def from_handler(cls, handler):
+        """Build a store from an InputHandler in featherwing mode, or None."""
+        fw = getattr(handler, "_fw", None)
+        if fw is None:
+            return None
+        store = cls(fw._seesaw)
+        return store if store.available else None
+
+    # ---------------- LOADING ----------------
+    def _load(self):
+        try:
+            # One bulk read for the whole layout
+            self.seesaw.read(_EEPROM_BASE, 0, self._shadow)
+        except Exception as e:
+            print(f"EEPROM read failed: {e}")
+            self.available = False
+            return
+        if self._shadow[0] != EEPROM_VERSION:
+            # Blank or foreign layout; start over on the next flush
+            for i in range(LAYOUT_SIZE):
+                self._shadow[i] = 0xFF
+            self._shadow[0] = EEPROM_VERSION
+            self._mark(0, 1)
+
+    # ---------------- KEY/VALUE API ----------------
+    def get(self, key):
+        """Tuple of values, or None if unset or the CRC fails."""
+        if not self.available or key not in _LAYOUT:
+            return None
+        addr, fmt = _LAYOUT[key]
+        end = addr + struct.calcsize(fmt)
+        if crc8(self._shadow, addr, end) != self._shadow[end]:
+            return None
+        return struct.unpack_from(fmt, self._shadow, addr)
+
+    def set(self, key, *values):
+        if not self.available or key not in _LAYOUT:
+            return
+        addr, fmt = _LAYOUT[key]
+        end = addr + struct.calcsize(fmt)
+        before = bytes(self._shadow[addr:end + 1])
+        struct.pack_into(fmt, self._shadow, addr, *values)
+        self._shadow[end] = crc8(self._shadow, addr, end)
+        if self._shadow[addr:end + 1] != before:
+            self._mark(addr, end + 1)
+
+    def _mark(self, start, end):
+        for page in range(start // PAGE_SIZE, (end - 1) // PAGE_SIZE + 1):
+            self._dirty.add(page)
+
+    def has_pending(self):
+        return len(self._dirty) > 0
+
+    def flush(self):
+        """Write each dirty page in a single I2C transaction."""
+        if not self._dirty:
+            return True
+        try:
+            for page in sorted(self._dirty):
+                start = page * PAGE_SIZE
+                end = min(start + PAGE_SIZE, LAYOUT_SIZE)
+                self.seesaw.eeprom_write(start, self._shadow[start:end])
+            self._dirty.clear()
+            return True
+        except Exception as e:
+            print(f"EEPROM write failed: {e}")
+            return False
@@ -2,8 +2,15 @@ import displayio
 import terminalio
 import time
 import json
+import gc
 from adafruit_display_text import label
 from adafruit_display_shapes.rect import Rect
+from Handlers.score_store import ScoreJournal
+from Handlers.persistence import PersistenceWorker
+from Handlers.eeprom_store import SCORE_KEYS
+from Handlers.assets import AssetManager
+from Handlers.widgets import pattern_overlay, DITHER_75
+from Handlers.snapshot import read_snapshot, write_snapshot, clear_snapshot
 
 # --- CONSTANTS ---
 STATE_MENU = "MENU"
@@ -16,10 +23,23 @@ STATE_CONSOLE = "CONSOLE"
 STATE_LEADERBOARD = "LEADERBOARD"
 STATE_SAVE_PROMPT = "SAVE_PROMPT"
 
+# States where a flash write could cause a visible hitch
+GAMEPLAY_STATES = (STATE_PLATFORMER, STATE_BLOCKBREAKER)
+
+# Game id byte stored in quick-save snapshots
+SNAPSHOT_GAMES = {STATE_PLATFORMER: 1, STATE_BLOCKBREAKER: 2}
+
+# Asset owner for things that live as long as the manager (fonts)
+OWNER_SYSTEM = "SYSTEM"
+FONT_SIZE_ESTIMATE = 8 * 1024
+
 # -----------------------------------------------------------
 # BASE STATE
 # -----------------------------------------------------------
 class BaseState:
+    # Drawn over the game it was entered from instead of replacing it
+    overlay = False
+
     def __init__(self, manager):
         self.manager = manager
         self.root_group = displayio.Group()
@@ -36,6 +56,10 @@ class BaseState:
     def get_group(self):
         return self.root_group
 
+    def unload(self):
+        """Called when the manager evicts this state; assets are released for it."""
+        pass
+
 # -----------------------------------------------------------
 # STATE 1: MAIN MENU
 # -----------------------------------------------------------
@@ -51,6 +75,10 @@ class MenuState(BaseState):
         self.options = ["Mario Demo", "Block Breaker", "Leaderboards"]
         self.selected_index = 0
         self.scroll_cooldown = 0.0
+        self.level_choice = 0 # Platformer level, picked with LEFT/RIGHT
+        from Games.platformer_game import list_levels
+        # Level files, then endless mode as the last choice
+        self.level_count = max(1, len(list_levels())) + 1
 
         self.option_labels = []
         start_y = 90
@@ -84,12 +112,23 @@ class MenuState(BaseState):
         self.sleep_label = label.Label(self.manager.font_ui, text="[X+Y] SLEEP", x=230, y=220, color=0x660000)
         self.root_group.append(self.sleep_label)
 
+        # Only shown while a quick-save snapshot exists
+        self.resume_label = label.Label(self.manager.font_ui, text="[B] RESUME", x=5, y=200, color=0x00AA00)
+        self.root_group.append(self.resume_label)
+
     def enter(self):
+        self.resume_label.hidden = self.manager.resume is None
         self.update_ui()
 
     def update_ui(self):
+        level_count = self.level_count
         for i, lbl in enumerate(self.option_labels):
             opt_name = self.options[i]
+            if i == 0:
+                if self.level_choice == level_count - 1:
+                    opt_name = f"{opt_name} <ENDLESS>"
+                else:
+                    opt_name = f"{opt_name} <{self.level_choice + 1}>"
             if i == self.selected_index:
                 lbl.text = f"> {opt_name}"
                 lbl.color = 0xFFFFFF
@@ -105,45 +144,7 @@ class MenuState(BaseState):
     def update(self, handler, dt):
         # --- SLEEP LOGIC ---
         if handler.is_pressed("X") and handler.is_pressed("Y"):
-            self.manager.log("Entering Sleep Mode...")
-
-            # 1. Clear Screen to Black
-            black_group = displayio.Group()
-            black_rect = Rect(0, 0, 340, 260, fill=0x000000)
-            black_group.append(black_rect)
-
-            # Swap display to black group
-            while len(self.manager.main_group) > 0:
-                self.manager.main_group.pop()
-            self.manager.main_group.append(black_group)
-
-            # 2. Wait for button release (Debounce)
-            while handler.is_pressed("X") or handler.is_pressed("Y"):
-                handler.update()
-                time.sleep(0.05)
-
-            # 3. Low Power Sleep Loop
-            # We trap the program here until woken up
-            while True:
-                # Sleep reduces CPU power significantly
-                time.sleep(0.15)
-                handler.update()
-
-                # Check for Wake Combo
-                if handler.is_pressed("X") and handler.is_pressed("Y"):
-                    break
-
-            # 4. Wake Up Sequence
-            self.manager.log("Waking Up...")
-            # Wait for release
-            while handler.is_pressed("X") or handler.is_pressed("Y"):
-                handler.update()
-                time.sleep(0.05)
-
-            # Restore Menu Graphics
-            while len(self.manager.main_group) > 0:
-                self.manager.main_group.pop()
-            self.manager.main_group.append(self.get_group())
+            self.manager.sleep(handler)
             return
 
         # --- NAVIGATION ---
@@ -157,17 +158,31 @@ class MenuState(BaseState):
                 self.selected_index = (self.selected_index + change) % len(self.options)
                 self.update_ui()
                 self.scroll_cooldown = 0.15
+            elif self.selected_index == 0 and (dirs['LEFT'] or dirs['RIGHT']):
+                step = 1 if dirs['RIGHT'] else -1
+                self.level_choice = (self.level_choice + step) % self.level_count
+                self.update_ui()
+                self.scroll_cooldown = 0.2
 
         if handler.was_just_pressed("A"):
             if self.selected_index == 0:
-                self.manager.states[STATE_PLATFORMER].reset()
+                from Games.platformer_game import ENDLESS_LEVEL
+                platformer = self.manager.get_state(STATE_PLATFORMER)
+                if self.level_choice == self.level_count - 1:
+                    platformer.select_level(ENDLESS_LEVEL)
+                else:
+                    platformer.select_level(self.level_choice)
+                platformer.reset()
                 self.manager.change_state(STATE_PLATFORMER)
             elif self.selected_index == 1:
-                self.manager.states[STATE_BLOCKBREAKER].reset()
+                self.manager.get_state(STATE_BLOCKBREAKER).reset()
                 self.manager.change_state(STATE_BLOCKBREAKER)
             elif self.selected_index == 2:
                 self.manager.change_state(STATE_LEADERBOARD)
 
+        if handler.was_just_pressed("B") and self.manager.resume is not None:
+            self.manager.quick_resume()
+
         if handler.was_just_pressed("SEL"):
             self.manager.change_state(STATE_SETTINGS)
 
@@ -241,7 +256,7 @@ class LeaderboardState(BaseState):
         game = self.games[self.current_idx]
         self.game_lbl.text = game
 
-        scores = self.manager.scores.get(game, [])
+        scores = self.manager.scores.get(game, [])[:5]
         if not scores:
             self.list_lbl.text = "No scores yet!"
         else:
@@ -305,6 +320,7 @@ class SettingsState(BaseState):
             self.manager.change_state(STATE_CONSOLE)
         if handler.was_just_pressed("X"):
             handler.sensitivity = 2.0 if handler.sensitivity == 1.5 else 1.5
+            self.manager.set_setting("sensitivity", handler.sensitivity)
             self.manager.log(f"Sense set to: {handler.sensitivity}")
         if handler.was_just_pressed("B"):
             self.manager.change_state(STATE_MENU)
@@ -313,9 +329,11 @@ class SettingsState(BaseState):
 # STATE 6: PAUSE MENU
 # -----------------------------------------------------------
 class PauseState(BaseState):
+    overlay = True
+
     def __init__(self, manager):
         super().__init__(manager)
-        self.bg = Rect(0, 0, 340, 260, fill=0x222222)
+        self.bg = pattern_overlay(320, 240, pattern=DITHER_75)
         self.title = label.Label(self.manager.font_ui, text="GAME PAUSED", scale=3, x=15, y=40, color=0xFFFF00)
         self.info = label.Label(self.manager.font_ui, text="", scale=2, x=15, y=100, color=0xFFFFFF)
         self.toggle_hint = label.Label(self.manager.font_ui, text="[X] Toggle Sensitivity", x=15, y=130, color=0xAAAAAA)
@@ -345,9 +363,11 @@ class PauseState(BaseState):
 
         if handler.was_just_pressed("A"):
             self.manager.log("Quitting to Title...")
+            self.manager.quick_save(self.manager.previous_state)
             self.manager.change_state(STATE_MENU)
         if handler.was_just_pressed("X"):
             handler.sensitivity = 2.0 if handler.sensitivity == 1.5 else 1.5
+            self.manager.set_setting("sensitivity", handler.sensitivity)
             self.manager.log(f"In-Game Sense: {handler.sensitivity}")
 
 # -----------------------------------------------------------
@@ -359,7 +379,7 @@ class ConsoleState(BaseState):
         self.bg = Rect(0, 0, 340, 260, fill=0x111111)
         self.title = label.Label(self.manager.font_ui, text="SYSTEM LOGS", scale=2, x=5, y=10, color=0x00FF00)
         self.logs_label = label.Label(self.manager.font_ui, text="", x=5, y=40, color=0x00FF00, line_spacing=1.2)
-        self.back = label.Label(self.manager.font_ui, text="[B] Back | [X] Clear All | [JOY] Scroll", x=5, y=220, color=0xFFFFFF)
+        self.back = label.Label(self.manager.font_ui, text="[B] Back | [X] Clear | [Y] Prev | [JOY] Scroll", x=5, y=220, color=0xFFFFFF)
 
         self.root_group.append(self.bg)
         self.root_group.append(self.title)
@@ -369,16 +389,27 @@ class ConsoleState(BaseState):
         self.max_lines_visible = 19
         self.top_line_index = 0
         self.scroll_cooldown = 0.0
+        self.show_previous = False
+
+    def get_entries(self):
+        if self.show_previous and self.manager.log_store:
+            return self.manager.log_store.previous
+        return self.manager.logs
 
     def enter(self):
-        total_logs = len(self.manager.logs)
+        self.show_previous = False
+        self.jump_to_end()
+
+    def jump_to_end(self):
+        total_logs = len(self.get_entries())
         self.top_line_index = max(0, total_logs - self.max_lines_visible)
         self.update_view()
 
     def update_view(self):
+        entries = self.get_entries()
         start = self.top_line_index
         end = start + self.max_lines_visible
-        visible_entries = self.manager.logs[start:end]
+        visible_entries = entries[start:end]
 
         display_lines = []
         for entry in visible_entries:
@@ -398,17 +429,22 @@ class ConsoleState(BaseState):
             display_lines.append(line)
 
         self.logs_label.text = "\n".join(display_lines)
-        total = len(self.manager.logs)
+        total = len(entries)
         current = min(end, total)
-        self.title.text = f"LOGS ({current}/{total})"
+        prefix = "PREV" if self.show_previous else "LOGS"
+        self.title.text = f"{prefix} ({current}/{total})"
 
     def update(self, handler, dt):
         if handler.was_just_pressed("B"):
             self.manager.change_state(STATE_SETTINGS)
-        if handler.was_just_pressed("X"):
+        if handler.was_just_pressed("X") and not self.show_previous:
             self.manager.clear_logs()
             self.top_line_index = 0
             self.update_view()
+        if handler.was_just_pressed("Y"):
+            # Page between this boot and the session before it
+            self.show_previous = not self.show_previous
+            self.jump_to_end()
 
         self.scroll_cooldown -= dt
         if self.scroll_cooldown <= 0:
@@ -420,7 +456,7 @@ class ConsoleState(BaseState):
                     self.top_line_index -= 1
                     did_scroll = True
             elif dirs['DOWN']:
-                total_logs = len(self.manager.logs)
+                total_logs = len(self.get_entries())
                 max_start = max(0, total_logs - self.max_lines_visible)
                 if self.top_line_index < max_start:
                     self.top_line_index += 1
@@ -434,7 +470,7 @@ class ConsoleState(BaseState):
 # STATE MANAGER
 # -----------------------------------------------------------
 class GameStateManager:
-    def __init__(self, main_display_group):
+    def __init__(self, main_display_group, persist_logs=False):
         self.main_group = main_display_group
         self.states = {}
         self.current_state_obj = None
@@ -444,16 +480,44 @@ class GameStateManager:
         self.logs = []
         self.log_timeout = 300.0
 
+        # Flash writes are queued here and run between frames
+        self.persistence = PersistenceWorker()
+
+        # Optional on-flash log sink (survives reboots)
+        self.log_store = None
+        if persist_logs:
+            from Handlers.log_store import PersistentLog
+            self.log_store = PersistentLog()
+
         # --- SCORES ---
-        self.scores = {"Mario": [], "Block Breaker": []}
+        self.score_store = ScoreJournal()
+        if not self.score_store.scores and self.score_store.import_json("/scores.json"):
+            self.score_store.flush()
+            print("Migrated scores.json.")
+        self.scores = self.score_store.scores
+        self.scores.setdefault("Mario", [])
+        self.scores.setdefault("Block Breaker", [])
+        print("Scores loaded.")
+
+        # --- SLEEP ---
+        self.sleeper = None # SleepController (attach_sleep)
+
+        # --- QUICK-SAVE ---
+        self.resume = read_snapshot() # (game id, payload) or None
+
+        # --- SETTINGS ---
+        self.eeprom = None # Optional seesaw EEPROM fast path (attach_eeprom)
+        self.settings = {"sensitivity": 1.5}
         try:
-            with open("/scores.json", "r") as f:
-                data = json.load(f)
-                if "Mario" in data: self.scores["Mario"] = data["Mario"]
-                if "Block Breaker" in data: self.scores["Block Breaker"] = data["Block Breaker"]
-                print("Scores loaded.")
+            with open("/settings.json", "r") as f:
+                self.settings.update(json.load(f))
         except:
-            print("No scores.json found.")
+            print("No settings.json found.")
+
+        # --- ASSETS ---
+        # Shared, ref-counted per state; game states are built on demand
+        # and evicted (with their assets) when the other game starts
+        self.assets = AssetManager()
 
         self.font_ui = terminalio.FONT
         self.font_game = terminalio.FONT
@@ -462,13 +526,17 @@ class GameStateManager:
         try:
             from adafruit_bitmap_font import bitmap_font
             try:
-                self.font_ui = bitmap_font.load_font("/Fonts/gameboy.bdf")
+                self.font_ui = self.assets.acquire(OWNER_SYSTEM, "font:gameboy",
+                                                   lambda: bitmap_font.load_font("/Fonts/gameboy.bdf"),
+                                                   size=FONT_SIZE_ESTIMATE)
             except Exception as e:
                 print(f"Error loading gameboy.bdf: {e}")
                 self.log("Err: gameboy.bdf missing")
 
             try:
-                self.font_game = bitmap_font.load_font("/Fonts/mario.bdf")
+                self.font_game = self.assets.acquire(OWNER_SYSTEM, "font:mario",
+                                                     lambda: bitmap_font.load_font("/Fonts/mario.bdf"),
+                                                     size=FONT_SIZE_ESTIMATE)
             except Exception as e:
                 print(f"Error loading mario.bdf: {e}")
                 self.log("Err: mario.bdf missing")
@@ -480,9 +548,12 @@ class GameStateManager:
         from Games.platformer_game import PlatformerGame
         from Games.blockbreaker_game import BlockBreakerGame
 
+        self.state_factories = {
+            STATE_PLATFORMER: PlatformerGame,
+            STATE_BLOCKBREAKER: BlockBreakerGame,
+        }
+
         self.states[STATE_MENU] = MenuState(self)
-        self.states[STATE_PLATFORMER] = PlatformerGame(self)
-        self.states[STATE_BLOCKBREAKER] = BlockBreakerGame(self)
         self.states[STATE_GAME_OVER] = GameOverState(self)
         self.states[STATE_SETTINGS] = SettingsState(self)
         self.states[STATE_PAUSE] = PauseState(self)
@@ -496,6 +567,9 @@ class GameStateManager:
         entry = {'msg': f"> {message}", 'time': time.monotonic()}
         self.logs.append(entry)
         if len(self.logs) > 50: self.logs.pop(0)
+        if self.log_store:
+            self.log_store.append(entry['msg'], entry['time'])
+            self.persistence.enqueue("logs", self.log_store.flush, delay=2.0)
         print(f"LOG: {message}")
 
     def clear_logs(self):
@@ -508,19 +582,154 @@ class GameStateManager:
 
     def save_score(self, game_name, score):
         if game_name in self.scores:
-            self.scores[game_name].append(score)
-            self.scores[game_name].sort(reverse=True)
-            self.scores[game_name] = self.scores[game_name][:5]
-
-            try:
-                with open("/scores.json", "w") as f:
-                    json.dump(self.scores, f)
-                self.log(f"Saved {game_name}: {score}")
-            except OSError:
+            # Leaderboard sees the score now; flash catches up later
+            self.score_store.add(game_name, score)
+            self.persistence.enqueue("scores", self._flush_scores)
+
+            key = SCORE_KEYS.get(game_name)
+            if self.eeprom and key:
+                top = (self.scores[game_name] + [0, 0, 0])[:3]
+                self.eeprom.set(key, *top)
+                self.persistence.enqueue("eeprom", self.eeprom.flush)
+            self.log(f"Saved {game_name}: {score}")
+
+    def _flush_scores(self):
+        if not self.score_store.flush():
+            if self.eeprom:
+                self.log("FS Read-Only: Top 3 in EEPROM")
+            else:
                 self.log("Err: Read-Only Filesystem")
 
+    def attach_eeprom(self, store, handler):
+        """Load settings/calibration/top scores from the seesaw EEPROM."""
+        self.eeprom = store
+        if store is None:
+            return
+
+        sens = store.get("sensitivity")
+        if sens:
+            handler.sensitivity = sens[0] / 10.0
+            self.settings["sensitivity"] = handler.sensitivity
+        else:
+            store.set("sensitivity", int(handler.sensitivity * 10))
+
+        axis = store.get("axis")
+        if axis:
+            flags = axis[0]
+            handler.set_axis_config(bool(flags & 1), bool(flags & 2), bool(flags & 4))
+        else:
+            cfg = handler.config
+            flags = (1 if cfg['swap_xy'] else 0) | (2 if cfg['invert_x'] else 0) | (4 if cfg['invert_y'] else 0)
+            store.set("axis", flags)
+
+        center = store.get("center")
+        if center:
+            handler.set_calibration((center[0], center[1]), center[2])
+        else:
+            store.set("center", *handler.get_calibration())
+
+        for game_name, key in SCORE_KEYS.items():
+            values = store.get(key)
+            if values:
+                self.score_store.merge(game_name, [v for v in values if v > 0])
+
+        self.persistence.enqueue("eeprom", store.flush)
+        self.log("EEPROM Loaded")
+
+    def attach_sleep(self, sleeper):
+        self.sleeper = sleeper
+
+    def sleep(self, handler):
+        self.quick_save()
+        if self.sleeper is None:
+            from Handlers.sleep import SleepController
+            self.sleeper = SleepController(self)
+        self.sleeper.sleep(handler)
+
+    def quick_save(self, state_id=None):
+        """Snapshot a game (default: the one running or paused) for resume.
+
+        The file is written by the persistence worker in one write; sleep
+        flushes it before the CPU stops.
+        """
+        if state_id is None:
+            state_id = self.current_state_id
+            if state_id not in GAMEPLAY_STATES:
+                state_id = self.previous_state
+        state = self.states.get(state_id)
+        if state_id not in SNAPSHOT_GAMES or state is None:
+            return False
+        payload = state.snapshot()
+        if payload is None:
+            return False
+        game_id = SNAPSHOT_GAMES[state_id]
+        self.resume = (game_id, payload)
+        self.persistence.enqueue("snapshot", lambda: self._write_snapshot(game_id, payload), delay=0)
+        self.log(f"Quick-saved {state_id}")
+        return True
+
+    def _write_snapshot(self, game_id, payload):
+        if not write_snapshot(game_id, payload):
+            self.log("Err: Snapshot not saved (RO)")
+
+    def quick_resume(self):
+        """Restore the pending snapshot into its game and switch to it."""
+        if self.resume is None:
+            return False
+        game_id, payload = self.resume
+        self.resume = None
+        # One-shot: a later crash should not rewind to this point
+        self.persistence.enqueue("snapshot", clear_snapshot, delay=0)
+        for state_id, gid in SNAPSHOT_GAMES.items():
+            if gid == game_id:
+                break
+        else:
+            return False
+        state = self.get_state(state_id)
+        if not state.restore(payload):
+            self.log("Snapshot rejected, starting fresh")
+            state.reset()
+        self.change_state(state_id)
+        return True
+
+    def set_setting(self, key, value):
+        self.settings[key] = value
+        if self.eeprom and key == "sensitivity":
+            self.eeprom.set("sensitivity", int(value * 10))
+            self.persistence.enqueue("eeprom", self.eeprom.flush)
+        else:
+            self.persistence.enqueue("settings", self._write_settings)
+
+    def _write_settings(self):
+        try:
+            with open("/settings.json", "w") as f:
+                json.dump(self.settings, f)
+        except OSError:
+            self.log("Err: Settings not saved (RO)")
+
+    def get_state(self, state_id):
+        """State object for state_id, building evictable states on first use."""
+        state = self.states.get(state_id)
+        if state is None and state_id in self.state_factories:
+            gc.collect()
+            state = self.states[state_id] = self.state_factories[state_id](self)
+        return state
+
+    def evict_state(self, state_id):
+        """Drop an idle game state and release every asset it holds."""
+        if state_id == self.current_state_id or state_id not in self.state_factories:
+            return False
+        state = self.states.pop(state_id, None)
+        if state is None:
+            return False
+        state.unload()
+        self.assets.release(state_id)
+        gc.collect()
+        self.log(f"Evicted {state_id}")
+        return True
+
     def change_state(self, state_id):
-        if state_id not in self.states: return
+        if self.get_state(state_id) is None: return
 
         if self.current_state_id != STATE_CONSOLE:
             self.previous_state = self.current_state_id
@@ -534,10 +743,40 @@ class GameStateManager:
 
         self.log(f"State -> {state_id}")
 
-        while len(self.main_group) > 0:
-            self.main_group.pop()
-        self.main_group.append(self.current_state_obj.get_group())
+        # Only one game stays resident
+        if state_id in GAMEPLAY_STATES:
+            for other in GAMEPLAY_STATES:
+                if other != state_id:
+                    self.evict_state(other)
+
+        self.mount_groups()
+
+        # State transitions are a safe point; let queued logs out next frame
+        if self.log_store and self.log_store.has_pending():
+            self.persistence.enqueue("logs", self.log_store.flush, delay=0)
+
+    def mount_groups(self):
+        """Put the current state's group on screen, over the paused game if it is an overlay."""
+        main_group = self.main_group
+        while len(main_group) > 0:
+            main_group.pop()
+        state = self.current_state_obj
+        if state is None:
+            return
+        if state.overlay and self.previous_state in GAMEPLAY_STATES:
+            underneath = self.states.get(self.previous_state)
+            if underneath is not None:
+                main_group.append(underneath.get_group())
+        main_group.append(state.get_group())
 
     def update(self, handler, dt):
         if self.current_state_obj:
             self.current_state_obj.update(handler, dt)
+
+        if self.sleeper and self.sleeper.should_auto_sleep(handler):
+            self.log("Auto-Sleep (Idle)")
+            self.sleep(handler)
+
+        # Flash work only runs on idle (menu) frames, never mid-game
+        if self.current_state_id not in GAMEPLAY_STATES:
+            self.persistence.tick()
@@ -84,6 +84,7 @@ class InputHandler:
 
         self._now = time.monotonic()
         self._callbacks = {}
+        self.last_activity = self._now # Last press or stick movement (auto-sleep)
 
         # --- STATE ---
         self.buttons = {} # Name -> Object or None
@@ -135,6 +136,9 @@ class InputHandler:
 
             self._fw = joy_featherwing.JoyFeatherWing(i2c)
             self._fw_map = { "A": "button_a", "B": "button_b", "X": "button_x", "Y": "button_y", "SEL": "button_select" }
+            self._fw_bits = { "A": joy_featherwing.BUTTON_A, "B": joy_featherwing.BUTTON_B,
+                              "X": joy_featherwing.BUTTON_X, "Y": joy_featherwing.BUTTON_Y,
+                              "SEL": joy_featherwing.BUTTON_SELECT }
             for k in self._fw_map.keys(): self.buttons[k] = None
 
             # Calibration
@@ -173,6 +177,38 @@ class InputHandler:
         self.config['invert_x'] = invert_x
         self.config['invert_y'] = invert_y
 
+    def get_calibration(self):
+        """Returns (center_x, center_y, range_max)"""
+        return (self._center_xy[0], self._center_xy[1], self._range_max)
+
+    def set_calibration(self, center_xy, range_max):
+        """Restore a previously stored joystick calibration"""
+        self._center_xy = (center_xy[0], center_xy[1])
+        self._range_max = range_max
+
+    def idle_time(self):
+        """Seconds since the last button press or stick movement"""
+        return self._now - self.last_activity
+
+    def set_wake_interrupt(self, names, enabled=True):
+        """Let the seesaw INT line fire on these buttons (for alarm wake).
+        Returns False when there is no seesaw to configure."""
+        if self.mode != 'featherwing' or self._fw is None: return False
+        bits = 0
+        for name in names: bits |= self._fw_bits.get(name, 0)
+        try:
+            self._fw._seesaw.set_GPIO_interrupts(bits, enabled)
+            self._fw._seesaw.get_GPIO_interrupt_flag() # Clear stale flags
+            return True
+        except Exception:
+            return False
+
+    def clear_wake_interrupt(self):
+        """Reading the flag register releases the INT line"""
+        if self.mode != 'featherwing' or self._fw is None: return
+        try: self._fw._seesaw.get_GPIO_interrupt_flag()
+        except Exception: pass
+
     def on(self, name, event, func):
         if name not in self._callbacks: self._callbacks[name] = {}
         if event not in self._callbacks[name]: self._callbacks[name][event] = []
@@ -242,6 +278,7 @@ class InputHandler:
             if ny != 0: ny = math.copysign(abs(ny) ** self.sensitivity, ny)
 
         self.axis = (nx, ny)
+        if nx != 0.0 or ny != 0.0: self.last_activity = self._now
 
         if self.map_joystick_dirs:
             self.directions['UP'] = ny > self.joystick_deadzone
@@ -255,6 +292,7 @@ class InputHandler:
         # Detect Edges
         if cur_state and not prev:
             self._just_pressed.add(name)
+            self.last_activity = self._now
             self._fire_callbacks(name, "pressed")
             setattr(self, "_press_time_" + name, self._now)
             setattr(self, "_hold_fired_" + name, False)
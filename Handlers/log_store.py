@@ -0,0 +1,113 @@
+import struct
+
+# -----------------------------------------------------------
+# PERSISTENT LOG (fixed-size circular file on CIRCUITPY)
+# -----------------------------------------------------------
+# File layout:
+#   header : magic(4) version(1) head_slot(2) session(1)
+#   slots  : session(1) time_ds(4) msg_len(1) msg(MSG_LEN)
+# The file never grows. New records overwrite the oldest slot and
+# the header is rewritten once per flush, not once per record.
+
+LOG_PATH = "/logs.bin"
+LOG_SLOTS = 96
+MSG_LEN = 48
+
+_MAGIC = b"GLOG"
+_VERSION = 1
+_HEADER_FMT = "<4sBHB"
+_HEADER_SIZE = struct.calcsize(_HEADER_FMT)
+_RECORD_FMT = "<BIB"
+_RECORD_HEAD = struct.calcsize(_RECORD_FMT)
+_RECORD_SIZE = _RECORD_HEAD + MSG_LEN
+
+
+class PersistentLog:
+    def __init__(self, path=LOG_PATH, slots=LOG_SLOTS):
+        self.path = path
+        self.slots = slots
+        self.writable = True
+        self.head = 0
+        self.session = 1
+        self.previous = [] # Entries from the last boot, oldest first
+
+        self._pending = []
+        self._needs_format = True
+        self._record = bytearray(_RECORD_SIZE)
+        self._load()
+
+    # ---------------- LOADING ----------------
+    def _load(self):
+        try:
+            with open(self.path, "rb") as f:
+                header = f.read(_HEADER_SIZE)
+                if len(header) != _HEADER_SIZE:
+                    return
+                magic, version, head, last_session = struct.unpack(_HEADER_FMT, header)
+                if magic != _MAGIC or version != _VERSION or head >= self.slots:
+                    return
+                data = f.read(self.slots * _RECORD_SIZE)
+        except OSError:
+            return
+
+        if len(data) != self.slots * _RECORD_SIZE:
+            return
+
+        self.head = head
+        self._needs_format = False
+        self.session = (last_session % 255) + 1 # 0 marks an empty slot
+
+        # Oldest slot is the one the head is about to overwrite
+        for i in range(self.slots):
+            offset = ((head + i) % self.slots) * _RECORD_SIZE
+            session, time_ds, length = struct.unpack_from(_RECORD_FMT, data, offset)
+            if session != last_session or length == 0 or length > MSG_LEN:
+                continue
+            start = offset + _RECORD_HEAD
+            try:
+                msg = str(data[start:start + length], "utf-8")
+            except Exception:
+                continue
+            self.previous.append({'msg': msg, 'time': time_ds / 10.0})
+
+    # ---------------- WRITING ----------------
+    def append(self, msg, timestamp):
+        """Buffer an entry in RAM. Nothing touches flash until flush()."""
+        if not self.writable:
+            return
+        self._pending.append((msg, timestamp))
+        if len(self._pending) > self.slots:
+            self._pending.pop(0)
+
+    def has_pending(self):
+        return bool(self._pending)
+
+    def flush(self):
+        """Write all buffered entries in one file session."""
+        if not self._pending or not self.writable:
+            return
+        try:
+            mode = "wb" if self._needs_format else "r+b"
+            with open(self.path, mode) as f:
+                if self._needs_format:
+                    f.write(struct.pack(_HEADER_FMT, _MAGIC, _VERSION, 0, self.session))
+                    blank = bytes(_RECORD_SIZE)
+                    for _ in range(self.slots):
+                        f.write(blank)
+                    self._needs_format = False
+
+                rec = self._record
+                for msg, timestamp in self._pending:
+                    raw = msg.encode("utf-8")[:MSG_LEN]
+                    struct.pack_into(_RECORD_FMT, rec, 0, self.session, int(timestamp * 10) & 0xFFFFFFFF, len(raw))
+                    rec[_RECORD_HEAD:_RECORD_HEAD + len(raw)] = raw
+                    f.seek(_HEADER_SIZE + self.head * _RECORD_SIZE)
+                    f.write(rec)
+                    self.head = (self.head + 1) % self.slots
+
+                f.seek(0)
+                f.write(struct.pack(_HEADER_FMT, _MAGIC, _VERSION, self.head, self.session))
+        except OSError:
+            # Read-only while USB is mounted; keep running RAM-only
+            self.writable = False
+        self._pending = []
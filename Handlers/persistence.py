@@ -0,0 +1,64 @@
+import time
+
+# -----------------------------------------------------------
+# PERSISTENCE WORKER (tick-driven, coalescing job queue)
+# -----------------------------------------------------------
+# Callers enqueue a job under a key and return immediately. Enqueuing
+# the same key again replaces the pending job and pushes its due time
+# back (up to max_wait), so a burst of saves becomes one flash write.
+# tick() is called once per frame and runs due jobs until the time
+# budget for that frame is spent.
+
+class PersistenceWorker:
+    def __init__(self, budget=0.004, delay=0.5, max_wait=3.0):
+        self.budget = budget
+        self.delay = delay
+        self.max_wait = max_wait
+        self._jobs = {}  # Key -> [due, first_enqueued, func]
+        self._order = [] # Keys in enqueue order
+
+    def enqueue(self, key, func, delay=None):
+        now = time.monotonic()
+        if delay is None:
+            delay = self.delay
+        job = self._jobs.get(key)
+        if job is None:
+            self._jobs[key] = [now + delay, now, func]
+            self._order.append(key)
+        else:
+            job[0] = min(now + delay, job[1] + self.max_wait)
+            job[2] = func
+
+    def has_pending(self):
+        return len(self._order) > 0
+
+    def tick(self):
+        """Run due jobs until this frame's budget is used up."""
+        if not self._order:
+            return
+        start = time.monotonic()
+        i = 0
+        while i < len(self._order):
+            key = self._order[i]
+            job = self._jobs[key]
+            if job[0] > start:
+                i += 1
+                continue
+            self._order.pop(i)
+            del self._jobs[key]
+            try:
+                job[2]()
+            except Exception as e:
+                print(f"Persistence job '{key}' failed: {e}")
+            if time.monotonic() - start >= self.budget:
+                return
+
+    def flush_all(self):
+        """Run everything now (before sleep or shutdown)."""
+        while self._order:
+            key = self._order.pop(0)
+            job = self._jobs.pop(key)
+            try:
+                job[2]()
+            except Exception as e:
+                print(f"Persistence job '{key}' failed: {e}")
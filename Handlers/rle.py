@@ -0,0 +1,38 @@
+# -----------------------------------------------------------
+# RUN-LENGTH CODING
+# -----------------------------------------------------------
+# One byte-pair RLE shared by every packed on-disk format (.lvl levels,
+# .spr atlases): (run u8, value u8) pairs, runs of 1..255. Keeping one
+# implementation means the host tools and the device loaders can't
+# drift apart. No imports, so host tools and the device both load it.
+
+
+def rle_encode(data):
+    out = bytearray()
+    i = 0
+    n = len(data)
+    while i < n:
+        value = data[i]
+        run = 1
+        while i + run < n and run < 255 and data[i + run] == value:
+            run += 1
+        out.append(run)
+        out.append(value)
+        i += run
+    return out
+
+
+def rle_decode_into(src, src_len, dst):
+    """Expand RLE pairs from src[:src_len] into dst. Returns bytes written."""
+    pos = 0
+    limit = len(dst)
+    for i in range(0, src_len - 1, 2):
+        run = src[i]
+        value = src[i + 1]
+        end = pos + run
+        if end > limit:
+            end = limit
+        while pos < end:
+            dst[pos] = value
+            pos += 1
+    return pos
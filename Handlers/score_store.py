@@ -0,0 +1,241 @@
+import os
+import struct
+
+# -----------------------------------------------------------
+# SCORE JOURNAL (append-only, checksummed binary records)
+# -----------------------------------------------------------
+# Records:
+#   NAME  : 'N' game_id(1) length(1) name(length) crc(1)
+#   SCORE : 'S' game_id(1) score(4) crc(1)
+# Saving a score appends 7 bytes. Once COMPACT_AFTER records are dead
+# weight the journal is rewritten to a temp file holding only the kept
+# scores and renamed over the original, so boot-time scans stay bounded.
+
+JOURNAL_PATH = "/scores.jnl"
+TEMP_PATH = "/scores.tmp"
+KEEP_PER_GAME = 10
+COMPACT_AFTER = 32
+
+_TAG_NAME = 0x4E
+_TAG_SCORE = 0x53
+_SCORE_FMT = "<BBI"
+_SCORE_SIZE = struct.calcsize(_SCORE_FMT)
+
+
+def crc8(data, start=0, end=None, crc=0):
+    """CRC-8 (poly 0x07) over data[start:end]."""
+    if end is None:
+        end = len(data)
+    for i in range(start, end):
+        crc ^= data[i]
+        for _ in range(8):
+            if crc & 0x80:
+                crc = ((crc << 1) ^ 0x07) & 0xFF
+            else:
+                crc = (crc << 1) & 0xFF
+    return crc
+
+
+def _name_record(game_id, name):
+    raw = name.encode("utf-8")[:255]
+    rec = bytearray(3 + len(raw) + 1)
+    rec[0] = _TAG_NAME
+    rec[1] = game_id
+    rec[2] = len(raw)
+    rec[3:3 + len(raw)] = raw
+    rec[-1] = crc8(rec, 0, len(rec) - 1)
+    return rec
+
+
+def _score_record(game_id, score):
+    rec = bytearray(_SCORE_SIZE + 1)
+    struct.pack_into(_SCORE_FMT, rec, 0, _TAG_SCORE, game_id, score & 0xFFFFFFFF)
+    rec[-1] = crc8(rec, 0, _SCORE_SIZE)
+    return rec
+
+
+def _exists(path):
+    try:
+        os.stat(path)
+        return True
+    except OSError:
+        return False
+
+
+class ScoreJournal:
+    def __init__(self, path=JOURNAL_PATH, temp_path=TEMP_PATH,
+                 keep=KEEP_PER_GAME, compact_after=COMPACT_AFTER):
+        self.path = path
+        self.temp_path = temp_path
+        self.keep = keep
+        self.compact_after = compact_after
+        self.writable = True
+
+        self.scores = {}   # Name -> scores, highest first
+        self._ids = {}     # Name -> game id
+        self._pending = bytearray()
+        self._pending_records = 0
+        self._records = 0  # Records currently in the journal file
+        self._torn = False  # Garbage after the last valid record
+
+        self._recover()
+        self._load()
+
+    # ---------------- LOADING ----------------
+    def _recover(self):
+        # A crash between "remove old" and "rename temp" leaves only the
+        # temp file, which is complete by then. A temp file next to a
+        # journal is a half-written compaction and is discarded.
+        if not _exists(self.temp_path):
+            return
+        try:
+            if _exists(self.path):
+                os.remove(self.temp_path)
+            else:
+                os.rename(self.temp_path, self.path)
+        except OSError:
+            pass
+
+    def _load(self):
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return
+
+        names = {}
+        pos = 0
+        size = len(data)
+        records = 0
+        # Single sequential pass; a torn tail record ends the scan
+        while pos < size:
+            tag = data[pos]
+            if tag == _TAG_SCORE:
+                end = pos + _SCORE_SIZE
+                if end >= size or crc8(data, pos, end) != data[end]:
+                    break
+                _, game_id, score = struct.unpack_from(_SCORE_FMT, data, pos)
+                name = names.get(game_id)
+                if name is not None:
+                    self._insert(name, score)
+                pos = end + 1
+            elif tag == _TAG_NAME:
+                if pos + 3 > size:
+                    break
+                end = pos + 3 + data[pos + 2]
+                if end >= size or crc8(data, pos, end) != data[end]:
+                    break
+                try:
+                    name = str(data[pos + 3:end], "utf-8")
+                except Exception:
+                    break
+                names[data[pos + 1]] = name
+                self._ids[name] = data[pos + 1]
+                if name not in self.scores:
+                    self.scores[name] = []
+                pos = end + 1
+            else:
+                break
+            records += 1
+
+        self._records = records
+        self._torn = pos < size
+
+    def import_json(self, path):
+        """One-time migration from the old scores.json format."""
+        try:
+            import json
+            with open(path, "r") as f:
+                data = json.load(f)
+        except Exception:
+            return False
+        for name, values in data.items():
+            for score in values:
+                self.add(name, int(score))
+        return True
+
+    # ---------------- WRITING ----------------
+    def _insert(self, name, score):
+        scores = self.scores.setdefault(name, [])
+        i = 0
+        while i < len(scores) and scores[i] >= score:
+            i += 1
+        if i >= self.keep:
+            return False
+        scores.insert(i, score)
+        if len(scores) > self.keep:
+            scores.pop()
+        return True
+
+    def _game_id(self, name):
+        game_id = self._ids.get(name)
+        if game_id is None:
+            game_id = len(self._ids)
+            self._ids[name] = game_id
+            self._pending.extend(_name_record(game_id, name))
+            self._pending_records += 1
+        return game_id
+
+    def add(self, name, score):
+        """Record a score in RAM; call flush() to persist it."""
+        if not self._insert(name, score):
+            return
+        self._pending.extend(_score_record(self._game_id(name), score))
+        self._pending_records += 1
+
+    def merge(self, name, values):
+        """Fold in scores kept elsewhere (RAM only, not journaled)."""
+        scores = self.scores.setdefault(name, [])
+        for score in values:
+            if scores.count(score) < values.count(score):
+                self._insert(name, score)
+
+    def has_pending(self):
+        return len(self._pending) > 0
+
+    def flush(self):
+        """Append pending records. Returns False if flash is read-only."""
+        if not self._pending:
+            return True
+        if not self.writable:
+            return False
+        if self._torn:
+            # Appending after a torn record would hide the new data
+            self.compact()
+            return self.writable
+        try:
+            with open(self.path, "ab") as f:
+                f.write(self._pending)
+            self._records += self._pending_records
+            self._pending = bytearray()
+            self._pending_records = 0
+            if self._records - self._live_records() >= self.compact_after:
+                self.compact()
+            return True
+        except OSError:
+            self.writable = False
+            return False
+
+    def _live_records(self):
+        count = 0
+        for name in self._ids:
+            count += 1 + len(self.scores.get(name, []))
+        return count
+
+    def compact(self):
+        """Rewrite only the kept scores, then swap files."""
+        try:
+            with open(self.temp_path, "wb") as f:
+                for name, game_id in self._ids.items():
+                    f.write(_name_record(game_id, name))
+                    for score in self.scores.get(name, []):
+                        f.write(_score_record(game_id, score))
+            if _exists(self.path):
+                os.remove(self.path)
+            os.rename(self.temp_path, self.path)
+            self._records = self._live_records()
+            self._pending = bytearray()
+            self._pending_records = 0
+            self._torn = False
+        except OSError:
+            self.writable = False
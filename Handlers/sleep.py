@@ -0,0 +1,113 @@
+import time
+import gc
+import displayio
+from adafruit_display_shapes.rect import Rect
+
+try:
+    import alarm
+except ImportError:
+    alarm = None
+
+# -----------------------------------------------------------
+# SLEEP CONTROLLER
+# -----------------------------------------------------------
+# Sleep sequence:
+#   1. Flush queued flash/EEPROM writes
+#   2. Release the display (stops DVI scan-out) or blank it if the
+#      display cannot be rebuilt
+#   3. Arm the seesaw INT line on X/Y and light-sleep on a PinAlarm
+#   4. On wake, only X+Y held together counts; anything else sleeps again
+# Without a wired INT pin the CPU light-sleeps on a slow TimeAlarm
+# and polls the buttons once per POLL_INTERVAL instead.
+
+WAKE_BUTTONS = ("X", "Y")
+POLL_INTERVAL = 0.5
+PIN_BACKSTOP = 5.0      # Slow poll alongside the PinAlarm, in case INT is not wired
+
+
+class SleepController:
+    def __init__(self, manager, display=None, display_factory=None,
+                 int_pin=None, auto_sleep_s=None):
+        self.manager = manager
+        self.display = display
+        self.display_factory = display_factory # Rebuilds the display on wake
+        self.int_pin = int_pin                 # Feather pin wired to the wing's INT pad
+        self.auto_sleep_s = auto_sleep_s       # None disables auto-sleep
+        self.asleep = False
+
+    def should_auto_sleep(self, handler):
+        if self.auto_sleep_s is None or self.asleep:
+            return False
+        return handler.idle_time() >= self.auto_sleep_s
+
+    # ---------------- SLEEP / WAKE ----------------
+    def sleep(self, handler):
+        self.asleep = True
+        self.manager.log("Entering Sleep Mode...")
+        self.manager.persistence.flush_all()
+
+        self._wait_release(handler)
+        self._display_off()
+
+        use_pin = self.int_pin is not None and alarm is not None
+        if use_pin:
+            use_pin = handler.set_wake_interrupt(WAKE_BUTTONS, True)
+
+        while True:
+            if use_pin:
+                pin_alarm = alarm.pin.PinAlarm(self.int_pin, value=False, pull=True)
+                time_alarm = alarm.time.TimeAlarm(monotonic_time=time.monotonic() + PIN_BACKSTOP)
+                alarm.light_sleep_until_alarms(pin_alarm, time_alarm)
+                handler.clear_wake_interrupt()
+            elif alarm is not None:
+                time_alarm = alarm.time.TimeAlarm(monotonic_time=time.monotonic() + POLL_INTERVAL)
+                alarm.light_sleep_until_alarms(time_alarm)
+            else:
+                time.sleep(POLL_INTERVAL)
+
+            handler.update()
+            if handler.is_pressed("X") and handler.is_pressed("Y"):
+                break
+
+        if use_pin:
+            handler.set_wake_interrupt(WAKE_BUTTONS, False)
+
+        self._wait_release(handler)
+        self._display_on()
+        handler.last_activity = time.monotonic()
+        self.asleep = False
+        self.manager.log("Waking Up...")
+
+    def _wait_release(self, handler):
+        while handler.is_pressed("X") or handler.is_pressed("Y"):
+            handler.update()
+            time.sleep(0.05)
+
+    # ---------------- DISPLAY ----------------
+    def _display_off(self):
+        main_group = self.manager.main_group
+        while len(main_group) > 0:
+            main_group.pop()
+
+        if self.display_factory is not None:
+            # Tear down the framebuffer so nothing is scanned out
+            self.display = None
+            displayio.release_displays()
+            gc.collect()
+        else:
+            black_group = displayio.Group()
+            black_group.append(Rect(0, 0, 340, 260, fill=0x000000))
+            main_group.append(black_group)
+
+    def _display_on(self):
+        main_group = self.manager.main_group
+        while len(main_group) > 0:
+            main_group.pop()
+
+        if self.display_factory is not None:
+            gc.collect()
+            self.display = self.display_factory()
+            self.display.root_group = main_group
+
+        # Same layering as change_state (a paused game stays under PAUSE)
+        self.manager.mount_groups()
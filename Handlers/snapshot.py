@@ -0,0 +1,56 @@
+import os
+import struct
+from Handlers.score_store import crc8
+
+# -----------------------------------------------------------
+# QUICK-SAVE SNAPSHOT
+# -----------------------------------------------------------
+# One file, one write: header + the game's own binary payload.
+#   header : MAGIC, version, game id, payload length, crc8(payload)
+# The game state owns the payload layout (snapshot()/restore()); this
+# module only frames it, so a torn or foreign file reads back as None.
+
+SNAPSHOT_PATH = "/resume.snp"
+MAGIC = b"GSNP"
+VERSION = 1
+HEADER_FMT = "<4sBBHB"
+HEADER_SIZE = struct.calcsize(HEADER_FMT)
+
+
+def write_snapshot(game_id, payload, path=SNAPSHOT_PATH):
+    """True if the snapshot reached flash (False on a read-only FS)."""
+    blob = bytearray(HEADER_SIZE + len(payload))
+    struct.pack_into(HEADER_FMT, blob, 0, MAGIC, VERSION, game_id, len(payload),
+                     crc8(payload))
+    blob[HEADER_SIZE:] = payload
+    try:
+        with open(path, "wb") as f:
+            f.write(blob)
+        return True
+    except OSError:
+        return False
+
+
+def read_snapshot(path=SNAPSHOT_PATH):
+    """(game id, payload) or None if missing or damaged."""
+    try:
+        with open(path, "rb") as f:
+            blob = f.read()
+    except OSError:
+        return None
+    if len(blob) < HEADER_SIZE:
+        return None
+    magic, version, game_id, length, crc = struct.unpack_from(HEADER_FMT, blob, 0)
+    if magic != MAGIC or version != VERSION or len(blob) != HEADER_SIZE + length:
+        return None
+    payload = memoryview(blob)[HEADER_SIZE:]
+    if crc8(payload) != crc:
+        return None
+    return game_id, payload
+
+
+def clear_snapshot(path=SNAPSHOT_PATH):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
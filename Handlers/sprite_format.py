@@ -0,0 +1,147 @@
+import struct
+from Handlers.rle import rle_encode, rle_decode_into
+
+# -----------------------------------------------------------
+# PACKED SPRITE ATLAS FORMAT (.spr)
+# -----------------------------------------------------------
+# Shared by the device loader (Handlers/assets.py) and the host-side
+# packer (Tools/sprite_packer.py), so this module only uses struct and
+# Handlers/rle.py (the same RLE as the level format).
+#
+#   header  : HEADER_FMT (see below)
+#   palette : n_colors x (r, g, b)
+#   sheets  : n_sheets x SHEET_FMT (name, first frame, frame count)
+#   frames  : n_frames x FRAME_FMT (data offset, data length, encoding)
+#   data    : per frame, tile_w x tile_h palette indices row-major,
+#             raw or as RLE pairs (run u8, value u8)
+#
+# Indices are already remapped into the shared palette and the colour
+# key is baked in as transparent_index, so loading is one read plus
+# a copy per frame.
+
+MAGIC = b"GSPR"
+VERSION = 1
+HEADER_FMT = "<4sBBBBBHHH"   # magic, version, tile_w, tile_h, transparent, columns, colors, sheets, frames
+HEADER_SIZE = struct.calcsize(HEADER_FMT)
+SHEET_FMT = "<8sHH"
+SHEET_SIZE = struct.calcsize(SHEET_FMT)
+FRAME_FMT = "<IHB"
+FRAME_SIZE = struct.calcsize(FRAME_FMT)
+
+ENC_RAW = 0
+ENC_RLE = 1
+
+TRANSPARENT_KEY = 0xFF00FF
+
+
+class SpriteFormatError(Exception):
+    pass
+
+
+# ---------------- BMP SOURCE ----------------
+class BmpInfo:
+    """Header and palette of an uncompressed 1/4/8-bit BMP (open file)."""
+    def __init__(self, f):
+        head = bytearray(54)
+        if f.readinto(head) != 54 or head[0:2] != b"BM":
+            raise ValueError("not a BMP")
+        self.data_offset = struct.unpack_from("<I", head, 10)[0]
+        header_size, self.width, height, _, self.bpp, compression = struct.unpack_from("<IiiHHI", head, 14)
+        if compression != 0 or self.bpp not in (1, 4, 8):
+            raise ValueError("unsupported BMP")
+        self.top_down = height < 0
+        self.height = abs(height)
+        self.row_size = ((self.width * self.bpp + 31) // 32) * 4
+
+        n_colors = struct.unpack_from("<I", head, 46)[0] or (1 << self.bpp)
+        raw = bytearray(n_colors * 4)
+        f.seek(14 + header_size)
+        f.readinto(raw)
+        self.colors = []
+        for i in range(n_colors):
+            b, g, r = raw[i * 4], raw[i * 4 + 1], raw[i * 4 + 2]
+            self.colors.append((r << 16) | (g << 8) | b)
+
+    def read_row(self, f, y, row, out, x0, count):
+        """Unpacked palette indices of image row y, columns x0..x0+count-1."""
+        file_row = y if self.top_down else self.height - 1 - y
+        f.seek(self.data_offset + file_row * self.row_size)
+        f.readinto(row)
+        bpp = self.bpp
+        if bpp == 8:
+            for i in range(count):
+                out[i] = row[x0 + i]
+            return
+        per_byte = 8 // bpp
+        mask = (1 << bpp) - 1
+        for i in range(count):
+            x = x0 + i
+            shift = 8 - bpp * (x % per_byte + 1)
+            out[i] = (row[x // per_byte] >> shift) & mask
+
+
+# ---------------- ENCODING (host side) ----------------
+def encode_atlas(tile_w, tile_h, columns, colors, sheets, frames, transparent=0, use_rle=True):
+    """colors: list of 0xRRGGBB. sheets: [(name, first, count)].
+    frames: list of tile_w * tile_h index buffers."""
+    blobs = []
+    for pixels in frames:
+        packed = rle_encode(pixels) if use_rle else None
+        if packed is not None and len(packed) < len(pixels):
+            blobs.append((ENC_RLE, packed))
+        else:
+            blobs.append((ENC_RAW, bytes(pixels)))
+
+    out = bytearray(struct.pack(HEADER_FMT, MAGIC, VERSION, tile_w, tile_h, transparent,
+                                columns, len(colors), len(sheets), len(frames)))
+    for c in colors:
+        out += bytes(((c >> 16) & 0xFF, (c >> 8) & 0xFF, c & 0xFF))
+    for name, first, count in sheets:
+        out += struct.pack(SHEET_FMT, name.encode(), first, count)
+    offset = len(out) + len(frames) * FRAME_SIZE
+    for enc, blob in blobs:
+        out += struct.pack(FRAME_FMT, offset, len(blob), enc)
+        offset += len(blob)
+    for enc, blob in blobs:
+        out += blob
+    return out
+
+
+# ---------------- DECODING (device side) ----------------
+class PackedAtlas:
+    """Parsed .spr file; the whole file is read in one go."""
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            f.seek(0, 2)
+            size = f.tell()
+            f.seek(0)
+            self.data = bytearray(size)
+            f.readinto(self.data)
+        data = self.data
+        if size < HEADER_SIZE:
+            raise SpriteFormatError("short header")
+        (magic, version, self.tile_w, self.tile_h, self.transparent, self.columns,
+         n_colors, n_sheets, self.n_frames) = struct.unpack_from(HEADER_FMT, data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise SpriteFormatError("bad magic/version")
+
+        pos = HEADER_SIZE
+        self.colors = []
+        for i in range(n_colors):
+            self.colors.append((data[pos] << 16) | (data[pos + 1] << 8) | data[pos + 2])
+            pos += 3
+        self.sheets = []
+        for i in range(n_sheets):
+            name, first, count = struct.unpack_from(SHEET_FMT, data, pos)
+            self.sheets.append((name.rstrip(b"\0").decode(), first, count))
+            pos += SHEET_SIZE
+        self._frame_table = pos
+
+    def frame_into(self, index, buf):
+        """Decode frame `index` into buf (tile_w * tile_h bytes)."""
+        offset, length, enc = struct.unpack_from(FRAME_FMT, self.data, self._frame_table + index * FRAME_SIZE)
+        data = self.data
+        if enc == ENC_RAW:
+            buf[:length] = memoryview(data)[offset:offset + length]
+            return
+        rle_decode_into(memoryview(data)[offset:offset + length], length, buf)
@@ -0,0 +1,166 @@
+import displayio
+
+# -----------------------------------------------------------
+# PATTERN OVERLAY
+# -----------------------------------------------------------
+# Dim / fade layers drawn as one small pattern tile repeated through a
+# TileGrid, instead of a screen-sized bitmap filled pixel by pixel.
+# A 320x240 overlay is 40x30 tile indices plus one 8x8 tile; pattern
+# bitmaps are built once and shared by every overlay using them.
+
+PATTERN_TILE = 8
+
+# (width, height, bits row-major); 1 = drawn in the overlay colour
+DITHER_50 = (2, 2, (1, 0,
+                    0, 1))
+DITHER_25 = (2, 2, (1, 0,
+                    0, 0))
+DITHER_75 = (2, 2, (1, 1,
+                    1, 0))
+SOLID = (1, 1, (1,))
+
+_pattern_tiles = {}
+
+
+def _pattern_tile(pattern):
+    tile = _pattern_tiles.get(pattern)
+    if tile is None:
+        pw, ph, bits = pattern
+        tile = displayio.Bitmap(PATTERN_TILE, PATTERN_TILE, 2)
+        for y in range(PATTERN_TILE):
+            for x in range(PATTERN_TILE):
+                if bits[(y % ph) * pw + (x % pw)]:
+                    tile[x, y] = 1
+        _pattern_tiles[pattern] = tile
+    return tile
+
+
+def pattern_overlay(width, height, color=0x000000, pattern=DITHER_50, x=0, y=0):
+    """TileGrid covering width x height with pattern in color (rest transparent)."""
+    pal = displayio.Palette(2)
+    pal[0] = 0x000000
+    pal.make_transparent(0)
+    pal[1] = color
+    cols = (width + PATTERN_TILE - 1) // PATTERN_TILE
+    rows = (height + PATTERN_TILE - 1) // PATTERN_TILE
+    return displayio.TileGrid(_pattern_tile(pattern), pixel_shader=pal,
+                              width=cols, height=rows,
+                              tile_width=PATTERN_TILE, tile_height=PATTERN_TILE,
+                              default_tile=0, x=x, y=y)
+
+
+# -----------------------------------------------------------
+# NUMBER DISPLAY
+# -----------------------------------------------------------
+# Fixed-width counter drawn from a digit atlas: one tile per place, so
+# setting a value is integer division plus a tile write for each digit
+# that changed. No strings, no label relayout, safe to call every frame.
+#
+# The atlas holds blank, 0-9 and '-' cut from a font's glyphs at one
+# cell size and is built once per font.
+
+_DIGIT_CHARS = " 0123456789-"
+_BLANK = 0
+_ZERO = 1
+_MINUS = 11
+
+_digit_atlases = {}
+
+
+def _digit_atlas(font):
+    atlas = _digit_atlases.get(id(font))
+    if atlas is not None:
+        return atlas
+    box = font.get_bounding_box() # (w, h) for built-in fonts, (w, h, x, y) for BDF
+    cell_h = box[1]
+    y_off = box[3] if len(box) > 3 else 0
+    glyphs = [font.get_glyph(ord(c)) for c in _DIGIT_CHARS]
+    cell_w = 1
+    for g in glyphs:
+        if g is not None and g.shift_x > cell_w:
+            cell_w = g.shift_x
+    baseline = cell_h + y_off
+
+    bmp = displayio.Bitmap(cell_w * len(_DIGIT_CHARS), cell_h, 2)
+    for i, g in enumerate(glyphs):
+        if g is None or i == _BLANK:
+            continue
+        src_x = g.tile_index * g.width
+        top = baseline - (g.height + g.dy)
+        for y in range(g.height):
+            ty = top + y
+            if ty < 0 or ty >= cell_h:
+                continue
+            for x in range(g.width):
+                tx = g.dx + x
+                if 0 <= tx < cell_w and g.bitmap[src_x + x, y]:
+                    bmp[i * cell_w + tx, ty] = 1
+    atlas = (bmp, cell_w, cell_h)
+    _digit_atlases[id(font)] = atlas
+    return atlas
+
+
+class NumberDisplay:
+    """Right-aligned integer in `digits` places; append .grid to a group.
+
+    background: colour behind the digits, or None for transparent.
+    zero_pad: fill unused places with 0 instead of blanks.
+    """
+    def __init__(self, font, digits, x=0, y=0, color=0xFFFFFF, background=None,
+                 zero_pad=False, value=0):
+        bmp, self.cell_w, self.cell_h = _digit_atlas(font)
+        pal = displayio.Palette(2)
+        if background is None:
+            pal[0] = 0x000000
+            pal.make_transparent(0)
+        else:
+            pal[0] = background
+        pal[1] = color
+        self.digits = digits
+        self.zero_pad = zero_pad
+        self.max_value = 10 ** digits - 1
+        self.min_value = -(10 ** (digits - 1) - 1) if digits > 1 else 0
+        self.grid = displayio.TileGrid(bmp, pixel_shader=pal, width=digits, height=1,
+                                       tile_width=self.cell_w, tile_height=self.cell_h,
+                                       default_tile=_BLANK, x=x, y=y)
+        self._tiles = bytearray(digits) # Mirrors grid so unchanged places are skipped
+        self.value = None
+        self.set(value)
+
+    def set(self, value):
+        if value == self.value:
+            return
+        self.value = value
+        if value > self.max_value:
+            value = self.max_value
+        elif value < self.min_value:
+            value = self.min_value
+        negative = value < 0
+        if negative:
+            value = -value
+
+        tiles = self._tiles
+        grid = self.grid
+        place = self.digits - 1
+        while place >= 0:
+            if place == 0 and negative and self.zero_pad:
+                tile = _MINUS
+            elif value or place == self.digits - 1 or self.zero_pad:
+                tile = _ZERO + value % 10
+                value //= 10
+            elif negative:
+                tile = _MINUS
+                negative = False
+            else:
+                tile = _BLANK
+            if tiles[place] != tile:
+                tiles[place] = tile
+                grid[place] = tile
+            place -= 1
+
+
+def number_after(caption, font, digits, **kwargs):
+    """NumberDisplay placed right after a Label, on the label's centre line."""
+    number = NumberDisplay(font, digits, x=caption.x + caption.bounding_box[2], **kwargs)
+    number.grid.y = caption.y - number.cell_h // 2
+    return number
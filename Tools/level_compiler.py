@@ -0,0 +1,280 @@
+"""Host-side level compiler: ASCII maps -> packed .lvl files.
+
+Runs on a desktop Python, not on the device. Everything the game used
+to work out at boot (collision flags, spawn lists, the enemy
+navigation graph, chunk index) is computed here, so the device only
+has to read it. Jump limits for the graph come from the physics
+constants in Games/platformer_game.py.
+
+Legend:
+    '#'  solid tile
+    'E'  enemy spawn
+    'S'  spike
+    'P'  player spawn (optional, defaults to DEFAULT_SPAWN)
+    ' '  empty
+
+Usage:
+    python Tools/level_compiler.py Levels/level1.txt [Levels/level2.txt ...]
+    python Tools/level_compiler.py Levels/level1.txt -o /tmp/level1.lvl
+    python Tools/level_compiler.py --check Levels/*.txt
+"""
+import argparse
+import ast
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from Games.collision import TILE_SOLID
+from Games.level_format import (encode_level, LevelFile, LevelFormatError,
+                                DEFAULT_CHUNK_COLS, HEADER_SIZE, INDEX_SIZE, SPAWN_SIZE)
+from Games.navigation import build_nav_graph, jump_limits
+
+TILE_SIZE = 16
+DEFAULT_SPAWN = (50, 50)
+PLAYER_SIZE = (12, 16)
+LEGEND = "#ESP "
+
+
+class CompileError(Exception):
+    pass
+
+
+def game_constants(names):
+    """Read numeric constants from platformer_game.py without importing displayio."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Games", "platformer_game.py")
+    with open(path) as f:
+        tree = ast.parse(f.read())
+    values = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1:
+            target = node.targets[0]
+            if isinstance(target, ast.Name) and target.id in names:
+                values[target.id] = ast.literal_eval(node.value)
+    missing = [n for n in names if n not in values]
+    if missing:
+        raise CompileError(f"constants not found in platformer_game.py: {missing}")
+    return values
+
+
+def nav_limits():
+    c = game_constants(("ENEMY_JUMP_FORCE", "GRAVITY", "ENEMY_SPEED", "TILE_SIZE"))
+    return jump_limits(c["ENEMY_JUMP_FORCE"], c["GRAVITY"], c["ENEMY_SPEED"], c["TILE_SIZE"])
+
+
+class MapSource:
+    """Parsed ASCII map plus everything validation needs."""
+    def __init__(self, rows):
+        self.height = len(rows)
+        self.width = len(rows[0]) if rows else 0
+        self.flags = bytearray(self.width * self.height)
+        self.enemies = []
+        self.spikes = []
+        self.player_spawn = None
+
+        for y, row in enumerate(rows):
+            for x, char in enumerate(row):
+                if char == "#":
+                    self.flags[y * self.width + x] = TILE_SOLID
+                elif char == "E":
+                    self.enemies.append((x * TILE_SIZE, y * TILE_SIZE))
+                elif char == "S":
+                    self.spikes.append((x * TILE_SIZE, y * TILE_SIZE))
+                elif char == "P":
+                    if self.player_spawn is not None:
+                        raise CompileError(f"second player spawn at column {x}, row {y}")
+                    self.player_spawn = (x * TILE_SIZE, y * TILE_SIZE)
+
+    def is_solid(self, tx, ty):
+        # Same border rules as CollisionGrid: sides and floor solid, sky open
+        if tx < 0 or tx >= self.width or ty >= self.height:
+            return True
+        if ty < 0:
+            return False
+        return (self.flags[ty * self.width + tx] & TILE_SOLID) != 0
+
+
+def read_map(path):
+    with open(path) as f:
+        rows = [line.rstrip("\r\n") for line in f]
+    while rows and not rows[-1].strip():
+        rows.pop()
+    if not rows:
+        raise CompileError("map is empty")
+
+    width = len(rows[0])
+    for y, row in enumerate(rows):
+        if len(row) != width:
+            raise CompileError(f"row {y} is {len(row)} wide, expected {width}")
+        for x, char in enumerate(row):
+            if char not in LEGEND:
+                raise CompileError(f"unknown tile {char!r} at column {x}, row {y}")
+    return MapSource(rows)
+
+
+# ---------------- VALIDATION ----------------
+def _box_tiles(x, y, w, h):
+    for ty in range(y // TILE_SIZE, (y + h - 1) // TILE_SIZE + 1):
+        for tx in range(x // TILE_SIZE, (x + w - 1) // TILE_SIZE + 1):
+            yield tx, ty
+
+
+def _open_area(src, start):
+    """Air tiles 4-connected to start; the whole top row counts as open sky."""
+    seen = bytearray(src.width * src.height)
+    stack = [start]
+    for tx in range(src.width):
+        if not src.is_solid(tx, 0):
+            stack.append((tx, 0))
+    while stack:
+        tx, ty = stack.pop()
+        if tx < 0 or tx >= src.width or ty < 0 or ty >= src.height:
+            continue
+        i = ty * src.width + tx
+        if seen[i] or src.is_solid(tx, ty):
+            continue
+        seen[i] = 1
+        stack.append((tx + 1, ty))
+        stack.append((tx - 1, ty))
+        stack.append((tx, ty + 1))
+        stack.append((tx, ty - 1))
+    return seen
+
+
+def _has_floor(src, tx, ty):
+    for y in range(ty + 1, src.height + 1):
+        if src.is_solid(tx, y):
+            return y < src.height
+    return False
+
+
+def validate(src, spawn):
+    """Returns (errors, warnings) as lists of strings."""
+    errors = []
+    warnings = []
+
+    px, py = spawn
+    for tx, ty in _box_tiles(px, py, PLAYER_SIZE[0], PLAYER_SIZE[1]):
+        if src.is_solid(tx, ty):
+            errors.append(f"player spawn {spawn} overlaps a wall at tile ({tx}, {ty})")
+            break
+
+    for kind, spawns in (("enemy", src.enemies), ("spike", src.spikes)):
+        for x, y in spawns:
+            tx = x // TILE_SIZE
+            ty = y // TILE_SIZE
+            if not _has_floor(src, tx, ty):
+                warnings.append(f"{kind} at tile ({tx}, {ty}) has no floor below it")
+
+    open_area = _open_area(src, (px // TILE_SIZE, py // TILE_SIZE))
+    sealed = 0
+    for i in range(src.width * src.height):
+        if not open_area[i] and not (src.flags[i] & TILE_SOLID):
+            sealed += 1
+    if sealed:
+        warnings.append(f"{sealed} empty tiles are sealed off from the player")
+    for kind, spawns in (("enemy", src.enemies), ("spike", src.spikes)):
+        for x, y in spawns:
+            tx = x // TILE_SIZE
+            ty = y // TILE_SIZE
+            if not open_area[ty * src.width + tx]:
+                warnings.append(f"{kind} at tile ({tx}, {ty}) is unreachable")
+    return errors, warnings
+
+
+# ---------------- COMPILE ----------------
+def compile_map(src, chunk_cols=DEFAULT_CHUNK_COLS):
+    spawn = src.player_spawn if src.player_spawn is not None else DEFAULT_SPAWN
+    errors, warnings = validate(src, spawn)
+    if errors:
+        raise CompileError("; ".join(errors))
+
+    rise, reach = nav_limits()
+    nav = build_nav_graph(src.width, src.height, src.is_solid, rise, reach)
+    data = encode_level(src.width, src.height, src.flags, src.enemies, src.spikes, spawn,
+                        tile_size=TILE_SIZE, chunk_cols=chunk_cols,
+                        nav=nav, nav_limits=(rise, reach))
+    return data, nav, warnings
+
+
+def size_report(src, data, chunk_cols):
+    n_chunks = (src.width + chunk_cols - 1) // chunk_cols
+    index = n_chunks * INDEX_SIZE
+    spawns = (len(src.enemies) + len(src.spikes)) * SPAWN_SIZE
+    nav_index = 2 + index
+    payload = len(data) - HEADER_SIZE - index - spawns - nav_index
+    raw = src.width * src.height
+    return (f"  {src.width}x{src.height} tiles, {len(src.enemies)} enemies, {len(src.spikes)} spikes\n"
+            f"  file {len(data)} B: header {HEADER_SIZE}, index {index} ({n_chunks} chunks), "
+            f"spawns {spawns}, nav index {nav_index}, tile + nav chunks {payload} (raw {2 * raw})")
+
+
+def _verify(path, src, nav):
+    # Read the output back through the device loader
+    lvl = LevelFile(path)
+    try:
+        buf = bytearray(lvl.chunk_cols * lvl.height)
+        for ci in range(lvl.n_chunks):
+            cols = lvl.read_chunk(ci, buf)
+            for c in range(cols):
+                x = ci * lvl.chunk_cols + c
+                for y in range(lvl.height):
+                    if buf[c * lvl.height + y] != src.flags[y * src.width + x]:
+                        raise CompileError(f"readback mismatch at tile ({x}, {y})")
+            cols = lvl.read_nav_chunk(ci, buf)
+            for y in range(lvl.height):
+                for c in range(cols):
+                    x = ci * lvl.chunk_cols + c
+                    if buf[y * cols + c] != nav[y * src.width + x]:
+                        raise CompileError(f"nav readback mismatch at tile ({x}, {y})")
+    finally:
+        lvl.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile ASCII level maps into .lvl files")
+    parser.add_argument("maps", nargs="+", help="ASCII map files")
+    parser.add_argument("-o", "--output", help="output path (single map only)")
+    parser.add_argument("--chunk-cols", type=int, default=DEFAULT_CHUNK_COLS)
+    parser.add_argument("--check", action="store_true", help="validate only, write nothing")
+    args = parser.parse_args(argv)
+
+    if args.output and len(args.maps) > 1:
+        parser.error("-o only works with a single map")
+
+    failed = 0
+    for map_path in args.maps:
+        out_path = args.output or os.path.splitext(map_path)[0] + ".lvl"
+        try:
+            src = read_map(map_path)
+            data, nav, warnings = compile_map(src, args.chunk_cols)
+        except (OSError, CompileError) as e:
+            print(f"{map_path}: error: {e}")
+            failed += 1
+            continue
+
+        for w in warnings:
+            print(f"{map_path}: warning: {w}")
+        if not args.check:
+            try:
+                with open(out_path, "wb") as f:
+                    f.write(data)
+                _verify(out_path, src, nav)
+            except (OSError, CompileError, LevelFormatError) as e:
+                print(f"{map_path}: error: {e}")
+                failed += 1
+                # Never leave a file behind that the device would trust
+                try:
+                    os.remove(out_path)
+                except OSError:
+                    pass
+                continue
+            print(f"{map_path} -> {out_path}")
+        else:
+            print(f"{map_path}: ok")
+        print(size_report(src, data, args.chunk_cols))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
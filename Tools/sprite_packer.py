@@ -0,0 +1,142 @@
+"""Host-side sprite packer: BMP sheets + manifest -> packed .spr atlas.
+
+Runs on a desktop Python, not on the device. Reads the manifest, cuts
+every sheet into frames, merges the colours every frame actually uses
+into one palette (the 0xFF00FF key becomes the transparent index 0),
+optionally RLE-packs each frame and writes the atlas next to the
+manifest. The device then loads it with one read (Handlers/assets.py).
+
+Manifest (JSON):
+    {
+        "tile_w": 32, "tile_h": 32, "columns": 4, "output": "atlas.spr",
+        "sheets": [
+            {"name": "run", "file": "run.bmp"},
+            {"name": "jump", "file": "jump.bmp", "frames": 3}
+        ]
+    }
+
+Usage:
+    python Tools/sprite_packer.py Sprites/manifest.json
+    python Tools/sprite_packer.py Sprites/manifest.json --no-rle
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from Handlers.sprite_format import (BmpInfo, PackedAtlas, encode_atlas,
+                                    TRANSPARENT_KEY)
+
+MAX_NAME = 8
+
+
+class PackError(Exception):
+    pass
+
+
+def cut_frames(path, tile_w, tile_h, frames):
+    """(palette, list of frame index buffers) in the BMP's own palette."""
+    with open(path, "rb") as f:
+        info = BmpInfo(f)
+        cols = info.width // tile_w
+        total = cols * (info.height // tile_h)
+        if total == 0:
+            raise PackError(f"{path}: smaller than one {tile_w}x{tile_h} frame")
+        if frames is None:
+            frames = total
+        elif frames > total:
+            raise PackError(f"{path}: manifest asks for {frames} frames, sheet has {total}")
+
+        row = bytearray(info.row_size)
+        line = bytearray(tile_w)
+        out = []
+        for frame in range(frames):
+            fx = (frame % cols) * tile_w
+            fy = (frame // cols) * tile_h
+            pixels = bytearray(tile_w * tile_h)
+            for y in range(tile_h):
+                info.read_row(f, fy + y, row, line, fx, tile_w)
+                pixels[y * tile_w:(y + 1) * tile_w] = line
+            out.append(pixels)
+    return info.colors, out
+
+
+def pack(manifest_path, use_rle=True):
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    root = os.path.dirname(manifest_path)
+    tile_w = manifest.get("tile_w", 32)
+    tile_h = manifest.get("tile_h", 32)
+    columns = manifest.get("columns", 4)
+
+    colors = [TRANSPARENT_KEY] # Index 0 is the transparent key
+    sheets = []
+    frames = []
+    for entry in manifest["sheets"]:
+        name = entry["name"]
+        if len(name.encode()) > MAX_NAME:
+            raise PackError(f"sheet name {name!r} is longer than {MAX_NAME} bytes")
+        src_colors, src_frames = cut_frames(os.path.join(root, entry["file"]),
+                                            tile_w, tile_h, entry.get("frames"))
+        # Remap into the shared palette, only for colours that are used
+        lut = {}
+        for pixels in src_frames:
+            for i in range(len(pixels)):
+                src = pixels[i]
+                if src not in lut:
+                    c = src_colors[src]
+                    if c == TRANSPARENT_KEY:
+                        lut[src] = 0
+                    else:
+                        if c not in colors:
+                            colors.append(c)
+                        lut[src] = colors.index(c)
+                pixels[i] = lut[src]
+        sheets.append((name, len(frames), len(src_frames)))
+        frames.extend(src_frames)
+
+    if len(colors) > 256:
+        raise PackError(f"{len(colors)} colours, the atlas holds 256")
+    data = encode_atlas(tile_w, tile_h, columns, colors, sheets, frames, use_rle=use_rle)
+    out_path = os.path.join(root, manifest.get("output", "atlas.spr"))
+    return out_path, data, colors, sheets, frames
+
+
+def _verify(path, frames):
+    atlas = PackedAtlas(path)
+    buf = bytearray(atlas.tile_w * atlas.tile_h)
+    for i in range(len(frames)):
+        atlas.frame_into(i, buf)
+        if buf != frames[i]:
+            raise PackError(f"readback mismatch in frame {i}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pack BMP sprite sheets into one .spr atlas")
+    parser.add_argument("manifest", help="manifest JSON (see module docstring)")
+    parser.add_argument("--no-rle", action="store_true", help="store every frame raw")
+    args = parser.parse_args(argv)
+
+    try:
+        out_path, data, colors, sheets, frames = pack(args.manifest, use_rle=not args.no_rle)
+    except (OSError, ValueError, KeyError, PackError) as e:
+        print(f"{args.manifest}: error: {e}")
+        return 1
+
+    with open(out_path, "wb") as f:
+        f.write(data)
+    _verify(out_path, frames)
+
+    tile_bytes = len(frames[0]) if frames else 0
+    print(f"{args.manifest} -> {out_path}")
+    for name, first, count in sheets:
+        print(f"  {name:<8} frames {first}..{first + count - 1}")
+    print(f"  {len(frames)} frames, {len(colors)} colours, file {len(data)} B "
+          f"(raw pixels {len(frames) * tile_bytes} B)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,14 @@ import gc
 
 from Handlers import input_handler
 from Handlers import gamestate
+from Handlers import eeprom_store
+from Handlers import sleep
+
+# JoyFeatherWing IRQ pad -> Feather D5 through the wing's IRQ jumper.
+# With the jumper fitted, sleep waits on a PinAlarm and the CPU stays
+# idle until X/Y change; set to None without it to fall back to waking
+# every POLL_INTERVAL and polling the seesaw over I2C.
+JOY_IRQ_PIN = board.D5
 
 # -----------------------------------------------------------
 # 1. HARDWARE INITIALIZATION
@@ -14,14 +22,17 @@ from Handlers import gamestate
 print("Initializing Hardware...")
 displayio.release_displays()
 
-# Setup HDMI
-fb = picodvi.Framebuffer(320, 240,
-    clk_dp=board.CKP, clk_dn=board.CKN,
-    red_dp=board.D0P, red_dn=board.D0N,
-    green_dp=board.D1P, green_dn=board.D1N,
-    blue_dp=board.D2P, blue_dn=board.D2N,
-    color_depth=8)
-display = framebufferio.FramebufferDisplay(fb)
+# Setup HDMI (also called again on wake from sleep)
+def make_display():
+    fb = picodvi.Framebuffer(320, 240,
+        clk_dp=board.CKP, clk_dn=board.CKN,
+        red_dp=board.D0P, red_dn=board.D0N,
+        green_dp=board.D1P, green_dn=board.D1N,
+        blue_dp=board.D2P, blue_dn=board.D2N,
+        color_depth=8)
+    return framebufferio.FramebufferDisplay(fb)
+
+display = make_display()
 
 # Create Root Group
 root = displayio.Group()
@@ -31,7 +42,12 @@ display.root_group = root
 # 2. SYSTEM SETUP
 # -----------------------------------------------------------
 handler = input_handler.InputHandler(sensitivity=1.5)
-manager = gamestate.GameStateManager(root)
+manager = gamestate.GameStateManager(root, persist_logs=True)
+handler.sensitivity = manager.settings.get("sensitivity", handler.sensitivity)
+manager.attach_eeprom(eeprom_store.EepromStore.from_handler(handler), handler)
+
+manager.attach_sleep(sleep.SleepController(manager, display, make_display,
+                                           int_pin=JOY_IRQ_PIN, auto_sleep_s=300))
 manager.change_state(gamestate.STATE_MENU)
 
 # Clean up setup memory